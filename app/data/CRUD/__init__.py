@@ -1,3 +1,4 @@
 """Package with CRUD operations."""
 from .base import CRUDBase
 from .films import CRUDFilm
+from .directors import CRUDDirector
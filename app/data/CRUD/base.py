@@ -1,15 +1,44 @@
 """Basic operations with models."""
 
-from typing import Generic, Optional, Type
+import json
+from typing import Callable, Generic, Optional, Type
 from pydantic import BaseModel
 from app.domain.abc_repos import ABCBaseRepo
-from app.domain.schemas import GetFromIdSchema
+from app.domain.schemas import GetFromIdSchema, PageSchema
 from app.domain.models.db import db
+from app.exceptions import ValidationFail
+from app.utils.cache import TTLCache
+from app.utils.logger import my_logger
 from app.utils.custom_types import SchemaType, ModelType, SecondSchemaType
 
+# Planner estimates below that number are replaced with exact count.
+EXACT_COUNT_THRESHOLD = 10000
+
 
 class CRUDBase(ABCBaseRepo, Generic[ModelType, SchemaType, SecondSchemaType]):
 
+    # Loader options applied to every listing query, so relationships touched
+    # by 'from_orm_schema' are fetched in batches instead of one query per row.
+    list_options: tuple = ()
+    # Exact counts of listing queries, shared by all repos of the worker.
+    _exact_counts = TTLCache(max_entries=512, ttl=60)
+
+    def __init__(self, model: Type[ModelType], from_orm_schema: Type[SchemaType]):
+        super().__init__(model, from_orm_schema)
+        self._commit_hooks = []
+        self._write_listeners = []
+
+    def add_commit_hook(self, hook: Callable[[db.Session], None]) -> None:
+        """Register callable which is called with session of every write just
+        before its commit, so statements it runs are committed with the write."""
+
+        self._commit_hooks.append(hook)
+
+    def add_write_listener(self, listener: Callable[[], None]) -> None:
+        """Register callable which is called after every committed write."""
+
+        self._write_listeners.append(listener)
+
     def get_with_id(self, schema: GetFromIdSchema) -> Optional[Type[SchemaType]]:
         """Get with id operation"""
 
@@ -22,40 +51,128 @@ class CRUDBase(ABCBaseRepo, Generic[ModelType, SchemaType, SecondSchemaType]):
         model = self.model.query.filter_by(**schema.dict()).first()
         return self.from_orm_schema.from_orm(model) if model else None
 
-    def get_all(self, page=1, per_page=10) -> Optional[list]:
+    def get_all(self, page=1, per_page=10, with_total=False) -> PageSchema:
         """Get all operation"""
 
-        models_list = self.model.query.paginate(page=page,
-                                                per_page=per_page).items
-        schemas_list = self._process_models(models_list)
-
-        return schemas_list
+        return self._paginate(self._list_query().order_by(self.model.id), page, per_page, with_total)
 
     def create(self, schema: SchemaType, session: db.Session = db.session) -> Optional[Type[SchemaType]]:
         new_model = self.model(**schema.dict())
         """Create operation"""
 
         session.add(new_model)
-        session.commit()
+        self._commit(session)
+        self._notify_write()
 
         return self.from_orm_schema.from_orm(new_model)
 
     def update(self, get_schema: SchemaType, update_schema: SecondSchemaType, session: db.Session = db.session)\
             -> Optional[Type[SchemaType]]:
-        """Update operation"""
+        """Update operation. Returns updated entity, or None if nothing matched 'get_schema'."""
 
-        update_dict = self._dict_without_none(update_schema)
-        updated_model = self.model.query.filter_by(**get_schema.dict()).update(update_dict)
+        row = self._update_returning(get_schema, self._dict_without_none(update_schema), session)
 
-        session.commit()
-        return self.from_orm_schema.from_orm(updated_model)
+        self._commit(session)
+        self._notify_write()
+        return self.from_orm_schema.from_orm(row) if row else None
 
     def delete(self, schema: SchemaType, session: db.Session = db.session) -> None:
         """Delete operation"""
 
         self.model.query.filter_by(**schema.dict()).delete()
+        self._commit(session)
+        self._notify_write()
+
+    def _update_returning(self, get_schema: BaseModel, values: dict, session: db.Session):
+        """Apply values to rows matching 'get_schema', returning the first updated row.
+
+        Uses single UPDATE ... RETURNING where db supports it, otherwise
+        finds ids, updates them and reads the row back.
+        """
+
+        table = self.model.__table__
+        criteria = [table.c[key] == value for key, value in get_schema.dict().items()]
+
+        if not values:
+            return session.execute(db.select(table).where(*criteria).limit(1)).first()
+        if db.engine.dialect.full_returning:
+            return session.execute(db.update(table).where(*criteria).values(values).returning(*table.c)).first()
+
+        ids = session.execute(db.select(table.c.id).where(*criteria)).scalars().all()
+        if not ids:
+            return None
+        session.execute(db.update(table).where(table.c.id.in_(ids)).values(values))
+        return session.execute(db.select(table).where(table.c.id == ids[0])).first()
+
+    def _commit(self, session: db.Session) -> None:
+        """Call commit hooks and commit."""
+
+        for hook in self._commit_hooks:
+            hook(session)
         session.commit()
 
+    def _notify_write(self) -> None:
+        """Call write listeners. Write is already committed, so their errors are only logged."""
+
+        for listener in self._write_listeners:
+            try:
+                listener()
+            except Exception:
+                my_logger.exception("write listener %r failed", listener)
+
+    def _list_query(self, *extra_options):
+        """Query for listing operations with loader options applied."""
+
+        return self.model.query.options(*self.list_options, *extra_options)
+
+    def _paginate(self, query, page: int, per_page: int, with_total=False, **options) -> PageSchema:
+        """Page of query results. Instead of counting rows fetches one extra row
+        to find out whether there is a next page. 'options' go to '_process_models'."""
+
+        self._check_page(page, per_page)
+        models_list = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+        return self._page(models_list, per_page, self._total(query) if with_total else None, **options)
+
+    @staticmethod
+    def _check_page(page: int, per_page: int) -> None:
+        """Pages are numbered from 1, lower numbers or sizes would give negative OFFSET."""
+
+        if page < 1 or per_page < 1:
+            raise ValidationFail("'page' and 'per_page' should be at least 1.")
+
+    def _page(self, models_list: list, per_page: int, total: Optional[int] = None, **options) -> PageSchema:
+        """Turn up to 'per_page' + 1 fetched models into page schema."""
+
+        return PageSchema(items=self._process_models(models_list[:per_page], **options),
+                          has_next=len(models_list) > per_page, total=total)
+
+    def _total(self, query) -> int:
+        """Number of rows in query results.
+
+        On Postgres returns planner estimate, which is replaced with exact count
+        for small results. Exact counts are cached for a short time.
+        """
+
+        query = query.order_by(None)
+        connection = query.session.connection()
+        compiled = query.statement.compile(dialect=connection.dialect,
+                                           compile_kwargs={"render_postcompile": True})
+
+        if connection.dialect.name == "postgresql":
+            plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate
+
+        key = (str(compiled), tuple(sorted(compiled.params.items())))
+        total = self._exact_counts.get(key)
+        if total is None:
+            total = query.count()
+            self._exact_counts.set(key, total)
+
+        return total
+
     def _process_models(self, models_list: list) -> list:
         """Turn models into pydantic schemas."""
 
@@ -0,0 +1,59 @@
+"""Operations for 'Director' model"""
+
+from typing import Dict, Generic, Iterable, Optional, Tuple
+from app.domain.abc_repos import ABCDirectorRepo
+from app.domain import schemas, models
+from app.domain.models.db import db
+from app.utils.cache import TTLCache
+from app.utils.custom_types import ModelType, SchemaType
+from .base import CRUDBase
+
+_MISSING = object()
+
+
+class CRUDDirector(CRUDBase, ABCDirectorRepo, Generic[ModelType, SchemaType]):
+    """Directors repo which keeps bounded cache of full name to id resolutions.
+
+    Misses are cached too, for 'negative_ttl' seconds. Cache is cleared on
+    every write made through the repo, writes made in other workers are
+    visible after 'ttl' (or 'negative_ttl' for new directors) at most.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0, negative_ttl: float = 10.0):
+        super().__init__(models.Director, schemas.DirectorOrm)
+        self.negative_ttl = negative_ttl
+        self._ids = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.add_write_listener(self._ids.clear)
+
+    def find_id(self, first_name: str, last_name: str) -> Optional[int]:
+        key = (first_name, last_name)
+        director_id = self._ids.get(key, _MISSING)
+        if director_id is _MISSING:
+            director_id = self.model.query.with_entities(self.model.id)\
+                .filter_by(first_name=first_name, last_name=last_name).order_by(self.model.id).limit(1).scalar()
+            self._ids.set(key, director_id, ttl=None if director_id else self.negative_ttl)
+
+        return director_id
+
+    def find_ids(self, names: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """Same as 'find_id' for many names, names missing in cache are fetched with one query."""
+
+        ids, misses = {}, set()
+        for key in set(names):
+            director_id = self._ids.get(key, _MISSING)
+            if director_id is _MISSING:
+                misses.add(key)
+            elif director_id:
+                ids[key] = director_id
+
+        if misses:
+            rows = self.model.query.with_entities(self.model.first_name, self.model.last_name, self.model.id)\
+                .filter(db.tuple_(self.model.first_name, self.model.last_name).in_(misses))\
+                .order_by(self.model.id.desc()).all()
+            # rows go by id descending, so the lowest id wins, as in 'find_id'
+            found = {(first_name, last_name): director_id for first_name, last_name, director_id in rows}
+            for key in misses:
+                self._ids.set(key, found.get(key), ttl=None if key in found else self.negative_ttl)
+            ids.update(found)
+
+        return ids
@@ -1,118 +1,272 @@
 """Operations for 'Film' model"""
 
-from typing import Generic, Optional
-from sqlalchemy.sql.selectable import Subquery
+from typing import Generic, Iterator, List, Optional
+from sqlalchemy.exc import SQLAlchemyError
 from app.domain.abc_repos.film import ABCFilmRepo
 from app.domain import schemas, models
 from app.domain.models.db import db
+from app.data.registry import GenreRegistry
+from app.data.search import ABCTitleSearch, TrigramTitleSearch
+from app.data.serializers import FilmSerializer
+from app.exceptions import MissingData
 from app.utils.logger import my_logger
 
 from app.utils.custom_types import ModelType, SchemaType
 from .base import CRUDBase
+from .query_builder import FilmQueryBuilder
 
 
 class CRUDFilm(CRUDBase, ABCFilmRepo, Generic[ModelType, SchemaType]):
 
-    def __init__(self):
+    list_options = (db.selectinload(models.Film.genres),)
+    # Extra option for listings which also need director's data.
+    with_director = db.joinedload(models.Film.director)
+
+    def __init__(self, genre_registry: GenreRegistry, title_search: ABCTitleSearch = TrigramTitleSearch()):
         super().__init__(models.Film, schemas.FilmOrm)
+        self.genre_registry = genre_registry
+        self.title_search = title_search
 
     def create(self, schema: schemas.NewFilmSchema, session: db.Session = db.session) -> Optional[schemas.FilmOrm]:
 
         schema.genres = self._find_genres(schema.genres)
         return super().create(schema, session)
 
+    def create_many(self, films: List[schemas.NewFilmSchema], chunk_size=1000,
+                    session: db.Session = db.session) -> List[schemas.BulkItemResult]:
+        """Create films with batched inserts, one transaction per chunk.
+        If chunk fails, none of its films are saved and each gets the error."""
+
+        results = []
+        for start in range(0, len(films), chunk_size):
+            results += self._create_chunk(films[start:start + chunk_size], start, session)
+
+        if any(result.id for result in results):
+            self._notify_write()
+
+        return results
+
+    def _create_chunk(self, films: List[schemas.NewFilmSchema], offset: int,
+                      session: db.Session) -> List[schemas.BulkItemResult]:
+        results, rows, genre_ids = [], [], []
+        for index, schema in enumerate(films, offset):
+            try:
+                genre_ids.append(self.genre_registry.get_ids(schema.genres))
+            except MissingData as error:
+                results.append(schemas.BulkItemResult(index=index, title=schema.title, error=str(error)))
+                continue
+            rows.append((index, schema.dict(exclude={"genres"})))
+
+        if not rows:
+            return results
+
+        try:
+            film_ids = self._insert_films([row for _, row in rows], session)
+            links = [{"film_id": film_id, "genre_id": genre_id}
+                     for film_id, ids in zip(film_ids, genre_ids) for genre_id in ids]
+            if links:
+                session.execute(models.film_genre.insert(), links)
+            self._commit(session)
+        except SQLAlchemyError as error:
+            session.rollback()
+            my_logger.error("bulk film chunk at %d rolled back: %s", offset, error)
+            message = f"Chunk rolled back: {getattr(error, 'orig', None) or error}"
+            results += [schemas.BulkItemResult(index=index, title=row["title"], error=message)
+                        for index, row in rows]
+            return sorted(results, key=lambda result: result.index)
+
+        results += [schemas.BulkItemResult(index=index, id=film_id, title=row["title"])
+                    for (index, row), film_id in zip(rows, film_ids)]
+
+        return sorted(results, key=lambda result: result.index)
+
+    def _insert_films(self, rows: List[dict], session: db.Session) -> List[int]:
+        """Insert film rows, returning their ids in the same order.
+
+        On Postgres ids are taken from the sequence in one query, so rows go
+        in one batched executemany. Other dbs insert row by row.
+        """
+
+        table = self.model.__table__
+        if db.engine.dialect.name != "postgresql":
+            return [session.execute(table.insert().values(row)).inserted_primary_key[0] for row in rows]
+
+        film_ids = session.execute(db.text("SELECT nextval(pg_get_serial_sequence('film', 'id')) "
+                                           "FROM generate_series(1, :count)"), {"count": len(rows)}).scalars().all()
+        session.execute(table.insert(), [dict(row, id=film_id) for row, film_id in zip(rows, film_ids)])
+
+        return film_ids
+
     def update(self, get_schema: schemas.GetFilmSchema, upd_schema: schemas.FilmSchema,
                session: db.Session = db.session) -> Optional[schemas.FilmOrm]:
-        """Convert film genres names list into genre models list before base update."""
+        """Update film with UPDATE ... RETURNING, replacing its genres if 'genres' is set.
+        Returns updated film, or None if there is no such film."""
+
+        genre_ids = self.genre_registry.get_ids(upd_schema.genres) if upd_schema.genres else None
+        values = self._dict_without_none(upd_schema.copy(update={"genres": None}))
+
+        row = self._update_returning(get_schema, values, session)
+        if row is None:
+            session.rollback()
+            return None
+
+        film_genre = models.film_genre
+        if genre_ids is not None:
+            session.execute(film_genre.delete().where(film_genre.c.film_id == row.id))
+            session.execute(film_genre.insert(), [{"film_id": row.id, "genre_id": genre_id} for genre_id in genre_ids])
+        else:
+            genre_ids = session.execute(db.select(film_genre.c.genre_id)
+                                        .where(film_genre.c.film_id == row.id)).scalars().all()
+
+        self._commit(session)
+        self._notify_write()
+        # same order as 'genres' relationship
+        return self.from_orm_schema(**row._mapping, genres=self.genre_registry.get_names(sorted(genre_ids)))
 
-        if upd_schema.genres:
-            return self._update_with_genres(get_schema, upd_schema, session)
+    def _find_genres(self, genres_list: list) -> list:
+        """Find genre models by genre name."""
 
-        upd_schema.genres = None
-        return self._update(get_schema, upd_schema, session)
+        return self.genre_registry.get_models(genres_list)
 
-    def _update(self, get_schema: schemas.GetFilmSchema, upd_schema: schemas.FilmSchema,
-                session: db.Session = db.session):
+    def get_by_title_and_director(self, title: str, first_name: str, last_name: str) -> Optional[schemas.FilmOrm]:
+        """Film by title and director's name, fetched with genres in one joined query."""
 
-        return super().update(get_schema, upd_schema, session)
+        model = self.model.query.join(self.model.director)\
+            .filter(self.model.title == title, models.Director.first_name == first_name,
+                    models.Director.last_name == last_name)\
+            .options(db.contains_eager(self.model.director), db.joinedload(self.model.genres))\
+            .order_by(self.model.id).first()
 
-    def _update_with_genres(self, get_schema: schemas.GetFilmSchema, upd_schema: schemas.FilmSchema,
-                            session: db.Session = db.session):
-        """Makes update with special operations for updating 'genres' list"""
+        return self.from_orm_schema.from_orm(model) if model else None
 
-        genres = upd_schema.genres
-        upd_schema.genres = None
+    def get_fields_by_title_and_director(self, title: str, first_name: str, last_name: str,
+                                         fields: Optional[frozenset] = None) -> Optional[dict]:
+        """Only 'fields' of film found by title and director's name, selecting just their columns."""
 
-        update_dict = self._dict_without_none(upd_schema)
-        updated_index = self.model.query.filter_by(**get_schema.dict()).update(update_dict)
-        self.model.query.get(updated_index).genres = self._find_genres(genres)
+        serializer = FilmSerializer.of(fields)
+        row = self._rows_query(serializer).join(self.model.director)\
+            .filter(self.model.title == title, models.Director.first_name == first_name,
+                    models.Director.last_name == last_name)\
+            .order_by(self.model.id).first()
 
-        session.commit()
-        return self.from_orm_schema.from_orm(updated_index)
+        return self._process_models([row], serializer)[0] if row else None
 
-    def _find_genres(self, genres_list: list) -> list:
-        """Find genre models by genre name."""
+    def get_films_by_title(self, schema: schemas.GetFilmByTitle, page=1, per_page=10,
+                           with_total=False, fields: Optional[frozenset] = None,
+                           view: str = "full") -> schemas.PageSchema:
+        """Returning page of films by non-strict title search."""
+
+        serializer = FilmSerializer.of(fields, view)
+        query = self._builder(self._rows_query(serializer)).title(schema.title).ordered()
+
+        return self._paginate(query, page, per_page, with_total, serializer=serializer)
+
+    def get_films_by_ids(self, ids: list, fields: Optional[frozenset] = None, view: str = "full") -> list:
+        """Returning films with given ids in the same order."""
+
+        if not ids:
+            return []
+
+        serializer = FilmSerializer.of(fields, view)
+        rows = self._rows_query(serializer).filter(self.model.id.in_(ids)).all()
+        positions = {film_id: position for position, film_id in enumerate(ids)}
+        rows.sort(key=lambda row: positions[row.id])
+
+        return self._process_models(rows, serializer)
+
+    def get_films_with_sort(self, schema: schemas.SortFilmSchema, page=1, per_page=10,
+                            with_total=False, fields: Optional[frozenset] = None,
+                            view: str = "full") -> schemas.PageSchema:
+        """Returning page of sorted films."""
+
+        serializer = FilmSerializer.of(fields, view)
+        query = self._builder(self._rows_query(serializer)).sort(schema.sort_by, schema.sort_type).ordered()
+
+        return self._paginate(query, page, per_page, with_total, serializer=serializer)
+
+    def get_films_with_sort_after(self, schema: schemas.SortFilmSchema, after: Optional[list] = None,
+                                  per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                  view: str = "full") -> schemas.PageSchema:
+        """Returning page of sorted films which starts after (sort value, id) position."""
+
+        serializer = FilmSerializer.of(fields, view)
+        builder = self._builder(self._rows_query(serializer)).sort(schema.sort_by, schema.sort_type)
+
+        return self._keyset_page(builder, after, per_page, with_total, serializer)
+
+    def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page=1, per_page=10,
+                              with_total=False, fields: Optional[frozenset] = None,
+                              view: str = "full") -> schemas.PageSchema:
+        """Returning page of films filtered, searched and sorted by parameters from schema."""
+
+        serializer = FilmSerializer.of(fields, view)
+        query = self._builder(self._rows_query(serializer)).filter(schema).ordered()
+
+        return self._paginate(query, page, per_page, with_total, serializer=serializer)
+
+    def get_films_with_filter_after(self, schema: schemas.FilterFilmSchema, after: Optional[list] = None,
+                                    per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                    view: str = "full") -> schemas.PageSchema:
+        """Returning page of filtered films which starts after position.
+        Position is (sort value, id) if schema has 'sort_by' and (id, ) otherwise."""
 
-        genre_models = [models.Genre.query.filter_by(genre=genre_name).first()
-                        for genre_name in genres_list]
+        serializer = FilmSerializer.of(fields, view)
+        builder = self._builder(self._rows_query(serializer)).filter(schema)
 
-        return genre_models
+        return self._keyset_page(builder, after, per_page, with_total, serializer)
 
-    def get_films_by_title(self, schema: schemas.GetFilmByTitle, page=1, per_page=10) -> Optional[list]:
-        """Returning list of films by non-strict title search."""
+    def stream_films(self, schema: schemas.FilterFilmSchema, chunk_size=1000) -> Iterator[dict]:
+        """Yield films with director's name, filtered like 'get_films_with_filter'.
+        Rows are fetched from server-side cursor 'chunk_size' at a time."""
 
-        models_list = self.model.query.filter(self.model.title.like(f"%{schema.title}%"))\
-            .paginate(page=page, per_page=per_page).items
-        schemas_list = self._process_models(models_list)
+        query = self._builder(self._list_query(self.with_director)).filter(schema).keyset_ordered()\
+            .execution_options(stream_results=True).yield_per(chunk_size)
 
-        return schemas_list
+        for model in query:
+            film = self.from_orm_schema.from_orm(model).dict()
+            film["director"] = model.director.name if model.director else None
+            yield film
 
-    def get_films_with_sort(self, schema: schemas.SortFilmSchema, page=1, per_page=10)\
-            -> Optional[list]:
-        """Returning sorted films list."""
+    def get_all(self, page=1, per_page=10, with_total=False) -> schemas.PageSchema:
+        """Get all operation"""
 
-        models_list = self.model.query.order_by(db.text(f"{schema.sort_by} {schema.sort_type}"))\
-            .paginate(page=page, per_page=per_page).items
-        schemas_list = self._process_models(models_list)
-        return schemas_list
+        return self._paginate(self._rows_query().order_by(self.model.id), page, per_page, with_total)
 
-    def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page=1, per_page=10)\
-            -> Optional[list]:
-        result = db.session.query(self.model).subquery()
-        """Returning list of films filtered by some parameters."""
+    def _builder(self, query) -> FilmQueryBuilder:
+        return FilmQueryBuilder(query, db.engine.dialect.name, self.title_search)
 
-        if schema.director_id:
-            result = self._filter_by_director(result, schema.director_id)
-        if schema.date_from:
-            result = self._filter_by_date(result, schema.date_from, schema.date_to)
-        if schema.genres:
-            result = self._filter_by_genres(result, schema.genres)
+    def _rows_query(self, serializer: Optional[FilmSerializer] = None):
+        """Query selecting only columns serializer needs, for listings."""
 
-        models_list = db.session.query(self.model).select_entity_from(result).\
-            paginate(page=page, per_page=per_page).items
-        schemas_list = self._process_models(models_list)
+        serializer = serializer or FilmSerializer.of()
+        query = self.model.query.with_entities(*serializer.columns)
 
-        return schemas_list
+        return query.outerjoin(self.model.director) if serializer.with_director else query
 
-    def _filter_by_director(self, subquery: Subquery, director_id: int) -> Optional[models.Film]:
-        """Filter films by director"""
+    def _process_models(self, rows: list, serializer: Optional[FilmSerializer] = None) -> list:
+        """Turn rows of '_rows_query' into dicts without pydantic.
+        Genres of all films are fetched in one query, if serializer needs them."""
 
-        return db.session.query(self.model).select_entity_from(subquery).\
-            filter(self.model.director_id == director_id).subquery()
+        serializer = serializer or FilmSerializer.of()
+        if not rows or not serializer.with_genres:
+            return [serializer.serialize(row) for row in rows]
 
-    def _filter_by_date(self, subquery: Subquery, date_from: str, date_to: Optional[str]):
-        """Filter films by date."""
+        film_genre = models.film_genre
+        genres = {row.id: [] for row in rows}
+        for film_id, genre in db.session.query(film_genre.c.film_id, models.Genre.genre)\
+                .join(models.Genre, models.Genre.id == film_genre.c.genre_id)\
+                .filter(film_genre.c.film_id.in_(genres)).order_by(models.Genre.id):
+            genres[film_id].append(genre)
 
-        if not date_to:
-            return db.session.query(self.model).select_entity_from(subquery).\
-                filter(self.model.release_date >= date_from).subquery()
+        return [serializer.serialize(row, genres[row.id]) for row in rows]
 
-        return db.session.query(self.model).select_entity_from(subquery).\
-            filter((date_to >= self.model.release_date) &
-                   (self.model.release_date >= date_from)).subquery()
+    def _keyset_page(self, builder: FilmQueryBuilder, after: Optional[list], per_page: int,
+                     with_total=False, serializer: Optional[FilmSerializer] = None) -> schemas.PageSchema:
+        self._check_page(1, per_page)
+        total = self._total(builder.query) if with_total else None
+        if after:
+            builder.after(after)
 
-    def _filter_by_genres(self, subquery: Subquery, genres: list):
-        """Filter films by genres."""
+        models_list = builder.keyset_ordered().limit(per_page + 1).all()
 
-        return db.session.query(self.model).select_entity_from(subquery).\
-            filter(self.model.genres.any(models.Genre.genre.in_(genres))).subquery()
+        return self._page(models_list, per_page, total, serializer=serializer)
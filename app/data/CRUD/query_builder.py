@@ -0,0 +1,114 @@
+"""Composable query for film listings."""
+
+from typing import Optional
+from app.data.search import ABCTitleSearch
+from app.domain import models, schemas
+from app.domain.models.db import db
+
+
+class FilmQueryBuilder:
+    """Composes filters, title search and sorting into one flat SELECT.
+
+    All predicates go into a single WHERE clause, genres are checked with
+    EXISTS, so planner sees the whole query. Methods return the builder:
+
+        FilmQueryBuilder(query, "postgresql", search).director(1).sort("rating", "desc").ordered()
+    """
+
+    def __init__(self, query, dialect_name: str, title_search: ABCTitleSearch):
+        self.model = models.Film
+        self.query = query
+        self.dialect_name = dialect_name
+        self.title_search = title_search
+        self._sort = None
+        self._relevance = None
+
+    def director(self, director_id: int) -> "FilmQueryBuilder":
+        self.query = self.query.filter(self.model.director_id == director_id)
+        return self
+
+    def released(self, date_from: str, date_to: Optional[str] = None) -> "FilmQueryBuilder":
+        self.query = self.query.filter(self.model.release_date >= date_from)
+        if date_to:
+            self.query = self.query.filter(self.model.release_date <= date_to)
+        return self
+
+    def genres(self, genres: list) -> "FilmQueryBuilder":
+        """Films with at least one of genres."""
+
+        self.query = self.query.filter(self.model.genres.any(models.Genre.genre.in_(genres)))
+        return self
+
+    def title(self, term: str) -> "FilmQueryBuilder":
+        """Non-strict title search. Results are ordered by relevance unless sorted."""
+
+        self.query = self.query.filter(self.title_search.condition(self.model, term, self.dialect_name))
+        self._relevance = self.title_search.ordering(self.model, term, self.dialect_name)
+        return self
+
+    def sort(self, sort_by: str, sort_type: str = "asc") -> "FilmQueryBuilder":
+        self._sort = (getattr(self.model, sort_by), sort_type)
+        return self
+
+    def filter(self, schema: schemas.FilterFilmSchema) -> "FilmQueryBuilder":
+        """Apply all parameters set in schema."""
+
+        if schema.director_id:
+            self.director(schema.director_id)
+        if schema.date_from:
+            self.released(schema.date_from, schema.date_to)
+        if schema.genres:
+            self.genres(schema.genres)
+        if schema.title:
+            self.title(schema.title)
+        if schema.sort_by:
+            self.sort(schema.sort_by, schema.sort_type)
+        return self
+
+    def after(self, position: list) -> "FilmQueryBuilder":
+        """Keep only films placed after position in 'keyset_ordered' order.
+        Position is (sort value, id) for sorted query and (id, ) otherwise."""
+
+        if self._sort:
+            self.query = self.query.filter(self._seek_predicate(*self._sort, *position))
+        else:
+            last_id, = position
+            self.query = self.query.filter(self.model.id > last_id)
+        return self
+
+    def ordered(self):
+        """Query ordered by sort, search relevance or id, in that priority."""
+
+        if self._sort:
+            return self.keyset_ordered()
+        if self._relevance:
+            return self.query.order_by(*self._relevance)
+        return self.query.order_by(self.model.id)
+
+    def keyset_ordered(self):
+        """Query ordered by sort or id, with id as a tie-breaker."""
+
+        if not self._sort:
+            return self.query.order_by(self.model.id)
+
+        sort_column, sort_type = self._sort
+        if sort_type == "desc":
+            return self.query.order_by(sort_column.desc(), self.model.id.desc())
+        return self.query.order_by(sort_column.asc(), self.model.id.asc())
+
+    def _seek_predicate(self, sort_column, sort_type: str, last_value, last_id: int):
+        """Condition for rows placed after (last_value, last_id) in sort order.
+
+        Follows Postgres default placement of NULLs: last for 'asc', first for 'desc'.
+        """
+
+        if sort_type == "desc":
+            if last_value is None:
+                return db.or_(db.and_(sort_column.is_(None), self.model.id < last_id),
+                              sort_column.isnot(None))
+            return db.tuple_(sort_column, self.model.id) < (last_value, last_id)
+
+        if last_value is None:
+            return db.and_(sort_column.is_(None), self.model.id > last_id)
+        return db.or_(db.tuple_(sort_column, self.model.id) > (last_value, last_id),
+                      sort_column.is_(None))
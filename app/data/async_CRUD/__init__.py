@@ -0,0 +1,4 @@
+"""Package with CRUD operations on asyncio engine."""
+from .base import AsyncCRUDBase
+from .films import AsyncCRUDFilm
+from .directors import AsyncCRUDDirector
@@ -0,0 +1,137 @@
+"""Basic operations with models, awaited."""
+
+from inspect import isawaitable
+from typing import Generic, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.data.async_db import AsyncDb
+from app.data.CRUD import CRUDBase
+from app.domain.schemas import GetFromIdSchema, PageSchema
+from app.utils.custom_types import SchemaType, ModelType, SecondSchemaType
+from app.utils.logger import my_logger
+
+
+class AsyncCRUDBase(CRUDBase, Generic[ModelType, SchemaType, SecondSchemaType]):
+    """Operations of 'CRUDBase' as coroutines.
+
+    Every call runs in its own session, so concurrent calls use separate
+    connections. Needs db with RETURNING support, as Postgres with asyncpg.
+    """
+
+    def __init__(self, model: Type[ModelType], from_orm_schema: Type[SchemaType], db: AsyncDb):
+        super().__init__(model, from_orm_schema)
+        self.db = db
+
+    async def get_with_id(self, schema: GetFromIdSchema) -> Optional[Type[SchemaType]]:
+        """Get with id operation"""
+
+        return await self._first(self._list_query().filter_by(id=schema.id))
+
+    async def get(self, schema: SchemaType) -> Optional[Type[SchemaType]]:
+        """Get operation"""
+
+        return await self._first(self._list_query().filter_by(**schema.dict()))
+
+    async def get_all(self, page=1, per_page=10, with_total=False) -> PageSchema:
+        """Get all operation"""
+
+        return await self._paginate(self._list_query().order_by(self.model.id), page, per_page, with_total)
+
+    async def create(self, schema: SchemaType) -> Optional[Type[SchemaType]]:
+        """Create operation"""
+
+        new_model = self.model(**schema.dict())
+        async with self.db.session() as session:
+            session.add(new_model)
+            await self._commit(session)
+        await self._notify_write()
+
+        return self.from_orm_schema.from_orm(new_model)
+
+    async def update(self, get_schema: SchemaType, update_schema: SecondSchemaType) -> Optional[Type[SchemaType]]:
+        """Update operation. Returns updated entity, or None if nothing matched 'get_schema'."""
+
+        async with self.db.session() as session:
+            row = await self._update_returning(get_schema, self._dict_without_none(update_schema), session)
+            await self._commit(session)
+        await self._notify_write()
+
+        return self.from_orm_schema.from_orm(row) if row else None
+
+    async def delete(self, schema: SchemaType) -> None:
+        """Delete operation"""
+
+        async with self.db.session() as session:
+            await session.execute(delete(self.model).filter_by(**schema.dict()))
+            await self._commit(session)
+        await self._notify_write()
+
+    async def _update_returning(self, get_schema: BaseModel, values: dict, session: AsyncSession):
+        """Apply values to rows matching 'get_schema' with UPDATE ... RETURNING, returning the first row."""
+
+        table = self.model.__table__
+        criteria = [table.c[key] == value for key, value in get_schema.dict().items()]
+
+        if not values:
+            return (await session.execute(select(table).where(*criteria).limit(1))).first()
+        return (await session.execute(update(table).where(*criteria).values(values).returning(*table.c))).first()
+
+    def _list_query(self, *extra_options):
+        """Select for listing operations with loader options applied."""
+
+        return select(self.model).options(*self.list_options, *extra_options)
+
+    async def _commit(self, session: AsyncSession) -> None:
+        """Call commit hooks, awaiting those which return awaitables, and commit."""
+
+        for hook in self._commit_hooks:
+            result = hook(session)
+            if isawaitable(result):
+                await result
+        await session.commit()
+
+    async def _notify_write(self) -> None:
+        """Call write listeners, awaiting those which return awaitables.
+        Write is already committed, so their errors are only logged."""
+
+        for listener in self._write_listeners:
+            try:
+                result = listener()
+                if isawaitable(result):
+                    await result
+            except Exception:
+                my_logger.exception("write listener %r failed", listener)
+
+    async def _first(self, query) -> Optional[Type[SchemaType]]:
+        async with self.db.session() as session:
+            model = (await session.execute(query.limit(1))).unique().scalars().first()
+
+        return self.from_orm_schema.from_orm(model) if model else None
+
+    async def _all(self, query) -> list:
+        async with self.db.session() as session:
+            return (await session.execute(query)).unique().scalars().all()
+
+    async def _paginate(self, query, page: int, per_page: int, with_total=False, **options) -> PageSchema:
+        """Page of query results, fetching one extra row to find out whether there is a next page.
+        'options' go to '_process_models'."""
+
+        self._check_page(page, per_page)
+        models_list = await self._all(query.limit(per_page + 1).offset((page - 1) * per_page))
+        return self._page(models_list, per_page, await self._total(query) if with_total else None, **options)
+
+    async def _total(self, query) -> int:
+        """Exact number of rows in query results, cached for a short time like in 'CRUDBase'."""
+
+        query = query.order_by(None)
+        compiled = query.compile(dialect=self.db.engine.dialect, compile_kwargs={"render_postcompile": True})
+
+        key = (str(compiled), tuple(sorted(compiled.params.items())))
+        total = self._exact_counts.get(key)
+        if total is None:
+            async with self.db.session() as session:
+                total = (await session.execute(select(func.count()).select_from(query.subquery()))).scalar()
+            self._exact_counts.set(key, total)
+
+        return total
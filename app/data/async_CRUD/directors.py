@@ -0,0 +1,59 @@
+"""Operations for 'Director' model, awaited."""
+
+from typing import Dict, Generic, Iterable, Optional, Tuple
+from sqlalchemy import select, tuple_
+from app.data.async_db import AsyncDb
+from app.domain.abc_repos import ABCDirectorRepo
+from app.domain import schemas, models
+from app.utils.cache import TTLCache
+from app.utils.custom_types import ModelType, SchemaType
+from .base import AsyncCRUDBase
+
+_MISSING = object()
+
+
+class AsyncCRUDDirector(AsyncCRUDBase, ABCDirectorRepo, Generic[ModelType, SchemaType]):
+    """Directors repo with the same cache of name to id resolutions as 'CRUDDirector'."""
+
+    def __init__(self, db: AsyncDb, max_entries: int = 10000, ttl: float = 300.0, negative_ttl: float = 10.0):
+        super().__init__(models.Director, schemas.DirectorOrm, db)
+        self.negative_ttl = negative_ttl
+        self._ids = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.add_write_listener(self._ids.clear)
+
+    async def find_id(self, first_name: str, last_name: str) -> Optional[int]:
+        key = (first_name, last_name)
+        director_id = self._ids.get(key, _MISSING)
+        if director_id is _MISSING:
+            async with self.db.session() as session:
+                director_id = (await session.execute(
+                    select(self.model.id).filter_by(first_name=first_name, last_name=last_name)
+                    .order_by(self.model.id).limit(1))).scalar()
+            self._ids.set(key, director_id, ttl=None if director_id else self.negative_ttl)
+
+        return director_id
+
+    async def find_ids(self, names: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """Same as 'find_id' for many names, names missing in cache are fetched with one query."""
+
+        ids, misses = {}, set()
+        for key in set(names):
+            director_id = self._ids.get(key, _MISSING)
+            if director_id is _MISSING:
+                misses.add(key)
+            elif director_id:
+                ids[key] = director_id
+
+        if misses:
+            async with self.db.session() as session:
+                rows = (await session.execute(
+                    select(self.model.first_name, self.model.last_name, self.model.id)
+                    .where(tuple_(self.model.first_name, self.model.last_name).in_(misses))
+                    .order_by(self.model.id.desc()))).all()
+            # rows go by id descending, so the lowest id wins, as in 'find_id'
+            found = {(first_name, last_name): director_id for first_name, last_name, director_id in rows}
+            for key in misses:
+                self._ids.set(key, found.get(key), ttl=None if key in found else self.negative_ttl)
+            ids.update(found)
+
+        return ids
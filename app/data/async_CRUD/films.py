@@ -0,0 +1,251 @@
+"""Operations for 'Film' model, awaited."""
+
+from typing import AsyncIterator, Dict, Generic, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from app.data.async_db import AsyncDb
+from app.data.CRUD.query_builder import FilmQueryBuilder
+from app.data.search import ABCTitleSearch, TrigramTitleSearch
+from app.domain.abc_repos.film import ABCFilmRepo
+from app.domain import schemas, models
+from app.exceptions import MissingData
+from app.utils.logger import my_logger
+from app.utils.custom_types import ModelType, SchemaType
+from .base import AsyncCRUDBase
+
+
+class AsyncCRUDFilm(AsyncCRUDBase, ABCFilmRepo, Generic[ModelType, SchemaType]):
+    """Operations of 'CRUDFilm' as coroutines. Genres are looked up in db,
+    as genre registry is synchronous."""
+
+    list_options = (selectinload(models.Film.genres),)
+    # Extra option for listings which also need director's data.
+    with_director = joinedload(models.Film.director)
+
+    def __init__(self, db: AsyncDb, title_search: ABCTitleSearch = TrigramTitleSearch()):
+        super().__init__(models.Film, schemas.FilmOrm, db)
+        self.title_search = title_search
+
+    async def create(self, schema: schemas.NewFilmSchema) -> Optional[schemas.FilmOrm]:
+        async with self.db.session() as session:
+            genres = (await session.execute(select(models.Genre)
+                                            .where(models.Genre.genre.in_(schema.genres)))).scalars().all()
+            self._check_genres(schema.genres, {genre.genre for genre in genres})
+
+            new_model = self.model(**schema.dict(exclude={"genres"}), genres=genres)
+            session.add(new_model)
+            await self._commit(session)
+        await self._notify_write()
+
+        return self.from_orm_schema.from_orm(new_model)
+
+    async def create_many(self, films: List[schemas.NewFilmSchema], chunk_size=1000) -> List[schemas.BulkItemResult]:
+        """Create films with batched inserts, one transaction per chunk.
+        If chunk fails, none of its films are saved and each gets the error."""
+
+        results = []
+        async with self.db.session() as session:
+            genre_ids = await self._genre_ids(session)
+            for start in range(0, len(films), chunk_size):
+                results += await self._create_chunk(films[start:start + chunk_size], start, genre_ids, session)
+
+        if any(result.id for result in results):
+            await self._notify_write()
+
+        return results
+
+    async def _create_chunk(self, films: List[schemas.NewFilmSchema], offset: int, genre_ids: Dict[str, int],
+                            session: AsyncSession) -> List[schemas.BulkItemResult]:
+        results, rows, links = [], [], []
+        for index, schema in enumerate(films, offset):
+            try:
+                self._check_genres(schema.genres, genre_ids)
+            except MissingData as error:
+                results.append(schemas.BulkItemResult(index=index, title=schema.title, error=str(error)))
+                continue
+            rows.append((index, schema.dict(exclude={"genres"})))
+            links.append([genre_ids[genre] for genre in schema.genres])
+
+        if not rows:
+            return results
+
+        try:
+            film_ids = (await session.execute(text("SELECT nextval(pg_get_serial_sequence('film', 'id')) "
+                                                   "FROM generate_series(1, :count)"),
+                                              {"count": len(rows)})).scalars().all()
+            await session.execute(self.model.__table__.insert(),
+                                  [dict(row, id=film_id) for (_, row), film_id in zip(rows, film_ids)])
+            film_genres = [{"film_id": film_id, "genre_id": genre_id}
+                           for film_id, ids in zip(film_ids, links) for genre_id in ids]
+            if film_genres:
+                await session.execute(models.film_genre.insert(), film_genres)
+            await self._commit(session)
+        except SQLAlchemyError as error:
+            await session.rollback()
+            my_logger.error("bulk film chunk at %d rolled back: %s", offset, error)
+            message = f"Chunk rolled back: {getattr(error, 'orig', None) or error}"
+            results += [schemas.BulkItemResult(index=index, title=row["title"], error=message)
+                        for index, row in rows]
+            return sorted(results, key=lambda result: result.index)
+
+        results += [schemas.BulkItemResult(index=index, id=film_id, title=row["title"])
+                    for (index, row), film_id in zip(rows, film_ids)]
+
+        return sorted(results, key=lambda result: result.index)
+
+    async def update(self, get_schema: schemas.GetFromIdSchema,
+                     upd_schema: schemas.FilmSchema) -> Optional[schemas.FilmOrm]:
+        """Update film with UPDATE ... RETURNING, replacing its genres if 'genres' is set.
+        Returns updated film, or None if there is no such film."""
+
+        values = self._dict_without_none(upd_schema.copy(update={"genres": None}))
+        film_genre = models.film_genre
+
+        async with self.db.session() as session:
+            genre_ids = None
+            if upd_schema.genres:
+                genre_ids = await self._genre_ids(session)
+                self._check_genres(upd_schema.genres, genre_ids)
+
+            row = await self._update_returning(get_schema, values, session)
+            if row is None:
+                await session.rollback()
+                return None
+
+            if genre_ids is not None:
+                await session.execute(film_genre.delete().where(film_genre.c.film_id == row.id))
+                await session.execute(film_genre.insert(), [{"film_id": row.id, "genre_id": genre_ids[genre]}
+                                                            for genre in upd_schema.genres])
+            genres = (await session.execute(select(models.Genre.genre)
+                                            .join(film_genre, film_genre.c.genre_id == models.Genre.id)
+                                            .where(film_genre.c.film_id == row.id)
+                                            .order_by(models.Genre.id))).scalars().all()
+            await self._commit(session)
+        await self._notify_write()
+
+        return self.from_orm_schema(**row._mapping, genres=genres)
+
+    async def get_by_title_and_director(self, title: str, first_name: str,
+                                        last_name: str) -> Optional[schemas.FilmOrm]:
+        """Film by title and director's name, fetched with genres in one joined query."""
+
+        return await self._first(select(self.model).join(self.model.director)
+                                 .where(self.model.title == title, models.Director.first_name == first_name,
+                                        models.Director.last_name == last_name)
+                                 .options(contains_eager(self.model.director), joinedload(self.model.genres))
+                                 .order_by(self.model.id))
+
+    async def get_fields_by_title_and_director(self, title: str, first_name: str, last_name: str,
+                                               fields: Optional[frozenset] = None) -> Optional[dict]:
+        """Only 'fields' of film found by title and director's name. Whole film is fetched."""
+
+        film = await self.get_by_title_and_director(title, first_name, last_name)
+
+        return film.dict(include=fields) if film else None
+
+    async def get_films_by_title(self, schema: schemas.GetFilmByTitle, page=1, per_page=10,
+                                 with_total=False, fields: Optional[frozenset] = None,
+                                 view: str = "full") -> schemas.PageSchema:
+        """Returning page of films by non-strict title search."""
+
+        return await self._paginate(self._builder(*self._view_options(view)).title(schema.title).ordered(),
+                                    page, per_page, with_total, fields=fields, view=view)
+
+    async def get_films_by_ids(self, ids: list, fields: Optional[frozenset] = None, view: str = "full") -> list:
+        """Returning films with given ids in the same order."""
+
+        if not ids:
+            return []
+
+        models_list = await self._all(self._list_query(*self._view_options(view)).where(self.model.id.in_(ids)))
+        positions = {film_id: position for position, film_id in enumerate(ids)}
+        models_list.sort(key=lambda model: positions[model.id])
+
+        return self._process_models(models_list, fields, view)
+
+    async def get_films_with_sort(self, schema: schemas.SortFilmSchema, page=1, per_page=10,
+                                  with_total=False, fields: Optional[frozenset] = None,
+                                  view: str = "full") -> schemas.PageSchema:
+        """Returning page of sorted films."""
+
+        query = self._builder(*self._view_options(view)).sort(schema.sort_by, schema.sort_type).ordered()
+
+        return await self._paginate(query, page, per_page, with_total, fields=fields, view=view)
+
+    async def get_films_with_sort_after(self, schema: schemas.SortFilmSchema, after: Optional[list] = None,
+                                        per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                        view: str = "full") -> schemas.PageSchema:
+        """Returning page of sorted films which starts after (sort value, id) position."""
+
+        builder = self._builder(*self._view_options(view)).sort(schema.sort_by, schema.sort_type)
+
+        return await self._keyset_page(builder, after, per_page, with_total, fields, view)
+
+    async def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page=1, per_page=10,
+                                    with_total=False, fields: Optional[frozenset] = None,
+                                    view: str = "full") -> schemas.PageSchema:
+        """Returning page of films filtered, searched and sorted by parameters from schema."""
+
+        return await self._paginate(self._builder(*self._view_options(view)).filter(schema).ordered(),
+                                    page, per_page, with_total, fields=fields, view=view)
+
+    async def get_films_with_filter_after(self, schema: schemas.FilterFilmSchema, after: Optional[list] = None,
+                                          per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                          view: str = "full") -> schemas.PageSchema:
+        """Returning page of filtered films which starts after position.
+        Position is (sort value, id) if schema has 'sort_by' and (id, ) otherwise."""
+
+        builder = self._builder(*self._view_options(view)).filter(schema)
+
+        return await self._keyset_page(builder, after, per_page, with_total, fields, view)
+
+    async def stream_films(self, schema: schemas.FilterFilmSchema, chunk_size=1000) -> AsyncIterator[dict]:
+        """Yield films with director's name, filtered like 'get_films_with_filter'.
+        Rows are fetched from server-side cursor 'chunk_size' at a time."""
+
+        query = self._builder(self.with_director).filter(schema).keyset_ordered()\
+            .execution_options(yield_per=chunk_size)
+
+        async with self.db.session() as session:
+            async for model in (await session.stream(query)).scalars():
+                film = self.from_orm_schema.from_orm(model).dict()
+                film["director"] = model.director.name if model.director else None
+                yield film
+
+    def _builder(self, *extra_options) -> FilmQueryBuilder:
+        return FilmQueryBuilder(self._list_query(*extra_options), self.db.dialect_name, self.title_search)
+
+    def _view_options(self, view: str) -> tuple:
+        """Loader options for listing films in 'view'. Cards show director's name."""
+
+        return (self.with_director, ) if view == "card" else ()
+
+    async def _keyset_page(self, builder: FilmQueryBuilder, after: Optional[list], per_page: int,
+                           with_total=False, fields: Optional[frozenset] = None,
+                           view: str = "full") -> schemas.PageSchema:
+        self._check_page(1, per_page)
+        total = await self._total(builder.query) if with_total else None
+        if after:
+            builder.after(after)
+
+        models_list = await self._all(builder.keyset_ordered().limit(per_page + 1))
+
+        return self._page(models_list, per_page, total, fields=fields, view=view)
+
+    def _process_models(self, models_list: list, fields: Optional[frozenset] = None, view: str = "full") -> list:
+        """Turn models into dicts of 'fields' of 'view', of all fields if None. Columns are not narrowed here."""
+
+        schema = schemas.FilmCard if view == "card" else self.from_orm_schema
+        return [schema.from_orm(model).dict(include=fields) for model in models_list]
+
+    @staticmethod
+    async def _genre_ids(session: AsyncSession) -> Dict[str, int]:
+        return dict((await session.execute(select(models.Genre.genre, models.Genre.id))).all())
+
+    @staticmethod
+    def _check_genres(names: list, known) -> None:
+        for name in names:
+            if name not in known:
+                raise MissingData(f"There are no '{name}' genre in db!")
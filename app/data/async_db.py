@@ -0,0 +1,46 @@
+"""Asyncio engine and sessions for ASGI app."""
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class AsyncDb:
+    """Async engine with session factory.
+
+    Engine is created on first use, so modules using it can be imported
+    where async driver is not installed.
+    """
+
+    def __init__(self, uri: str, **engine_options):
+        self.uri = uri
+        self.engine_options = engine_options
+        self._engine: Optional[AsyncEngine] = None
+        self._sessions = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._ensure_engine()
+
+    @property
+    def dialect_name(self) -> str:
+        return self.engine.dialect.name
+
+    def session(self) -> AsyncSession:
+        """New session, to be used as 'async with db.session() as session'."""
+
+        self._ensure_engine()
+        return self._sessions()
+
+    def _ensure_engine(self) -> AsyncEngine:
+        """Create engine and session factory on first use."""
+
+        if self._engine is None:
+            self._engine = create_async_engine(self.uri, **self.engine_options)
+            self._sessions = sessionmaker(self._engine, class_=AsyncSession, expire_on_commit=False)
+        return self._engine
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
@@ -0,0 +1,17 @@
+"""Instances of async CRUD repos for ASGI app"""
+
+from app import app
+from app.data import async_CRUD
+from app.data.async_db import AsyncDb
+from app.data.repos import catalog_version
+from app.domain import models, schemas
+
+async_db = AsyncDb(app.config["ASYNC_DATABASE_URI"], **app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+
+film_repo = async_CRUD.AsyncCRUDFilm(async_db)
+director_repo = async_CRUD.AsyncCRUDDirector(async_db)
+user_repo = async_CRUD.AsyncCRUDBase(models.Users, schemas.UserOrm, async_db)
+
+for repo in (film_repo, director_repo):
+    repo.add_commit_hook(catalog_version.bump_async)
+    repo.add_write_listener(catalog_version.invalidate)
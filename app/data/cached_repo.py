@@ -0,0 +1,127 @@
+"""Read-through cache in front of films repo."""
+
+import json
+from typing import Callable, Iterator, List, Optional
+from pydantic.json import pydantic_encoder
+from app.domain import schemas
+from app.domain.abc_repos import ABCFilmRepo
+from app.utils.cache import TTLCache
+
+_MISSING = object()
+
+
+def approximate_size(value) -> int:
+    """Size of value serialized to JSON, close to what it takes in response."""
+
+    return len(json.dumps(value, default=pydantic_encoder))
+
+
+def _key_encoder(value):
+    """Sets are encoded sorted, so equal sets give the same key."""
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return pydantic_encoder(value)
+
+
+class CachedFilmRepo(ABCFilmRepo):
+    """Films repo which serves repeated reads from per-worker cache.
+
+    Results are keyed on method name and normalized arguments. Every write
+    made through this repo clears the whole cache, writes made in other
+    workers are visible after cache 'ttl' at most. Keys also carry data
+    'version' if it is given, so results are reused only while version stays
+    the same, and a result is never older than the version it is served under.
+    """
+
+    def __init__(self, repo: ABCFilmRepo, cache: TTLCache, version: Optional[Callable[[], int]] = None):
+        super().__init__(repo.model, repo.from_orm_schema)
+        self.repo = repo
+        self.cache = cache
+        self.version = version
+
+    def invalidate(self) -> None:
+        self.cache.clear()
+
+    def get_with_id(self, schema: schemas.GetFromIdSchema) -> Optional[schemas.FilmOrm]:
+        return self._cached("get_with_id", schema)
+
+    def get(self, schema: schemas.GetFilmSchema) -> Optional[schemas.FilmOrm]:
+        return self._cached("get", schema)
+
+    def get_by_title_and_director(self, title: str, first_name: str, last_name: str) -> Optional[schemas.FilmOrm]:
+        return self._cached("get_by_title_and_director", title, first_name, last_name)
+
+    def get_fields_by_title_and_director(self, title: str, first_name: str, last_name: str,
+                                         fields: Optional[frozenset] = None) -> Optional[dict]:
+        return self._cached("get_fields_by_title_and_director", title, first_name, last_name, fields)
+
+    def get_all(self, page=1, per_page=10, with_total=False) -> schemas.PageSchema:
+        return self._cached("get_all", page, per_page, with_total)
+
+    def get_films_by_title(self, schema: schemas.GetFilmByTitle, page=1, per_page=10,
+                           with_total=False, fields: Optional[frozenset] = None,
+                           view: str = "full") -> schemas.PageSchema:
+        return self._cached("get_films_by_title", schema, page, per_page, with_total, fields, view)
+
+    def get_films_by_ids(self, ids: list, fields: Optional[frozenset] = None, view: str = "full") -> list:
+        return self._cached("get_films_by_ids", ids, fields, view)
+
+    def get_films_with_sort(self, schema: schemas.SortFilmSchema, page=1, per_page=10,
+                            with_total=False, fields: Optional[frozenset] = None,
+                            view: str = "full") -> schemas.PageSchema:
+        return self._cached("get_films_with_sort", schema, page, per_page, with_total, fields, view)
+
+    def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page=1, per_page=10,
+                              with_total=False, fields: Optional[frozenset] = None,
+                              view: str = "full") -> schemas.PageSchema:
+        return self._cached("get_films_with_filter", schema, page, per_page, with_total, fields, view)
+
+    def get_films_with_sort_after(self, schema: schemas.SortFilmSchema, after: Optional[list] = None,
+                                  per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                  view: str = "full") -> schemas.PageSchema:
+        return self._cached("get_films_with_sort_after", schema, after, per_page, with_total, fields, view)
+
+    def get_films_with_filter_after(self, schema: schemas.FilterFilmSchema, after: Optional[list] = None,
+                                    per_page=10, with_total=False, fields: Optional[frozenset] = None,
+                                    view: str = "full") -> schemas.PageSchema:
+        return self._cached("get_films_with_filter_after", schema, after, per_page, with_total, fields, view)
+
+    def stream_films(self, schema: schemas.FilterFilmSchema, chunk_size=1000) -> Iterator[dict]:
+        return self.repo.stream_films(schema, chunk_size)
+
+    def create(self, schema: schemas.NewFilmSchema) -> Optional[schemas.FilmOrm]:
+        try:
+            return self.repo.create(schema)
+        finally:
+            self.invalidate()
+
+    def create_many(self, films: List[schemas.NewFilmSchema], chunk_size=1000) -> List[schemas.BulkItemResult]:
+        try:
+            return self.repo.create_many(films, chunk_size)
+        finally:
+            self.invalidate()
+
+    def update(self, get_schema: schemas.GetFromIdSchema, upd_schema: schemas.FilmSchema) -> Optional[schemas.FilmOrm]:
+        try:
+            return self.repo.update(get_schema, upd_schema)
+        finally:
+            self.invalidate()
+
+    def delete(self, schema: schemas.GetFromIdSchema) -> None:
+        try:
+            self.repo.delete(schema)
+        finally:
+            self.invalidate()
+
+    def _cached(self, method: str, *args):
+        """Result of repo method, taken from cache if possible. 'None' results are cached too."""
+
+        version = self.version() if self.version else None
+        key = json.dumps([version, method, *args], default=_key_encoder, sort_keys=True)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = getattr(self.repo, method)(*args)
+            self.cache.set(key, result)
+
+        return result
@@ -0,0 +1,78 @@
+"""Version of film catalog, for conditional requests."""
+
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict
+from sqlalchemy.engine import Engine
+from app.domain import models
+from app.domain.models.db import db, replica_reads
+
+_TABLE = models.CatalogVersion.__table__
+_BUMP = db.update(_TABLE).where(_TABLE.c.id == 1).values(version=_TABLE.c.version + 1)
+_READ = db.select(_TABLE.c.version).where(_TABLE.c.id == 1)
+
+
+class CatalogVersion:
+    """Counter in 'catalog_version' table, bumped in the same transaction as
+    every write to films, directors or genres, so any committed change of
+    catalog changes the version.
+
+    Version is read with the same routing as 'read_only' reads, so it never
+    runs ahead of data which the same request reads from a lagging replica.
+    Version read from each db is reused for 'ttl' seconds, so writes made in
+    other workers are seen after 'ttl' at most. Writes of this worker are seen
+    at once. Change listeners are called when a newer version is seen.
+    """
+
+    def __init__(self, ttl: float = 1.0):
+        self.ttl = ttl
+        self._versions: Dict[Engine, int] = {}
+        self._expires_at: Dict[Engine, float] = {}
+        self._change_listeners = []
+        self._lock = Lock()
+
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        self._change_listeners.append(listener)
+
+    def current(self) -> int:
+        """Catalog version as 'read_only' reads of this request see it, read from
+        their db at most once in 'ttl'. Needs app context."""
+
+        session = db.session()
+        with replica_reads():
+            engine = session.get_bind(clause=_READ)
+            if monotonic() < self._expires_at.get(engine, 0.0):
+                return self._versions[engine]
+
+            version = session.execute(_READ).scalar() or 0
+        self._set(engine, version)
+
+        return version
+
+    @staticmethod
+    def bump(session: db.Session) -> None:
+        """Count a write of 'session', before it is committed. 'invalidate' should
+        be called after commit, so this worker sees the new version at once."""
+
+        session.execute(_BUMP)
+
+    @staticmethod
+    async def bump_async(session) -> None:
+        """'bump' in async session."""
+
+        await session.execute(_BUMP)
+
+    def invalidate(self) -> None:
+        """Read version from db on next 'current'."""
+
+        self._expires_at.clear()
+
+    def _set(self, engine: Engine, version: int) -> None:
+        with self._lock:
+            changed = engine in self._versions and version != self._versions[engine]
+            self._versions[engine] = version
+            self._expires_at[engine] = monotonic() + self.ttl
+
+        if changed:
+            for listener in self._change_listeners:
+                listener()
@@ -0,0 +1,90 @@
+"""Connection pool which collects checkout statistics."""
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds in seconds of checkout latency histogram buckets.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Thread-safe counters of connection checkouts."""
+
+    def __init__(self, buckets: tuple = CHECKOUT_BUCKETS):
+        self.buckets = buckets
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._counts = [0] * (len(buckets) + 1)
+        self._lock = Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._counts[bisect_left(self.buckets, seconds)] += 1
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def histogram(self) -> dict:
+        """Cumulative counts of checkouts which took at most bucket's seconds."""
+
+        histogram, total = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self._counts):
+            total += count
+            histogram[bound] = total
+        return histogram
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"checkouts": self.checkouts, "timeouts": self.timeouts,
+                    "wait_seconds_total": round(self.wait_total, 6), "wait_seconds_max": round(self.wait_max, 6),
+                    "checkout_seconds": self.histogram()}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool which measures how long every checkout takes, including
+    waiting for a free connection, connecting and pre-ping."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeout:
+            self.metrics.timeout()
+            raise
+        self.metrics.observe(perf_counter() - started_at)
+        return connection
+
+    def recreate(self):
+        # counters survive dispose() of the engine
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        """Current state of the pool and checkout counters of this worker."""
+
+        return {"size": self.size(), "checked_in": self.checkedin(), "checked_out": self.checkedout(),
+                "overflow": self.overflow(), "max_overflow": self._max_overflow, "timeout": self._timeout,
+                **self.metrics.stats()}
+
+
+def pool_stats(pool) -> dict:
+    """Stats of the pool, only its class for pools which are not instrumented."""
+
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.stats())
+    return stats
@@ -0,0 +1,87 @@
+"""In-memory registries of small and rarely changed tables."""
+
+from threading import Lock
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import make_transient_to_detached
+from app.domain import models
+from app.domain.models.db import db
+from app.exceptions import MissingData
+
+
+class GenreRegistry:
+    """Genre names and ids, loaded once per worker.
+
+    Should be invalidated after every write to 'genre' table.
+    """
+
+    def __init__(self):
+        self._ids: Optional[Dict[str, int]] = None
+        self._names: Dict[int, str] = {}
+        self._lock = Lock()
+
+    def invalidate(self) -> None:
+        """Drop loaded genres, they will be reloaded on next lookup."""
+
+        self._ids = None
+
+    def get_models(self, genres_list: Iterable[str], session: db.Session = db.session) -> list:
+        """Return genre models by genre names without querying db."""
+
+        return [self._to_model(self._get_id(genre_name), session) for genre_name in genres_list]
+
+    def get_ids(self, genres_list: Iterable[str]) -> list:
+        """Return genre ids by genre names without querying db."""
+
+        return [self._get_id(genre_name) for genre_name in genres_list]
+
+    def get_names(self, ids_list: Iterable[int]) -> list:
+        """Return genre names by ids. Reloads registry once if some id is unknown."""
+
+        ids_list = list(ids_list)
+        self._get_ids()
+        if any(genre_id not in self._names for genre_id in ids_list):
+            self.invalidate()
+            self._get_ids()
+
+        return [self._names[genre_id] for genre_id in ids_list]
+
+    def get_models_by_id(self, ids_list: Iterable[int], session: db.Session = db.session) -> list:
+        """Return genre models by ids without querying db."""
+
+        self._get_ids()
+        return [self._to_model(genre_id, session) for genre_id in ids_list]
+
+    def _get_id(self, genre_name: str) -> int:
+        """Genre id by its name. Reloads registry once if name is unknown."""
+
+        genre_id = self._get_ids().get(genre_name)
+        if genre_id is None:
+            self.invalidate()
+            genre_id = self._get_ids().get(genre_name)
+        if genre_id is None:
+            raise MissingData(f"There are no '{genre_name}' genre in db!")
+
+        return genre_id
+
+    def _get_ids(self) -> Dict[str, int]:
+        ids = self._ids
+        if ids is None:
+            with self._lock:
+                if self._ids is None:
+                    rows = db.session.query(models.Genre.id, models.Genre.genre).all()
+                    self._names = {genre_id: genre for genre_id, genre in rows}
+                    self._ids = {genre: genre_id for genre_id, genre in rows}
+                ids = self._ids
+
+        return ids
+
+    def _to_model(self, genre_id: int, session: db.Session) -> models.Genre:
+        """Attach genre to session as already persisted row."""
+
+        if genre_id not in self._names:
+            raise MissingData(f"There are no genre with id {genre_id} in db!")
+
+        genre = models.Genre(id=genre_id, genre=self._names[genre_id])
+        make_transient_to_detached(genre)
+
+        return session.merge(genre, load=False)
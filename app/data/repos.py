@@ -2,8 +2,40 @@
 
 from app.data import CRUD
 from app.domain import models, schemas
+from app import app
+from app.data.registry import GenreRegistry
+from app.data.title_index import TitleIndex
+from app.data.cached_repo import CachedFilmRepo, approximate_size
+from app.data.catalog_version import CatalogVersion
+from app.utils.cache import TTLCache
 
-film_repo = CRUD.CRUDFilm()
-director_repo = CRUD.CRUDBase(models.Director, schemas.DirectorOrm)
+genre_registry = GenreRegistry()
+title_index = TitleIndex(max_staleness=app.config["TITLE_INDEX_MAX_STALENESS"])
+
+film_repo = CRUD.CRUDFilm(genre_registry)
+director_repo = CRUD.CRUDDirector()
 user_repo = CRUD.CRUDBase(models.Users, schemas.UserOrm)
+# users loaded for sessions, any write to users may change their permissions
+user_cache = TTLCache(max_entries=app.config["USER_CACHE_MAX_ENTRIES"], ttl=app.config["USER_CACHE_TTL"])
+user_repo.add_write_listener(user_cache.clear)
 genre_repo = CRUD.CRUDBase(models.Genre, schemas.GenreOrm)
+genre_repo.add_write_listener(genre_registry.invalidate)
+
+catalog_version = CatalogVersion(ttl=app.config["CATALOG_VERSION_TTL"])
+# film responses are made of films, directors and genres
+for repo in (film_repo, director_repo, genre_repo):
+    repo.add_commit_hook(catalog_version.bump)
+    repo.add_write_listener(catalog_version.invalidate)
+
+# cached films are served only under the catalog version they were read at
+cached_film_repo = CachedFilmRepo(film_repo, TTLCache(max_entries=app.config["FILM_CACHE_MAX_ENTRIES"],
+                                                      ttl=app.config["FILM_CACHE_TTL"],
+                                                      max_bytes=app.config["FILM_CACHE_MAX_BYTES"],
+                                                      sizeof=approximate_size),
+                                  version=catalog_version.current)
+# cached films contain genre names
+genre_repo.add_write_listener(cached_film_repo.invalidate)
+# newer version means films were changed in other worker
+catalog_version.add_change_listener(cached_film_repo.invalidate)
+# title index doesn't have films written by other workers, so it waits for rebuild
+catalog_version.add_change_listener(title_index.invalidate)
@@ -0,0 +1,56 @@
+"""Title search backends for films repo."""
+
+from abc import ABC, abstractmethod
+from app.domain.models.db import db
+
+
+LIKE_ESCAPE = "/"
+
+
+def escape_like(term: str, escape: str = LIKE_ESCAPE) -> str:
+    """Escape LIKE wildcards, so term is matched literally."""
+
+    return term.replace(escape, escape * 2).replace("%", escape + "%").replace("_", escape + "_")
+
+
+class ABCTitleSearch(ABC):
+
+    @abstractmethod
+    def condition(self, model, term: str, dialect_name: str):
+        """Filter condition for films matching term."""
+        ...
+
+    @abstractmethod
+    def ordering(self, model, term: str, dialect_name: str) -> list:
+        """Order by clauses placing the most relevant films first."""
+        ...
+
+    def apply(self, query, model, term: str, dialect_name: str):
+        """Filter and order query by title search term."""
+
+        return query.filter(self.condition(model, term, dialect_name))\
+            .order_by(*self.ordering(model, term, dialect_name))
+
+
+class LikeTitleSearch(ABCTitleSearch):
+    """Case-insensitive substring search ordered by id. Needs sequential scan."""
+
+    def condition(self, model, term: str, dialect_name: str):
+        return model.title.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE)
+
+    def ordering(self, model, term: str, dialect_name: str) -> list:
+        return [model.id]
+
+
+class TrigramTitleSearch(LikeTitleSearch):
+    """Case-insensitive substring search which uses pg_trgm GIN index on Postgres.
+
+    Results are ordered by relevance: the closer term is to a whole word of
+    the title, the higher the film. Falls back to plain ordering on other dbs.
+    """
+
+    def ordering(self, model, term: str, dialect_name: str) -> list:
+        if dialect_name != "postgresql":
+            return super().ordering(model, term, dialect_name)
+
+        return [db.func.word_similarity(term, model.title).desc(), model.id]
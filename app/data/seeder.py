@@ -0,0 +1,171 @@
+"""Bulk generation and loading of fake data."""
+
+import csv
+import io
+import random
+from contextlib import nullcontext
+from multiprocessing import Pool
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional
+from faker import Faker
+from app.domain import models
+from app.domain.models.db import db
+from app.data.registry import GenreRegistry
+
+GENRES = ["Action", "Comedy", "Drama", "Fantasy", "Horror",
+          "Mystery", "Romance", "Thriller", "Western"]
+
+# Tables filled by seeder, in load order, with columns of generated rows.
+TABLES = {"director": ("id", "first_name", "last_name", "age"),
+          "users": ("id", "username", "password", "email", "admin_bool"),
+          "film": ("id", "title", "description", "poster", "release_date", "director_id", "rating", "user_id"),
+          "film_genre": ("film_id", "genre_id")}
+
+
+class SeedChunk(NamedTuple):
+    """Everything needed to generate one chunk, so chunks can be generated in any process."""
+
+    index: int
+    size: int
+    # first ids reserved for the whole run
+    director_start: int
+    user_start: int
+    film_start: int
+    chunk_size: int
+    genre_ids: tuple
+    seed: Optional[int]
+
+
+def generate_chunk(chunk: SeedChunk) -> Dict[str, List[tuple]]:
+    """Rows of every seeded table for chunk. Foreign keys point to rows of this
+    or previous chunks only, so chunks can be loaded one by one in order."""
+
+    seed = None if chunk.seed is None else chunk.seed + chunk.index
+    faker = Faker()
+    faker.seed_instance(seed)
+    rng = random.Random(seed)
+
+    offset = chunk.index * chunk.chunk_size
+    last_director = chunk.director_start + offset + chunk.size - 1
+    last_user = chunk.user_start + offset + chunk.size - 1
+
+    rows = {table: [] for table in TABLES}
+    for number in range(offset, offset + chunk.size):
+        director_id, user_id, film_id = (chunk.director_start + number, chunk.user_start + number,
+                                         chunk.film_start + number)
+
+        rows["director"].append((director_id, faker.first_name(), faker.last_name(), rng.randint(18, 100)))
+        # id suffix makes names unique among seeded users without tracking them
+        rows["users"].append((user_id, f"{faker.user_name()}{user_id}", faker.password(), faker.email(),
+                              rng.random() < 0.5))
+        rows["film"].append((film_id, faker.sentence(nb_words=4), faker.text(), faker.image_url(),
+                             faker.date_object(), rng.randint(chunk.director_start, last_director),
+                             round(rng.uniform(0.1, 9.9), 1), rng.randint(chunk.user_start, last_user)))
+        rows["film_genre"].extend((film_id, genre_id)
+                                  for genre_id in rng.sample(chunk.genre_ids, rng.randint(1, 3)))
+
+    return rows
+
+
+class Seeder:
+    """Fills db with 'amount' of fake directors, users and films.
+
+    Ids are reserved from sequences up front, so rows are generated with
+    final ids and foreign keys without querying db. Chunks are generated by
+    'processes' worker processes and loaded by the calling one, on Postgres
+    with COPY and with batched executemany on other dbs. Every chunk is
+    loaded in its own transaction.
+    """
+
+    def __init__(self, genre_registry: GenreRegistry, chunk_size: int = 10000, processes: int = 1,
+                 seed: Optional[int] = None, session: db.Session = db.session):
+        self.genre_registry = genre_registry
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.seed = seed
+        self.session = session
+
+    def run(self, amount: int, on_chunk: Callable[[int, int, float], None] = lambda *args: None) -> int:
+        """Seed db, calling 'on_chunk(films loaded, rows loaded, seconds)' after every chunk.
+        Returns number of loaded rows."""
+
+        started_at = perf_counter()
+        genre_ids = tuple(self._ensure_genres())
+        starts = [self._reserve_ids(model.__table__, amount)
+                  for model in (models.Director, models.Users, models.Film)]
+        self.session.commit()
+
+        chunks = [SeedChunk(index, min(self.chunk_size, amount - start), *starts,
+                            self.chunk_size, genre_ids, self.seed)
+                  for index, start in enumerate(range(0, amount, self.chunk_size))]
+
+        films = rows_count = 0
+        with Pool(self.processes) if self.processes > 1 else nullcontext() as pool:
+            for rows in pool.imap(generate_chunk, chunks) if pool else map(generate_chunk, chunks):
+                rows_count += self._load(rows)
+                films += len(rows["film"])
+                on_chunk(films, rows_count, perf_counter() - started_at)
+
+        return rows_count
+
+    def _ensure_genres(self) -> list:
+        """Ids of all genres, missing ones are created."""
+
+        existing = {genre for genre, in self.session.query(models.Genre.genre)}
+        missing = [{"genre": genre} for genre in GENRES if genre not in existing]
+        if missing:
+            self.session.execute(models.Genre.__table__.insert(), missing)
+            self.session.commit()
+            self.genre_registry.invalidate()
+
+        return self.genre_registry.get_ids(GENRES)
+
+    def _reserve_ids(self, table, amount: int) -> int:
+        """First of 'amount' ids reserved for table."""
+
+        if db.engine.dialect.name != "postgresql":
+            return (self.session.query(db.func.max(table.c.id)).scalar() or 0) + 1
+
+        first_id = self.session.execute(db.text("SELECT nextval(pg_get_serial_sequence(:table, 'id'))"),
+                                        {"table": table.name}).scalar()
+        self.session.execute(db.text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :last_id)"),
+                             {"table": table.name, "last_id": first_id + amount - 1})
+        return first_id
+
+    def _load(self, rows: Dict[str, List[tuple]]) -> int:
+        """Load chunk rows in one transaction, returning number of rows."""
+
+        self._rename_taken_users(rows["users"])
+        try:
+            for table, columns in TABLES.items():
+                if db.engine.dialect.name == "postgresql":
+                    self._copy(table, columns, rows[table])
+                else:
+                    self.session.execute(db.metadata.tables[table].insert(),
+                                         [dict(zip(columns, row)) for row in rows[table]])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return sum(len(table_rows) for table_rows in rows.values())
+
+    def _rename_taken_users(self, users: List[tuple]) -> None:
+        """Seeded usernames are unique among themselves, but may be taken by existing users."""
+
+        taken = {username for username, in self.session.query(models.Users.username)
+                 .filter(models.Users.username.in_([user[1] for user in users]))}
+        if taken:
+            users[:] = [(user[0], f"{user[1]}_{user[0]}", *user[2:]) if user[1] in taken else user
+                        for user in users]
+
+    def _copy(self, table: str, columns: tuple, rows: List[tuple]) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
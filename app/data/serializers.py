@@ -0,0 +1,95 @@
+"""Serialization of selected rows into response dicts without pydantic.
+
+Used on read paths only, where values come from db and are valid already.
+Output is the same as '.dict()' of matching pydantic schema.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional
+from app.domain import models
+
+
+def make_serializer(fields: Dict[str, Optional[Callable]], extra: Iterable[str] = ()) -> Callable[..., dict]:
+    """Make 'serialize(row, *extra)' which turns row of values into dict.
+
+    'fields' are output keys in output order with converters, None keeps
+    value as is. Keys listed in 'extra' are taken from arguments after row,
+    in 'extra' order, others from row positions in order. Positions are
+    resolved once, so serializing a row is a single dict comprehension.
+    """
+
+    extra = tuple(extra)
+    row_keys = [key for key in fields if key not in extra]
+    positions = {key: position for position, key in enumerate([*row_keys, *extra])}
+    items = tuple((key, positions[key], converter) for key, converter in fields.items())
+
+    def serialize(row, *args) -> dict:
+        values = (*row, *args) if args else row
+        return {key: values[position] if converter is None else converter(values[position])
+                for key, position, converter in items}
+
+    return serialize
+
+
+def _date(value) -> Optional[str]:
+    return value.strftime("%Y-%m-%d") if value is not None else None
+
+
+def _director_id(value):
+    return "unknown" if value is None else value
+
+
+def _float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+# Film fields in 'FilmOrm' order, with selected column and converter.
+FILM_FIELDS = {"title": (models.Film.title, None),
+               "description": (models.Film.description, None),
+               "poster": (models.Film.poster, None),
+               "release_date": (models.Film.release_date, _date),
+               "director_id": (models.Film.director_id, _director_id),
+               "rating": (models.Film.rating, _float),
+               "user_id": (models.Film.user_id, None),
+               "genres": (None, None),
+               "id": (models.Film.id, None)}
+
+# Director's name as 'Director.name' gives it, NULL for films without director.
+DIRECTOR_NAME = models.Director.name.label("director")
+
+# Film card fields in 'FilmCard' order. Description is left out, so it is not read for listings.
+CARD_FIELDS = {"id": (models.Film.id, None),
+               "title": (models.Film.title, None),
+               "rating": (models.Film.rating, _float),
+               "release_date": (models.Film.release_date, _date),
+               "director": (DIRECTOR_NAME, None),
+               "genres": (None, None),
+               "poster": (models.Film.poster, None)}
+
+# Film representations by name of the view.
+FILM_VIEWS = {"full": FILM_FIELDS, "card": CARD_FIELDS}
+
+
+class FilmSerializer:
+    """Films as 'FilmOrm(...).dict()' or 'FilmCard(...).dict()' give them, depending
+    on 'view', or only 'fields' of them. Films are serialized from rows of 'columns'
+    and genre names if 'genres' are among fields. 'id' is always kept, genres of
+    listed films are matched on it. If 'with_director' is set, rows should be
+    selected from films outer joined with their directors."""
+
+    def __init__(self, fields: Optional[Iterable[str]] = None, view: str = "full"):
+        spec = FILM_VIEWS[view]
+        fields = {*(spec if fields is None else fields), "id"}
+        self.fields = tuple(field for field in spec if field in fields)
+        self.columns = tuple(spec[field][0] for field in self.fields if field != "genres")
+        self.with_genres = "genres" in self.fields
+        self.with_director = "director" in self.fields
+        self.serialize = make_serializer({field: spec[field][1] for field in self.fields},
+                                         extra=("genres", ) if self.with_genres else ())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def of(cls, fields: Optional[frozenset] = None, view: str = "full") -> "FilmSerializer":
+        """Shared serializer of 'fields' of 'view', of all its fields if None."""
+
+        return cls(fields, view)
@@ -0,0 +1,169 @@
+"""In-memory inverted index of film titles."""
+
+import re
+from array import array
+from bisect import bisect_left, insort
+from threading import RLock, Thread
+from time import monotonic
+from typing import Dict, List, Optional, Set
+from flask import Flask
+from app.domain import models
+from app.domain.abc_repos import ABCTitleIndex
+from app.domain.models.db import db
+from app.utils.logger import my_logger
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class TitleIndex(ABCTitleIndex):
+    """Per-worker index of lowercased film titles.
+
+    Keeps posting lists of film ids for every title token and n-gram in
+    sorted arrays of unsigned ints. Finds films which titles contain search
+    term case-insensitively, films with term as a whole word go first.
+
+    Index knows only about writes made in its own worker, so it is
+    considered stale 'max_staleness' seconds after the last full build, or
+    once 'invalidate' is called, e.g. when writes of other workers are seen.
+    Stale or not built index returns None from 'search' and starts rebuild
+    in background, callers should fall back to db search meanwhile.
+    """
+
+    def __init__(self, n: int = 3, max_staleness: float = 300.0, chunk_size: int = 5000):
+        self.n = n
+        self.max_staleness = max_staleness
+        self.chunk_size = chunk_size
+        self._titles: Dict[int, str] = {}
+        self._ngrams: Dict[str, array] = {}
+        self._tokens: Dict[str, array] = {}
+        self._built_at: Optional[float] = None
+        self._invalidated_at = float("-inf")
+        self._pending: Optional[list] = None
+        self._app: Optional[Flask] = None
+        self._lock = RLock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._built_at is not None and self._built_at > self._invalidated_at \
+            and monotonic() - self._built_at <= self.max_staleness
+
+    def invalidate(self) -> None:
+        """Consider index stale until a build started after this call is done."""
+
+        self._invalidated_at = monotonic()
+
+    def build(self) -> None:
+        """Build index from streaming scan of 'film' table. Needs app context."""
+
+        with self._lock:
+            if self._pending is not None:
+                return
+            self._pending = []
+
+        started_at = monotonic()
+        titles, ngrams, tokens = {}, {}, {}
+        try:
+            rows = db.session.query(models.Film.id, models.Film.title)\
+                .order_by(models.Film.id).yield_per(self.chunk_size)
+            for film_id, title in rows:
+                # ids come in ascending order, so appending keeps posting lists sorted
+                self._index(film_id, title or "", titles, ngrams, tokens, append=True)
+        finally:
+            db.session.remove()
+            with self._lock:
+                pending, self._pending = self._pending, None
+
+        with self._lock:
+            self._titles, self._ngrams, self._tokens = titles, ngrams, tokens
+            self._built_at = started_at
+            for operation, args in pending:
+                operation(*args)
+
+        my_logger.info("title index built: %d films in %.2fs", len(titles), monotonic() - started_at)
+
+    def build_in_background(self, app: Flask) -> None:
+        """Start 'build' in a daemon thread. Stale index is rebuilt with the same app later."""
+
+        self._app = app
+
+        def run():
+            with app.app_context():
+                try:
+                    self.build()
+                except Exception:
+                    my_logger.exception("title index build failed")
+
+        Thread(target=run, name="title-index-build", daemon=True).start()
+
+    def search(self, term: str) -> Optional[List[int]]:
+        term = term.lower()
+        if len(term) < self.n:
+            return None
+        if not self.is_fresh:
+            if self._app is not None and self._pending is None:
+                self.build_in_background(self._app)
+            return None
+
+        with self._lock:
+            postings = [self._ngrams.get(ngram) for ngram in self._split(term)]
+            if not all(postings):
+                return []
+
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+
+            film_ids = [film_id for film_id in candidates if term in self._titles[film_id]]
+            whole_word = set(self._tokens.get(term, ()))
+
+        return sorted(film_ids, key=lambda film_id: (film_id not in whole_word, film_id))
+
+    def add(self, film_id: int, title: str) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self.add, (film_id, title)))
+            if film_id in self._titles:
+                self._remove(film_id)
+            self._index(film_id, title or "", self._titles, self._ngrams, self._tokens)
+
+    def remove(self, film_id: int) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self.remove, (film_id,)))
+            if film_id in self._titles:
+                self._remove(film_id)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _index(self, film_id: int, title: str, titles: dict, ngrams: dict, tokens: dict,
+               append: bool = False) -> None:
+        title = title.lower()
+        titles[film_id] = title
+
+        for postings, keys in ((ngrams, self._split(title)), (tokens, set(TOKEN_RE.findall(title)))):
+            for key in keys:
+                posting = postings.get(key)
+                if posting is None:
+                    postings[key] = array("I", (film_id,))
+                elif append:
+                    posting.append(film_id)
+                else:
+                    insort(posting, film_id)
+
+    def _remove(self, film_id: int) -> None:
+        title = self._titles.pop(film_id)
+
+        for postings, keys in ((self._ngrams, self._split(title)),
+                               (self._tokens, set(TOKEN_RE.findall(title)))):
+            for key in keys:
+                posting = postings[key]
+                del posting[bisect_left(posting, film_id)]
+                if not posting:
+                    del postings[key]
+
+    def _split(self, text: str) -> Set[str]:
+        """All n-grams of text."""
+
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
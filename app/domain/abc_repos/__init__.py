@@ -1,2 +1,4 @@
 from .base import ABCBaseRepo
 from .film import ABCFilmRepo
+from .director import ABCDirectorRepo
+from .title_index import ABCTitleIndex
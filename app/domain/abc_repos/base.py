@@ -19,7 +19,7 @@ class ABCBaseRepo(ABC, Generic[ModelType, SchemaType]):
         ...
 
     @abstractmethod
-    def get_all(self, page: int, per_page: int) -> Optional[ModelType]:
+    def get_all(self, page: int, per_page: int, with_total: bool) -> BaseModel:
         ...
 
     @abstractmethod
@@ -0,0 +1,15 @@
+from typing import Dict, Iterable, Tuple
+from .base import ABC, abstractmethod, Optional, ABCBaseRepo
+
+
+class ABCDirectorRepo(ABCBaseRepo, ABC):
+
+    @abstractmethod
+    def find_id(self, first_name: str, last_name: str) -> Optional[int]:
+        """Id of director with given full name, or None if there is no such director."""
+        ...
+
+    @abstractmethod
+    def find_ids(self, names: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """Ids of directors by (first name, last name) pairs. Missing directors are left out."""
+        ...
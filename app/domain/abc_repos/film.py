@@ -1,3 +1,4 @@
+from typing import Iterator, List
 from .base import ModelType, SchemaType, Generic, ABC, abstractmethod, Optional, ABCBaseRepo
 from app.domain import schemas, models
 
@@ -5,16 +6,50 @@ from app.domain import schemas, models
 class ABCFilmRepo(ABCBaseRepo, ABC):
 
     @abstractmethod
-    def get_films_by_title(self, schema: schemas.GetFilmByTitle, page: int, per_page: int)\
-            -> Optional[models.Film]:
+    def get_films_by_title(self, schema: schemas.GetFilmByTitle, page: int, per_page: int, with_total: bool,
+                           fields: Optional[frozenset], view: str) -> schemas.PageSchema:
         ...
 
     @abstractmethod
-    def get_films_with_sort(self, schema: schemas.SortFilmSchema, page: int, per_page: int)\
-            -> Optional[models.Film]:
+    def get_by_title_and_director(self, title: str, first_name: str, last_name: str) -> Optional[schemas.FilmOrm]:
         ...
 
     @abstractmethod
-    def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page: int, per_page: int)\
-            -> Optional[models.Film]:
+    def get_fields_by_title_and_director(self, title: str, first_name: str, last_name: str,
+                                         fields: Optional[frozenset]) -> Optional[dict]:
+        """Film as dict of 'fields' and 'id', of all fields if None."""
+        ...
+
+    @abstractmethod
+    def get_films_by_ids(self, ids: list, fields: Optional[frozenset], view: str) -> list:
+        ...
+
+    @abstractmethod
+    def get_films_with_sort(self, schema: schemas.SortFilmSchema, page: int, per_page: int, with_total: bool,
+                            fields: Optional[frozenset], view: str) -> schemas.PageSchema:
+        ...
+
+    @abstractmethod
+    def get_films_with_filter(self, schema: schemas.FilterFilmSchema, page: int, per_page: int, with_total: bool,
+                              fields: Optional[frozenset], view: str) -> schemas.PageSchema:
+        ...
+
+    @abstractmethod
+    def get_films_with_sort_after(self, schema: schemas.SortFilmSchema, after: Optional[list], per_page: int,
+                                  with_total: bool, fields: Optional[frozenset], view: str) -> schemas.PageSchema:
+        ...
+
+    @abstractmethod
+    def get_films_with_filter_after(self, schema: schemas.FilterFilmSchema, after: Optional[list], per_page: int,
+                                    with_total: bool, fields: Optional[frozenset], view: str) -> schemas.PageSchema:
+        ...
+
+    @abstractmethod
+    def create_many(self, films: List[schemas.NewFilmSchema], chunk_size: int) -> List[schemas.BulkItemResult]:
+        """Create films in chunks, returning result for every film, 'index' is its position in 'films'."""
+        ...
+
+    @abstractmethod
+    def stream_films(self, schema: schemas.FilterFilmSchema, chunk_size: int) -> Iterator[dict]:
+        """Yield all films matching schema with director's name, without loading them at once."""
         ...
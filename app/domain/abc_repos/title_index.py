@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class ABCTitleIndex(ABC):
+
+    @abstractmethod
+    def search(self, term: str) -> Optional[List[int]]:
+        """Ids of films which titles contain term, or None if index can't answer."""
+        ...
+
+    @abstractmethod
+    def add(self, film_id: int, title: str) -> None:
+        ...
+
+    @abstractmethod
+    def remove(self, film_id: int) -> None:
+        ...
@@ -0,0 +1,199 @@
+"""Async variants of film services for ASGI app.
+
+They take request arguments and the acting user explicitly, as there are
+no flask request and login contexts there. Arguments are mappings with
+'get' and 'getlist', as werkzeug and starlette query params are.
+"""
+
+from typing import AsyncIterator
+from werkzeug.datastructures import MultiDict
+from app.domain import schemas
+from app.domain.service import FilmGet, FilmAction
+from app.utils.logger import my_logger
+from app.exceptions import MissingData, FilmOperationsError
+
+
+class AsyncFilmUtilsMixin:
+    """Awaited utils of 'FilmUtilsMixin'."""
+
+    async def _find_director(self, name: str) -> int:
+        """Find's director and return's his id"""
+
+        name_list = name.split("_")
+
+        director_schema = schemas.GetDirectorSchema(first_name=name_list[0], last_name=name_list[1])
+        director_id = await self.director_repo.find_id(director_schema.first_name, director_schema.last_name)
+        if not director_id:
+            raise MissingData("There are no such Director in db!")
+
+        return director_id
+
+    async def _find_film(self, title: str, director_name: str):
+        """Find's film by title and director's name and return's his schema"""
+
+        name_list = director_name.split("_")
+
+        director_schema = schemas.GetDirectorSchema(first_name=name_list[0], last_name=name_list[1])
+        film_schema = await self.film_repo.get_by_title_and_director(title, director_schema.first_name,
+                                                                     director_schema.last_name)
+        if not film_schema:
+            raise MissingData("There are no such Film in db!")
+
+        return film_schema
+
+
+class AsyncFilmGet(AsyncFilmUtilsMixin, FilmGet):
+    """Film operations with 'GET' method on async repos. Title index is not used."""
+
+    async def find_film_by_title(self, title, page, per_page, with_total=None, fields=None, view=None):
+        """Returning list of films by non-strict title search."""
+
+        schema = schemas.GetFilmByTitle(title=title)
+        view = self._view(view)
+        films_page = await self.film_repo.get_films_by_title(schema, page, per_page, self._flag(with_total),
+                                                             self._fields(fields, view), view)
+
+        return self._films_response(films_page), 206
+
+    async def get_film(self, title: str, director_name: str, fields=None):
+        """Returning film, only its 'fields' if they are passed."""
+
+        fields = self._fields(fields)
+        film_schema = await self._find_film(title, director_name)
+
+        return {"film": film_schema.dict(include=fields)}, 200
+
+    async def sort_films(self, sort_by: str, sort_type: str, page: int, per_page: int,
+                         cursor=None, with_total=None, fields=None, view=None) -> tuple:
+        """Returning sorted films list.
+        If cursor is passed (empty string for the first page) uses keyset pagination."""
+
+        schema = schemas.SortFilmSchema(sort_by=sort_by, sort_type=sort_type, page=page, per_page=per_page)
+        view = self._view(view)
+        fields = self._fields(fields, view)
+
+        if cursor is not None:
+            after = self._sort_position(schema.sort_by, cursor) if cursor else None
+            films_page = await self.film_repo.get_films_with_sort_after(schema, after, per_page,
+                                                                        self._flag(with_total),
+                                                                        self._with_keys(fields, schema.sort_by), view)
+            return self._films_response(films_page, fields,
+                                        next_cursor=self._next_cursor(films_page, schema.sort_by, "id")), 206
+
+        films_page = await self.film_repo.get_films_with_sort(schema, page, per_page, self._flag(with_total),
+                                                              fields, view)
+
+        return self._films_response(films_page), 206
+
+    async def filter_films(self, args: MultiDict, page: int, per_page: int) -> tuple:
+        """Same as 'FilmGet.filter_films' for request arguments 'args'."""
+
+        schema = await self._filter_schema(args)
+        with_total = self._flag(args.get("with_total"))
+        view = self._view(args.get("view"))
+        fields = self._fields(args.get("fields"), view)
+
+        cursor = args.get("cursor")
+        if cursor is not None:
+            keys = (schema.sort_by, "id") if schema.sort_by else ("id", )
+            after = None
+            if cursor:
+                after = self._sort_position(schema.sort_by, cursor) if schema.sort_by \
+                    else self._filter_position(cursor)
+            films_page = await self.film_repo.get_films_with_filter_after(schema, after, per_page, with_total,
+                                                                          self._with_keys(fields, *keys), view)
+            return self._films_response(films_page, fields,
+                                        next_cursor=self._next_cursor(films_page, *keys)), 206
+
+        films_page = await self.film_repo.get_films_with_filter(schema, page, per_page, with_total, fields, view)
+
+        return self._films_response(films_page), 206
+
+    async def export_films(self, args: MultiDict) -> AsyncIterator[dict]:
+        """All films matching 'filter_films' arguments, with director's name.
+        Films are fetched lazily, while returned iterator is consumed."""
+
+        return self.film_repo.stream_films(await self._filter_schema(args))
+
+    async def _filter_schema(self, args: MultiDict) -> schemas.FilterFilmSchema:
+        """Filter schema from 'filter_films' arguments."""
+
+        director_id = None
+        if args.get("director_name"):
+            director_id = await self._find_director(args.get("director_name"))
+
+        return schemas.FilterFilmSchema(genres=args.getlist("genres"),
+                                        date_from=args.get("date_from"),
+                                        date_to=args.get("date_to"),
+                                        director_id=director_id,
+                                        title=args.get("title"),
+                                        sort_by=args.get("sort_by"),
+                                        sort_type=args.get("sort_type") or "asc")
+
+
+class AsyncFilmAction(AsyncFilmUtilsMixin, FilmAction):
+    """Film operations with not 'GET' method on async repos, made by 'user'. Title index is not used."""
+
+    async def delete_film(self, title: str, director_name: str, user: schemas.UserOrm) -> tuple:
+        """Delete film."""
+
+        film_schema = await self._find_film(title, director_name)
+        self._check_user_permission(film_schema, user)
+
+        await self.film_repo.delete(schemas.GetFromIdSchema(id=film_schema.id))
+        my_logger.info("film '%s' has been deleted by '%s'", film_schema.title, user.username)
+
+        return {"deleted_film": film_schema.dict()}, 200
+
+    async def update_film(self, title: str, director_name: str, args: MultiDict, user: schemas.UserOrm) -> tuple:
+        """Update film."""
+
+        film_schema = await self._find_film(title, director_name)
+        self._check_user_permission(film_schema, user)
+
+        new_director_id = await self._find_director(args.get("director_name")) \
+            if args.get("director_name") else None
+
+        upd_schema = schemas.FilmSchema(title=args.get("title"),
+                                        description=args.get("description"),
+                                        poster=args.get("poster"),
+                                        release_date=args.get("release_date"),
+                                        director_id=new_director_id,
+                                        genres=args.getlist("genres"),
+                                        rating=args.get("rating"))
+
+        updated_schema = await self.film_repo.update(schemas.GetFromIdSchema(id=film_schema.id), upd_schema)
+        if not updated_schema:
+            raise MissingData("There are no such Film in db!")
+
+        no_none_dict = {key: value for key, value in upd_schema.dict().items() if value is not None}
+        my_logger.info("user '%s' updated film '%s': %s", user.username, updated_schema.title, no_none_dict)
+
+        return {"updated_film": updated_schema.dict()}, 200
+
+    async def create_film(self, args: MultiDict, user: schemas.UserOrm) -> tuple:
+        """Create film."""
+
+        director_id = await self._find_director(args.get("director_name"))
+
+        schema = schemas.NewFilmSchema(title=args.get("title"),
+                                       description=args.get("description"),
+                                       poster=args.get("poster"),
+                                       release_date=args.get("release_date"),
+                                       director_id=director_id,
+                                       genres=args.getlist("genres"),
+                                       rating=args.get("rating"),
+                                       user_id=user.id)
+
+        new_film_schema = await self.film_repo.create(schema)
+        my_logger.info("User %s added film '%s'", user.username, new_film_schema.title)
+
+        return {"new_film": new_film_schema.dict()}, 201
+
+    @staticmethod
+    def _check_user_permission(film, user: schemas.UserOrm) -> None:
+        """Check is user had posted film or is he an admin.
+         If not raises FilmOperationsError"""
+
+        if user.id != film.user_id and not user.admin_bool:
+            raise FilmOperationsError
@@ -5,3 +5,4 @@ from .film import Film
 from .genre import Genre
 from .film_genre import film_genre
 from .users import Users
+from .catalog_version import CatalogVersion
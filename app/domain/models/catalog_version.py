@@ -0,0 +1,14 @@
+from .db import db
+
+
+class CatalogVersion(db.Model):
+    """Single row counter, bumped with every write to films and related tables."""
+
+    __tablename__ = "catalog_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+db.event.listen(CatalogVersion.__table__, "after_create",
+                db.DDL("INSERT INTO catalog_version (id, version) VALUES (1, 0)"))
@@ -1,8 +1,108 @@
 """Db setup."""
 
-from flask_sqlalchemy import SQLAlchemy
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import time
+from flask import has_request_context, session as http_session
+from flask_sqlalchemy import SQLAlchemy, SignallingSession, get_state
 from flask_migrate import Migrate
+from sqlalchemy import orm
+from sqlalchemy.sql.dml import UpdateBase
 from app import app
+from app.data.pool import InstrumentedQueuePool
 
-db = SQLAlchemy(app)
+# Options which only QueuePool accepts.
+QUEUE_POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+# Key of read replica in SQLALCHEMY_BINDS.
+REPLICA_BIND = "replica"
+# Key of http session value, until which user's reads stay on primary.
+PRIMARY_UNTIL_KEY = "db_primary_until"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Send reads made inside the block to read replica, if it is configured."""
+
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_only(func):
+    """Make reads of decorated function go to read replica. Iterators it
+    returns read from replica too, while they are consumed."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            result = func(*args, **kwargs)
+        return _iterate_on_replica(result) if isinstance(result, Iterator) else result
+
+    return wrapper
+
+
+def _iterate_on_replica(items: Iterator):
+    while True:
+        with replica_reads():
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        yield item
+
+
+class RoutingSession(SignallingSession):
+    """Session which sends reads made in 'replica_reads' to replica bind.
+
+    Once session writes, it stays on primary, and so do reads of the user
+    for REPLICA_STICKY_SECONDS after, which covers replication lag.
+    """
+
+    def get_bind(self, mapper=None, clause=None):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._mark_write()
+        elif self._reads_from_replica():
+            return get_state(self.app).db.get_engine(self.app, bind=REPLICA_BIND)
+
+        return super().get_bind(mapper, clause)
+
+    def _has_replica(self) -> bool:
+        return REPLICA_BIND in (self.app.config["SQLALCHEMY_BINDS"] or {})
+
+    def _reads_from_replica(self) -> bool:
+        if not (_replica_reads.get() and self._has_replica()) or self.info.get("wrote"):
+            return False
+        return not has_request_context() or http_session.get(PRIMARY_UNTIL_KEY, 0) < time()
+
+    def _mark_write(self) -> None:
+        if not self._has_replica():
+            return
+
+        self.info["wrote"] = True
+        if has_request_context():
+            http_session[PRIMARY_UNTIL_KEY] = time() + self.app.config["REPLICA_STICKY_SECONDS"]
+
+
+class AppSQLAlchemy(SQLAlchemy):
+    """Uses routing session and instrumented queue pool, except for SQLite
+    which keeps its own pools."""
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def create_engine(self, sa_url, engine_opts):
+        if sa_url.drivername.startswith("sqlite"):
+            engine_opts = {key: value for key, value in engine_opts.items() if key not in QUEUE_POOL_OPTIONS}
+        else:
+            engine_opts.setdefault("poolclass", InstrumentedQueuePool)
+        return super().create_engine(sa_url, engine_opts)
+
+
+db = AppSQLAlchemy(app)
 migrate = Migrate(app, db)
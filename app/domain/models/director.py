@@ -1,11 +1,27 @@
+from sqlalchemy.ext.hybrid import hybrid_property
 from .db import db
 
 
 class Director(db.Model):
+    __table_args__ = (db.Index("ix_director_first_name_last_name", "first_name", "last_name"),)
+
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.VARCHAR(255))
     last_name = db.Column(db.VARCHAR(255))
     age = db.Column(db.Integer, db.CheckConstraint("100>=age AND age>=18"))
 
+    @hybrid_property
+    def name(self):
+        """First and last name separated by space. Missing part is skipped, None if both are missing."""
+
+        if self.first_name is None or self.last_name is None:
+            return self.last_name if self.first_name is None else self.first_name
+        return f"{self.first_name} {self.last_name}"
+
+    @name.expression
+    def name(cls):
+        return db.case((cls.first_name.is_(None), cls.last_name), (cls.last_name.is_(None), cls.first_name),
+                       else_=cls.first_name + " " + cls.last_name)
+
     def __str__(self):
         return f"Director(name:{self.first_name} {self.last_name})"
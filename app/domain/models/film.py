@@ -2,6 +2,12 @@ from .db import db
 
 
 class Film(db.Model):
+    __table_args__ = (db.Index("ix_film_rating_id", "rating", "id"),
+                      db.Index("ix_film_release_date_id", "release_date", "id"),
+                      db.Index("ix_film_title_director_id", "title", "director_id"),
+                      db.Index("ix_film_title_trgm", "title", postgresql_using="gin",
+                               postgresql_ops={"title": "gin_trgm_ops"}))
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.VARCHAR(255))
     description = db.Column(db.TEXT)
@@ -10,9 +16,14 @@ class Film(db.Model):
     director_id = db.Column(db.Integer, db.ForeignKey("director.id", ondelete="SET NULL"))
     rating = db.Column(db.NUMERIC, db.CheckConstraint("0.0<=rating AND rating<=10.0"))
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"))
-    genres = db.relationship("Genre", secondary='film_genre',
+    genres = db.relationship("Genre", secondary='film_genre', order_by="Genre.id",
                              backref=db.backref("Film"), cascade="all,delete")
     director = db.relationship("Director", backref=db.backref("Film"))
 
     def __str__(self):
         return f"Film(title:{self.title}, director_id: {self.director_id})"
+
+
+# Trigram index on title needs pg_trgm extension.
+db.event.listen(Film.__table__, "before_create",
+                db.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
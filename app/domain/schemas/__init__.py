@@ -1,10 +1,12 @@
 """Package with pydantic schemas."""
 
 from pydantic import BaseModel, conint
-from .film import GetFilmByTitle, GetFilmSchema, FilmSchema, FilterFilmSchema, FilmOrm, SortFilmSchema, NewFilmSchema
+from .film import GetFilmByTitle, GetFilmSchema, FilmSchema, FilterFilmSchema, FilmOrm, SortFilmSchema, NewFilmSchema, \
+    BulkItemResult, FilmCard
 from .user import UserSchema, UserOrm, UserLogin, NewUserSchema, GetUserSchema
 from .genre import GenreSchema, GenreOrm
 from .director import DirectorOrm, DirectorSchema, GetDirectorSchema, NewDirectorSchema
+from .page import PageSchema
 
 
 class GetFromIdSchema(BaseModel):
@@ -26,7 +26,7 @@ def check_genre(value: list):
         raise ValueError(f"There are no such genres! Available genres:"
                          f"{genres_list}")
 
-    return list(genres_set)
+    return sorted(genres_set)
 
 
 class FilmSchema(BaseModel):
@@ -73,6 +73,9 @@ class FilterFilmSchema(BaseModel):
     date_from: Optional[constr(max_length=10)]
     date_to: Optional[constr(max_length=10)]
     director_id: Optional[conint(gt=0)]
+    title: Optional[constr(max_length=255)]
+    sort_by: Optional[str]
+    sort_type = "asc"
     page: conint(gt=0) = 1
     items_per_page: conint(gt=0) = 10
 
@@ -87,6 +90,14 @@ class FilterFilmSchema(BaseModel):
 
         return value
 
+    @validator("sort_by")
+    def check_sort_option(cls, value):
+        return SortFilmSchema.check_sort_option(value) if value is not None else value
+
+    @validator("sort_type")
+    def check_sort_type(cls, value):
+        return SortFilmSchema.check_sort_type(value)
+
 
 class SortFilmSchema(BaseModel):
     sort_by: str
@@ -109,6 +120,13 @@ class SortFilmSchema(BaseModel):
         return value
 
 
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int]
+    title: Optional[str]
+    error: Optional[str]
+
+
 class FilmOrm(FilmSchema):
     id: Optional[int]
 
@@ -128,3 +146,30 @@ class FilmOrm(FilmSchema):
         if not value:
             return "unknown"
         return value
+
+
+class FilmCard(BaseModel):
+    """Short film for listings, without description."""
+
+    id: Optional[int]
+    title: Optional[str]
+    rating: Optional[float]
+    release_date: Optional[str]
+    director: Optional[str]
+    genres: Optional[list]
+    poster: Optional[HttpUrl]
+
+    class Config:
+        orm_mode = True
+
+    @validator("release_date", pre=True)
+    def date_to_str(cls, value):
+        return value.strftime("%Y-%m-%d") if isinstance(value, datetime.date) else value
+
+    @validator("director", pre=True)
+    def director_name(cls, value):
+        return value.name if value is not None and not isinstance(value, str) else value
+
+    @validator("genres")
+    def unpack_genres(cls, value: list):
+        return [model.genre if not isinstance(model, str) else model for model in value]
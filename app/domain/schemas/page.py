@@ -0,0 +1,8 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PageSchema(BaseModel):
+    items: list
+    has_next: bool
+    total: Optional[int]
@@ -1,41 +1,55 @@
 """Service for domain resources and data communication."""
 
+import datetime
+import json
 from abc import ABC
+from decimal import Decimal
+from typing import Iterator, List, Optional
 from flask import request
+from werkzeug.datastructures import MultiDict
 from flask_login import current_user
+from pydantic import ValidationError
 from app.domain import schemas
-from app.domain.abc_repos import ABCBaseRepo, ABCFilmRepo
+from app.domain.abc_repos import ABCBaseRepo, ABCFilmRepo, ABCDirectorRepo, ABCTitleIndex
+from app.domain.models.db import read_only
 from app.utils.logger import my_logger
-from app.exceptions import (MissingData, NoAccessError,
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.exceptions import (MissingData, NoAccessError, InvalidCursor, ValidationFail,
                             UserAlreadyExists, AuthenticationError, FilmOperationsError)
 
+# Film representations by 'view' argument. Cards are short films for listings.
+FILM_VIEW_SCHEMAS = {"full": schemas.FilmOrm, "card": schemas.FilmCard}
+
 
 class FilmUtilsMixin(ABC):
     """Utils for some other classes."""
 
-    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCBaseRepo):
+    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCDirectorRepo,
+                 title_index: Optional[ABCTitleIndex] = None):
         self.film_repo = film_repo
         self.director_repo = director_repo
+        self.title_index = title_index
 
-    def _find_director(self, name: str):
-        """Find's director and return's his schema"""
+    def _find_director(self, name: str) -> int:
+        """Find's director and return's his id"""
 
         name_list = name.split("_")
 
-        director_schema = self.director_repo.get(schemas.GetDirectorSchema(first_name=name_list[0],
-                                                                           last_name=name_list[1]))
-        if not director_schema:
+        director_schema = schemas.GetDirectorSchema(first_name=name_list[0], last_name=name_list[1])
+        director_id = self.director_repo.find_id(director_schema.first_name, director_schema.last_name)
+        if not director_id:
             raise MissingData("There are no such Director in db!")
 
-        return director_schema
+        return director_id
 
     def _find_film(self, title: str, director_name: str):
-        """Find's film and return's his schema"""
+        """Find's film by title and director's name and return's his schema"""
 
-        director_id = self._find_director(director_name).id
-        schema = schemas.GetFilmSchema(title=title, director_id=director_id)
+        name_list = director_name.split("_")
 
-        film_schema = self.film_repo.get(schema)
+        director_schema = schemas.GetDirectorSchema(first_name=name_list[0], last_name=name_list[1])
+        film_schema = self.film_repo.get_by_title_and_director(title, director_schema.first_name,
+                                                               director_schema.last_name)
         if not film_schema:
             raise MissingData("There are no such Film in db!")
 
@@ -45,55 +59,219 @@ class FilmUtilsMixin(ABC):
 class FilmGet(FilmUtilsMixin):
     """Film operations with 'GET' method."""
 
-    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCBaseRepo):
-        super().__init__(film_repo, director_repo)
+    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCDirectorRepo,
+                 title_index: Optional[ABCTitleIndex] = None):
+        super().__init__(film_repo, director_repo, title_index)
 
-    def find_film_by_title(self, title, page, per_page):
-        """Returning list of films by non-strict title search."""
+    @read_only
+    def find_film_by_title(self, title, page, per_page, with_total: Optional[str] = None,
+                           fields: Optional[str] = None, view: Optional[str] = None):
+        """Returning list of films by non-strict title search.
+        Uses title index if it is set and can answer, otherwise searches in db."""
 
         schema = schemas.GetFilmByTitle(title=title)
-        schemas_list = self.film_repo.get_films_by_title(schema, page, per_page)
-
-        return {'films': schemas_list}, 206
-
-    def get_film(self, title: str, director_name: str):
-        """Returning film."""
-
-        film_schema = self._find_film(title, director_name)
+        view = self._view(view)
+        fields = self._fields(fields, view)
+
+        film_ids = self.title_index.search(schema.title) if self.title_index else None
+        if film_ids is not None:
+            if page < 1 or per_page < 1:
+                raise ValidationFail("'page' and 'per_page' should be at least 1.")
+            start = (page - 1) * per_page
+            films_page = schemas.PageSchema(items=self.film_repo.get_films_by_ids(film_ids[start:start + per_page],
+                                                                                  fields, view),
+                                            has_next=len(film_ids) > start + per_page,
+                                            total=len(film_ids) if self._flag(with_total) else None)
+            return self._films_response(films_page), 206
+
+        films_page = self.film_repo.get_films_by_title(schema, page, per_page, self._flag(with_total), fields, view)
+
+        return self._films_response(films_page), 206
+
+    @read_only
+    def get_film(self, title: str, director_name: str, fields: Optional[str] = None):
+        """Returning film, only its 'fields' if they are passed."""
+
+        fields = self._fields(fields)
+        if fields is None:
+            return {"film": self._find_film(title, director_name).dict()}, 200
+
+        name_list = director_name.split("_")
+
+        director_schema = schemas.GetDirectorSchema(first_name=name_list[0], last_name=name_list[1])
+        film = self.film_repo.get_fields_by_title_and_director(title, director_schema.first_name,
+                                                               director_schema.last_name, fields)
+        if not film:
+            raise MissingData("There are no such Film in db!")
 
-        return {"film": film_schema.dict()}, 200
+        return {"film": film}, 200
 
-    def sort_films(self, sort_by: str, sort_type: str, page: int, per_page: int) -> tuple:
+    @read_only
+    def sort_films(self, sort_by: str, sort_type: str, page: int, per_page: int,
+                   cursor: Optional[str] = None, with_total: Optional[str] = None,
+                   fields: Optional[str] = None, view: Optional[str] = None) -> tuple:
         schema = schemas.SortFilmSchema(sort_by=sort_by, sort_type=sort_type,
                                         page=page, per_page=per_page)
-        """Returning sorted films list."""
+        """Returning sorted films list.
+        If cursor is passed (empty string for the first page) uses keyset pagination."""
 
-        schemas_list = self.film_repo.get_films_with_sort(schema, page, per_page)
+        view = self._view(view)
+        fields = self._fields(fields, view)
 
-        return {"films": schemas_list}, 206
+        if cursor is not None:
+            after = self._sort_position(schema.sort_by, cursor) if cursor else None
+            films_page = self.film_repo.get_films_with_sort_after(schema, after, per_page, self._flag(with_total),
+                                                                  self._with_keys(fields, schema.sort_by), view)
+            return self._films_response(films_page, fields,
+                                        next_cursor=self._next_cursor(films_page, schema.sort_by, "id")), 206
 
+        films_page = self.film_repo.get_films_with_sort(schema, page, per_page, self._flag(with_total), fields,
+                                                        view)
+
+        return self._films_response(films_page), 206
+
+    @read_only
     def filter_films(self, req: request, page: int, per_page: int) -> tuple:
-        """Returning list of films filtered by some parameters."""
+        """Returning list of films filtered by some parameters, optionally searched by title and sorted.
+        If 'cursor' argument is passed (empty for the first page) uses keyset pagination,
+        title search results are ordered by id then, unless they are sorted."""
+
+        schema = self._filter_schema(req.args)
+        with_total = self._flag(req.args.get("with_total"))
+        view = self._view(req.args.get("view"))
+        fields = self._fields(req.args.get("fields"), view)
+
+        cursor = req.args.get("cursor")
+        if cursor is not None:
+            keys = (schema.sort_by, "id") if schema.sort_by else ("id", )
+            after = None
+            if cursor:
+                after = self._sort_position(schema.sort_by, cursor) if schema.sort_by \
+                    else self._filter_position(cursor)
+            films_page = self.film_repo.get_films_with_filter_after(schema, after, per_page, with_total,
+                                                                    self._with_keys(fields, *keys), view)
+            return self._films_response(films_page, fields,
+                                        next_cursor=self._next_cursor(films_page, *keys)), 206
+
+        films_page = self.film_repo.get_films_with_filter(schema, page, per_page, with_total, fields, view)
+
+        return self._films_response(films_page), 206
+
+    @read_only
+    def export_films(self, args: MultiDict) -> Iterator[dict]:
+        """All films matching 'filter_films' arguments, with director's name.
+        Films are fetched lazily, while returned iterator is consumed."""
+
+        return self.film_repo.stream_films(self._filter_schema(args))
+
+    def _filter_schema(self, args: MultiDict) -> schemas.FilterFilmSchema:
+        """Filter schema from 'filter_films' arguments."""
 
         director_id = None
-        if req.args.get("director_name"):
-            director_id = self._find_director(req.args.get("director_name")).id
+        if args.get("director_name"):
+            director_id = self._find_director(args.get("director_name"))
+
+        return schemas.FilterFilmSchema(genres=args.getlist("genres"),
+                                        date_from=args.get("date_from"),
+                                        date_to=args.get("date_to"),
+                                        director_id=director_id,
+                                        title=args.get("title"),
+                                        sort_by=args.get("sort_by"),
+                                        sort_type=args.get("sort_type") or "asc")
+
+    @staticmethod
+    def _films_response(films_page: schemas.PageSchema, fields: Optional[frozenset] = None, **extra) -> dict:
+        """Response body for page of films. 'total' is present only if it was requested.
+        If 'fields' are passed, films are trimmed to them."""
+
+        films = films_page.items
+        if fields is not None:
+            films = [{key: value for key, value in film.items() if key in fields} for film in films]
+
+        response = {"films": films, "has_next": films_page.has_next, **extra}
+        if films_page.total is not None:
+            response["total"] = films_page.total
+
+        return response
+
+    @staticmethod
+    def _view(value: Optional[str]) -> str:
+        """Films representation from 'view' argument, full films by default."""
+
+        if not value:
+            return "full"
+        if value not in FILM_VIEW_SCHEMAS:
+            raise ValidationFail(f"Unknown view: {value}. Available views: {', '.join(FILM_VIEW_SCHEMAS)}.")
+
+        return value
 
-        schema = schemas.FilterFilmSchema(genres=req.args.getlist("genres"),
-                                          date_from=req.args.get("date_from"),
-                                          date_to=req.args.get("date_to"),
-                                          director_id=director_id)
+    @staticmethod
+    def _fields(value: Optional[str], view: str = "full") -> Optional[frozenset]:
+        """Fields of films in 'view' from comma separated 'fields' argument, with 'id' always
+        included. None if argument is missing or empty, which means all fields."""
 
-        schemas_list = self.film_repo.get_films_with_filter(schema, page, per_page)
+        if not value:
+            return None
 
-        return {"films": schemas_list}, 206
+        fields = {field.strip() for field in value.split(",") if field.strip()}
+        unknown = fields - set(FILM_VIEW_SCHEMAS[view].__fields__)
+        if unknown:
+            raise ValidationFail(f"Unknown film fields: {', '.join(sorted(unknown))}.")
+
+        return frozenset(fields | {"id"}) if fields else None
+
+    @staticmethod
+    def _with_keys(fields: Optional[frozenset], *keys: str) -> Optional[frozenset]:
+        """Fields to fetch for keyset page, cursor is made of 'keys' of the last film."""
+
+        return fields if fields is None else fields | set(keys)
+
+    @staticmethod
+    def _flag(value: Optional[str]) -> bool:
+        """Boolean query argument."""
+
+        return bool(value) and value.lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def _next_cursor(films_page: schemas.PageSchema, *keys: str) -> Optional[str]:
+        """Cursor pointing after the last film of the page, if there is next page."""
+
+        if not films_page.has_next:
+            return None
+
+        return encode_cursor([films_page.items[-1][key] for key in keys])
+
+    @staticmethod
+    def _sort_position(sort_by: str, cursor: str) -> list:
+        """Decode (sort value, id) position for sorted films."""
+
+        values = decode_cursor(cursor)
+        try:
+            value, film_id = values
+            if value is not None:
+                value = Decimal(str(value)) if sort_by == "rating" else datetime.date.fromisoformat(value)
+            return [value, int(film_id)]
+        except (TypeError, ValueError, ArithmeticError):
+            raise InvalidCursor
+
+    @staticmethod
+    def _filter_position(cursor: str) -> list:
+        """Decode (id, ) position for filtered films."""
+
+        values = decode_cursor(cursor)
+        try:
+            film_id, = values
+            return [int(film_id)]
+        except (TypeError, ValueError):
+            raise InvalidCursor
 
 
 class FilmAction(FilmUtilsMixin):
     """Film operations with not 'GET' method."""
 
-    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCBaseRepo):
-        super().__init__(film_repo, director_repo)
+    def __init__(self, film_repo: ABCFilmRepo, director_repo: ABCDirectorRepo,
+                 title_index: Optional[ABCTitleIndex] = None):
+        super().__init__(film_repo, director_repo, title_index)
 
     def delete_film(self, title: str, director_name: str) -> tuple:
         """Delete film."""
@@ -101,10 +279,10 @@ class FilmAction(FilmUtilsMixin):
         film_schema = self._find_film(title, director_name)
         self._check_film_permission(film_schema)
 
-        delete_schema = schemas.GetFilmSchema(title=title, director_id=film_schema.director_id)
-
-        self.film_repo.delete(delete_schema)
-        my_logger.info(f"film '{delete_schema.title}' has been deleted by '{current_user.username}'")
+        self.film_repo.delete(schemas.GetFromIdSchema(id=film_schema.id))
+        if self.title_index:
+            self.title_index.remove(film_schema.id)
+        my_logger.info("film '%s' has been deleted by '%s'", film_schema.title, current_user.username)
 
         return {"deleted_film": film_schema.dict()}, 200
 
@@ -114,10 +292,10 @@ class FilmAction(FilmUtilsMixin):
         film_schema = self._find_film(title, director_name)
         self._check_film_permission(film_schema)
 
-        new_director_id = self._find_director(req.args.get("director_name")).id \
+        new_director_id = self._find_director(req.args.get("director_name")) \
             if req.args.get("director_name") else None
 
-        get_schema = schemas.GetFilmSchema(title=title, director_id=film_schema.director_id)
+        get_schema = schemas.GetFromIdSchema(id=film_schema.id)
         upd_schema = schemas.FilmSchema(title=req.args.get("title"),
                                         description=req.args.get("description"),
                                         poster=req.args.get("poster"),
@@ -126,20 +304,22 @@ class FilmAction(FilmUtilsMixin):
                                         genres=req.args.getlist("genres"),
                                         rating=req.args.get("rating"))
 
-        self.film_repo.update(get_schema, upd_schema)
-        updated_schema = self.film_repo.get_with_id(schemas.GetFromIdSchema(id=film_schema.id))
+        updated_schema = self.film_repo.update(get_schema, upd_schema)
+        if not updated_schema:
+            raise MissingData("There are no such Film in db!")
+        if self.title_index and updated_schema.title != film_schema.title:
+            self.title_index.add(updated_schema.id, updated_schema.title)
 
         no_none_dict = {key: value for key, value in upd_schema.dict().items() if value is not None}
-        my_logger.info(f"user '{current_user}' updated film '{updated_schema.title}': {no_none_dict}")
+        my_logger.info("user '%s' updated film '%s': %s", current_user.username, updated_schema.title, no_none_dict)
 
         return {"updated_film": updated_schema.dict()}, 200
 
     def create_film(self, req: request) -> tuple:
         """Create film."""
 
-        director_id = self._find_director(req.args.get("director_name")).id
+        director_id = self._find_director(req.args.get("director_name"))
 
-        print(current_user.id, "************")
         schema = schemas.NewFilmSchema(title=req.args.get("title"),
                                        description=req.args.get("description"),
                                        poster=req.args.get("poster"),
@@ -150,10 +330,86 @@ class FilmAction(FilmUtilsMixin):
                                        user_id=current_user.id)
 
         new_film_schema = self.film_repo.create(schema)
-        my_logger.info(f"User {current_user.username} added film '{new_film_schema.title}'")
+        if self.title_index:
+            self.title_index.add(new_film_schema.id, new_film_schema.title)
+        my_logger.info("User %s added film '%s'", current_user.username, new_film_schema.title)
 
         return {"new_film": new_film_schema.dict()}, 201
 
+    def create_films(self, req: request) -> tuple:
+        """Create films from JSON array or NDJSON body. Valid films are saved,
+        errors of the others are reported by their position in the body."""
+
+        results = self.import_films(self._bulk_items(req), current_user.id)
+
+        created = [result.dict(exclude={"error"}) for result in results if result.id]
+        errors = [result.dict(exclude={"id"}) for result in results if not result.id]
+        my_logger.info("user %s added %d films in bulk, %d failed", current_user.username, len(created), len(errors))
+
+        return {"created": created, "errors": errors}, 201 if not errors else 207
+
+    def import_films(self, items: list, user_id: int, chunk_size: int = 1000) -> List[schemas.BulkItemResult]:
+        """Validate and save films given as dicts with 'director_name', added by user with 'user_id'.
+        Returns result for every item, ordered by its position in 'items'."""
+
+        names = {}
+        for index, item in enumerate(items):
+            if isinstance(item, dict) and isinstance(item.get("director_name"), str):
+                names[index] = tuple(item["director_name"].split("_")[:2])
+        director_ids = self.director_repo.find_ids(name for name in names.values() if len(name) == 2)
+
+        positions, films, results = [], [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append(schemas.BulkItemResult(index=index, error="Film should be a JSON object."))
+                continue
+            director_id = director_ids.get(names.get(index))
+            if not director_id:
+                results.append(schemas.BulkItemResult(index=index, title=item.get("title"),
+                                                      error="There are no such Director in db!"))
+                continue
+            try:
+                films.append(schemas.NewFilmSchema(title=item.get("title"),
+                                                   description=item.get("description"),
+                                                   poster=item.get("poster"),
+                                                   release_date=item.get("release_date"),
+                                                   director_id=director_id,
+                                                   genres=item.get("genres") or [],
+                                                   rating=item.get("rating"),
+                                                   user_id=user_id))
+                positions.append(index)
+            except ValidationError as error:
+                results.append(schemas.BulkItemResult(index=index, title=item.get("title"), error=str(error)))
+
+        for result in self.film_repo.create_many(films, chunk_size):
+            result.index = positions[result.index]
+            results.append(result)
+            if result.id and self.title_index:
+                self.title_index.add(result.id, result.title)
+
+        return sorted(results, key=lambda result: result.index)
+
+    @staticmethod
+    def _bulk_items(req: request) -> list:
+        """Films from request body, NDJSON lines which are not valid JSON become None."""
+
+        if req.mimetype == "application/x-ndjson":
+            items = []
+            for line in req.get_data(as_text=True).splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    items.append(None)
+            return items
+
+        items = req.get_json(silent=True)
+        if not isinstance(items, list):
+            raise ValidationFail("Body should be JSON array or NDJSON of films.")
+
+        return items
+
     def _check_film_permission(self, film):
         """Check is user had posted film or is he an admin.
          If not raises FilmOperationsError"""
@@ -168,6 +424,7 @@ class UserGet:
     def __init__(self, user_repo: ABCBaseRepo):
         self.user_repo = user_repo
 
+    @read_only
     def login(self, username: str, password: str) -> bool:
         """Login into existing account"""
         schema = schemas.GetUserSchema(username=username)
@@ -200,7 +457,7 @@ class UserAction:
                                        admin_bool=False)
 
         new_user_schema = self.user_repo.create(schema)
-        my_logger.info(f"user '{new_user_schema.username}' created")
+        my_logger.info("user '%s' created", new_user_schema.username)
 
         return {"new_user": new_user_schema.dict()}, 201
 
@@ -210,23 +467,12 @@ class UserAction:
         if not current_user.admin_bool:
             raise NoAccessError
 
-        user_id = self._find_user(username).id
         get_schema = schemas.GetUserSchema(username=username)
         upd_schema = schemas.UserSchema(admin_bool=True)
 
-        self.user_repo.update(get_schema, upd_schema)
-        updated_schema = self.user_repo.get_with_id(schemas.GetFromIdSchema(id=user_id))
-        my_logger.info(f"{current_user.username} made {updated_schema} admin")
-
-        return {"new_admin": updated_schema.dict()}, 200
-
-    def _find_user(self, username: str):
-        """Find's user and return's his schema"""
-
-        schema = schemas.GetUserSchema(username=username)
-
-        user_schema = self.user_repo.get(schema)
-        if not user_schema:
+        updated_schema = self.user_repo.update(get_schema, upd_schema)
+        if not updated_schema:
             raise MissingData("There are no such user in db!")
+        my_logger.info("%s made %s admin", current_user.username, updated_schema)
 
-        return user_schema
+        return {"new_admin": updated_schema.dict()}, 200
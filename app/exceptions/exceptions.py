@@ -21,3 +21,7 @@ class NoAccessError(Exception):
 
 class FilmOperationsError(Exception):
     pass
+
+
+class InvalidCursor(Exception):
+    pass
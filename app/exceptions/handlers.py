@@ -31,3 +31,13 @@ def handle_no_access(error: NoAccessError):
 @api.errorhandler(FilmOperationsError)
 def handle_film_operations(error: FilmOperationsError):
     return {"message": "Only user who posted film or admin can do operations with it."}, 401
+
+
+@api.errorhandler(InvalidCursor)
+def handle_invalid_cursor(error: InvalidCursor):
+    return {"message": "Invalid pagination cursor."}, 400
+
+
+@api.errorhandler(ValidationFail)
+def handle_validation_fail(error: ValidationFail):
+    return {"message": str(error)}, 400
@@ -0,0 +1,147 @@
+"""Film routes of ASGI app, on async services.
+
+Users log in through WSGI app, its session cookie is accepted here.
+"""
+
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Optional
+from itsdangerous import BadSignature
+from pydantic.error_wrappers import ValidationError
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from app import app
+from app.data import async_repos
+from app.domain import schemas
+from app.exceptions import handlers
+from app.exceptions import (MissingData, NoAccessError, InvalidCursor, ValidationFail,
+                            UserAlreadyExists, AuthenticationError, FilmOperationsError)
+from app.utils.logger import log_pipeline
+from app.utils.streaming import ndjson_async
+from .async_service import film_get, film_action
+
+
+async def load_user(request: Request) -> Optional[schemas.UserOrm]:
+    """User logged in with flask_login, from WSGI app's session cookie."""
+
+    cookie = request.cookies.get(app.config["SESSION_COOKIE_NAME"])
+    serializer = app.session_interface.get_signing_serializer(app)
+    if not cookie or serializer is None:
+        return None
+
+    try:
+        session = serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds()))
+    except BadSignature:
+        return None
+    if not session.get("_user_id"):
+        return None
+
+    return await async_repos.user_repo.get_with_id(schemas.GetFromIdSchema(id=session["_user_id"]))
+
+
+def login_required(endpoint):
+    @wraps(endpoint)
+    async def wrapper(request: Request):
+        request.state.user = await load_user(request)
+        if request.state.user is None:
+            return JSONResponse({"message": "Login required."}, 401)
+        return await endpoint(request)
+
+    return wrapper
+
+
+async def film_by_title(request: Request):
+    params = request.path_params
+    return JSONResponse(*await film_get.find_film_by_title(params["title"], params.get("page", 1),
+                                                           params.get("per_page", 10),
+                                                           request.query_params.get("with_total"),
+                                                           request.query_params.get("fields"),
+                                                           request.query_params.get("view")))
+
+
+async def film(request: Request):
+    if request.method == "GET":
+        return JSONResponse(*await film_get.get_film(request.path_params["title"], request.path_params["director"],
+                                                     request.query_params.get("fields")))
+    return await change_film(request)
+
+
+@login_required
+async def change_film(request: Request):
+    title, director = request.path_params["title"], request.path_params["director"]
+    if request.method == "DELETE":
+        return JSONResponse(*await film_action.delete_film(title, director, request.state.user))
+    return JSONResponse(*await film_action.update_film(title, director, request.query_params, request.state.user))
+
+
+@login_required
+async def new_film(request: Request):
+    return JSONResponse(*await film_action.create_film(request.query_params, request.state.user))
+
+
+async def sort_films(request: Request):
+    params = request.path_params
+    return JSONResponse(*await film_get.sort_films(params["sort_by"], params.get("sort_type", "asc"),
+                                                   params.get("page", 1), params.get("per_page", 10),
+                                                   request.query_params.get("cursor"),
+                                                   request.query_params.get("with_total"),
+                                                   request.query_params.get("fields"),
+                                                   request.query_params.get("view")))
+
+
+async def filter_films(request: Request):
+    params = request.path_params
+    return JSONResponse(*await film_get.filter_films(request.query_params, params.get("page", 1),
+                                                     params.get("per_page", 10)))
+
+
+async def export_films(request: Request):
+    films = await film_get.export_films(request.query_params)
+    return StreamingResponse(ndjson_async(films), media_type="application/x-ndjson")
+
+
+routes = [
+    Route("/film_title/{title}", film_by_title),
+    Route("/film_title/{title}/{page:int}", film_by_title),
+    Route("/film_title/{title}/{page:int}/{per_page:int}", film_by_title),
+    Route("/film/{title}/{director}", film, methods=["GET", "DELETE", "PUT"]),
+    Route("/new_film", new_film, methods=["POST"]),
+    Route("/sort_films/{sort_by}", sort_films),
+    Route("/sort_films/{sort_by}/{sort_type}", sort_films),
+    Route("/sort_films/{sort_by}/{sort_type}/{page:int}", sort_films),
+    Route("/sort_films/{sort_by}/{sort_type}/{page:int}/{per_page:int}", sort_films),
+    Route("/filter_films", filter_films),
+    Route("/filter_films/{page:int}", filter_films),
+    Route("/filter_films/{page:int}/{per_page:int}", filter_films),
+    Route("/films/export", export_films),
+]
+
+
+def _handler(handler):
+    """Exception handler of ASGI app answering the same as WSGI app's 'handler'."""
+
+    async def handle(request: Request, error: Exception):
+        body, status = handler(error)
+        return Response(status_code=status) if status == 204 else JSONResponse(body, status)
+
+    return handle
+
+
+exception_handlers = {
+    MissingData: _handler(handlers.handle_missing_data),
+    ValidationError: _handler(handlers.handle_wrong_sort_params),
+    UserAlreadyExists: _handler(handlers.handle_user_exists),
+    AuthenticationError: _handler(handlers.handle_authentication),
+    NoAccessError: _handler(handlers.handle_no_access),
+    FilmOperationsError: _handler(handlers.handle_film_operations),
+    InvalidCursor: _handler(handlers.handle_invalid_cursor),
+    ValidationFail: _handler(handlers.handle_validation_fail),
+}
+
+
+@asynccontextmanager
+async def lifespan(application):
+    log_pipeline.init_app(app)
+    yield
+    await async_repos.async_db.dispose()
@@ -0,0 +1,7 @@
+"""Async domain service instances for usage in ASGI routes."""
+
+from app.domain.async_service import AsyncFilmGet, AsyncFilmAction
+from app.data import async_repos
+
+film_get = AsyncFilmGet(async_repos.film_repo, async_repos.director_repo)
+film_action = AsyncFilmAction(async_repos.film_repo, async_repos.director_repo)
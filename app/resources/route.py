@@ -2,11 +2,17 @@
 
 from flask_restx import Resource
 from flask_login import login_required, logout_user, login_user
-from flask import request
-from app import api
+from flask import request, Response, stream_with_context
+from app import api, app
 from .swagger import create_film_parser, create_user_parser,\
-    filter_film_parser, user
+    filter_film_parser, user, stats, FIELDS_HELP, VIEW_HELP
 from .service import user_get, user_action, film_get, film_action
+from app.data import repos
+from app.data.pool import pool_stats
+from app.domain.models.db import db, REPLICA_BIND
+from app.utils.streaming import ndjson
+from app.utils.etag import conditional
+from app.utils.logger import log_pipeline
 
 
 @api.route("/film_title/<string:title>/<int:page>/<int:per_page>")
@@ -14,10 +20,15 @@ from .service import user_get, user_action, film_get, film_action
 @api.route("/film_title/<string:title>", defaults={'page': 1, 'per_page': 10})
 class FilmByTitle(Resource):
 
-    @api.doc(responses={206: "films"}, params={"title": "Film title"},
+    @api.doc(responses={206: "films", 304: "Not modified", 400: "ValidationFail"},
+             params={"title": "Film title",
+                     "with_total": "Add (approximate) total number of films",
+                     "fields": FIELDS_HELP, "view": VIEW_HELP},
              description="Find films by non-strict match.")
+    @conditional(repos.catalog_version.current)
     def get(self, title, page=1, per_page=10):
-        films_list = film_get.find_film_by_title(title, page, per_page)
+        films_list = film_get.find_film_by_title(title, page, per_page, request.args.get("with_total"),
+                                                 request.args.get("fields"), request.args.get("view"))
         return films_list
 
 
@@ -25,12 +36,14 @@ class FilmByTitle(Resource):
 @api.route("/new_film", methods=["POST"])
 class Film(Resource):
 
-    @api.doc(responses={200: "Success", 204: "Missing data"},
+    @api.doc(responses={200: "Success", 204: "Missing data", 304: "Not modified", 400: "ValidationFail"},
              params={"title": "Film title", "director":
-                     "Director's full name separated with '_'."},
+                     "Director's full name separated with '_'.",
+                     "fields": FIELDS_HELP},
              description="Get film")
+    @conditional(repos.catalog_version.current)
     def get(self, title, director):
-        return film_get.get_film(title, director)
+        return film_get.get_film(title, director, request.args.get("fields"))
 
     @login_required
     @api.doc(responses={200: "Success", 204: "Missing data",
@@ -64,6 +77,19 @@ class Film(Resource):
         return film_action.update_film(title, director, request)
 
 
+@api.route("/new_films", methods=["POST"])
+class Films(Resource):
+
+    @login_required
+    @api.doc(responses={201: "All films created", 207: "Some films failed, see 'errors'",
+                        400: "ValidationFail"},
+             description="Create many films. Body is JSON array of films or NDJSON "
+                         "(Content-Type: application/x-ndjson), film fields are the same as "
+                         "for '/new_film'. Login required.")
+    def post(self):
+        return film_action.create_films(request)
+
+
 @user.route("/new_user", methods=["POST"])
 @user.route("/make_admin/<string:username>", methods=["PUT"])
 class User(Resource):
@@ -115,11 +141,18 @@ class LogOut(Resource):
 @api.route("/sort_films/<string:sort_by>/<string:sort_type>/<int:page>/<int:per_page>")
 class SortFilms(Resource):
 
-    @api.doc(responses={401: "ValidationError", 206: "films"},
+    @api.doc(responses={401: "ValidationError", 206: "films", 304: "Not modified", 400: "InvalidCursor"},
+             params={"cursor": "Keyset pagination cursor. Pass empty value for the first page "
+                               "and 'next_cursor' from response for the next ones.",
+                     "with_total": "Add (approximate) total number of films",
+                     "fields": FIELDS_HELP, "view": VIEW_HELP},
              description="Sort films by specified parameters. Avaliable parameters -"
                          "sort_by(rating, release_date); sort_type(asc, desc)")
+    @conditional(repos.catalog_version.current)
     def get(self, sort_by, sort_type, page, per_page):
-        return film_get.sort_films(sort_by, sort_type, page, per_page)
+        return film_get.sort_films(sort_by, sort_type, page, per_page,
+                                   request.args.get("cursor"), request.args.get("with_total"),
+                                   request.args.get("fields"), request.args.get("view"))
 
 
 @api.route("/filter_films", defaults={'page': 1, 'per_page': 10})
@@ -127,8 +160,53 @@ class SortFilms(Resource):
 @api.route("/filter_films/<int:page>/<int:per_page>")
 class FilterFilms(Resource):
 
-    @api.doc(responses={401: "ValidationError", 206: "films"},
+    @api.doc(responses={401: "ValidationError", 206: "films", 304: "Not modified", 400: "InvalidCursor"},
              description="Filter films by parameters.")
     @api.expect(filter_film_parser())
+    @conditional(repos.catalog_version.current)
     def get(self, page, per_page):
         return film_get.filter_films(request, page, per_page)
+
+
+@api.route("/films/export")
+class ExportFilms(Resource):
+
+    @api.doc(responses={200: "NDJSON stream of films", 401: "ValidationError"},
+             description="Export all films, one JSON object per line, with director's name. "
+                         "Takes the same filters as '/filter_films'. Compressed if client "
+                         "accepts it.")
+    @api.expect(filter_film_parser())
+    def get(self):
+        body = ndjson(film_get.export_films(request.args))
+
+        return Response(stream_with_context(body), mimetype="application/x-ndjson")
+
+
+@stats.route("/film_cache")
+class FilmCacheStats(Resource):
+
+    @stats.doc(responses={200: "Success"},
+               description="Hit/miss counters and size of this worker's film cache.")
+    def get(self):
+        return {"enabled": app.config["FILM_CACHE_ENABLED"], **repos.cached_film_repo.cache.stats()}, 200
+
+
+@stats.route("/db_pool")
+class DbPoolStats(Resource):
+
+    @stats.doc(responses={200: "Success"},
+               description="Connections and checkout latency of this worker's db pool.")
+    def get(self):
+        pools = pool_stats(db.engine.pool)
+        if REPLICA_BIND in app.config["SQLALCHEMY_BINDS"]:
+            pools["replica"] = pool_stats(db.get_engine(bind=REPLICA_BIND).pool)
+        return pools, 200
+
+
+@stats.route("/logging")
+class LoggingStats(Resource):
+
+    @stats.doc(responses={200: "Success"},
+               description="Records waiting in this worker's log queue and records dropped as it was full.")
+    def get(self):
+        return log_pipeline.stats(), 200
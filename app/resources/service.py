@@ -1,9 +1,13 @@
 """Domain service instances for usage in routes."""
 
+from app import app
 from app.domain.service import FilmGet, FilmAction, UserGet, UserAction
 from app.data import repos
 
-film_get = FilmGet(repos.film_repo, repos.director_repo)
-film_action = FilmAction(repos.film_repo, repos.director_repo)
+title_index = repos.title_index if app.config["TITLE_INDEX_ENABLED"] else None
+film_repo = repos.cached_film_repo if app.config["FILM_CACHE_ENABLED"] else repos.film_repo
+
+film_get = FilmGet(film_repo, repos.director_repo, title_index)
+film_action = FilmAction(film_repo, repos.director_repo, title_index)
 user_get = UserGet(repos.user_repo)
 user_action = UserAction(repos.user_repo)
@@ -1,7 +1,9 @@
 """Package with some swagger utils."""
 
-from .request_parsers import create_film_parser, create_user_parser, filter_film_parser
+from .request_parsers import create_film_parser, create_user_parser, filter_film_parser, FIELDS_HELP, VIEW_HELP
 from .user import user
+from .stats import stats
 from app import api
 
 api.add_namespace(user, path="/user")
+api.add_namespace(stats, path="/stats")
@@ -2,6 +2,11 @@
 
 from app import api
 
+FIELDS_HELP = "Comma separated film fields to return, e.g. 'title,rating'. " \
+              "All fields by default, 'id' is always returned"
+VIEW_HELP = "'card' for short films: id, title, rating, release_date, director's name, genres and poster. " \
+            "'full' by default"
+
 
 def create_film_parser():
     create_film_pars = api.parser()
@@ -31,5 +36,12 @@ def filter_film_parser():
     filter_film_pars.add_argument("date_from", type=str, help="Can work without 'date_to'")
     filter_film_pars.add_argument("date_to", type=str, help="Can't work without 'date_from'")
     filter_film_pars.add_argument("director_name", type=str, help="Director's name separated by '_'")
+    filter_film_pars.add_argument("title", type=str, help="Non-strict title search")
+    filter_film_pars.add_argument("sort_by", type=str, help="rating or release_date")
+    filter_film_pars.add_argument("sort_type", type=str, help="asc or desc, 'asc' by default")
+    filter_film_pars.add_argument("cursor", type=str, help="Keyset pagination cursor. Empty for the first page")
+    filter_film_pars.add_argument("with_total", type=bool, help="Add (approximate) total number of films")
+    filter_film_pars.add_argument("fields", type=str, help=FIELDS_HELP)
+    filter_film_pars.add_argument("view", type=str, help=VIEW_HELP)
 
     return filter_film_pars
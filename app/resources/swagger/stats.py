@@ -0,0 +1,4 @@
+from flask_restx import Namespace
+
+stats = Namespace("Stats",
+                  description="Runtime statistics of the worker")
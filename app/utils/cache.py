@@ -0,0 +1,85 @@
+"""In-process caches."""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache which entries expire after 'ttl' seconds.
+
+    If 'max_bytes' is set, least recently used entries are also evicted while
+    total size of values, measured with 'sizeof', exceeds it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = lambda value: 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value, size = entry
+            if expires_at < monotonic():
+                self._pop(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = monotonic() + (self.ttl if ttl is None else ttl)
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (expires_at, value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or \
+                    (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache."""
+
+        requests = self.hits + self.misses
+        return {"entries": len(self._data), "bytes": self._bytes, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_ratio": round(self.hits / requests, 4) if requests else None}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _pop(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
@@ -1,36 +1,132 @@
 """Custom flask commands"""
 
-from pydantic import BaseModel
+import json
+import sys
+from itertools import islice
+from time import perf_counter
 import click
-from faker import Faker
+from werkzeug.datastructures import MultiDict
 from app import app
 from app.domain.models.db import db
-from app.domain import schemas, models
+from app.domain import schemas
 from app.data import repos
-from app.domain.models.film import Film
-from app.domain.models.genre import Genre
+from app.data.seeder import Seeder
+from app.resources.service import film_get, film_action
+from app.utils.importer import read_films, Checkpoint
+from app.utils.logger import my_logger
+from app.utils.streaming import ndjson, gzip_stream
 
 
 @app.cli.command('seed')
 @click.argument("amount", type=int)
-def seed_db(amount):
-    """Seed's db with specified amount of values."""
-
-    fake = FakeValues()
-    session = db.session
-    with session.begin():
-        for genre in fake.genres_list:
-            new_genre = models.Genre(**schemas.GenreSchema(genre=genre).dict())
-            session.add(new_genre)
-
-        for _ in range(amount):
-            new_director = models.Director(**fake.fake_director().dict())
-            session.add(new_director)
-            new_user = models.Users(**fake.fake_user().dict())
-            session.add(new_user)
-
-            new_film = models.Film(**fake.fake_film().dict())
-            session.add(new_film)
+@click.option("--chunk-size", type=int, default=10000, help="Rows of every table loaded in one transaction.")
+@click.option("--processes", type=int, default=1, help="Processes generating data, 1 to generate in place.")
+@click.option("--seed", type=int, default=None, help="Random seed for reproducible data.")
+def seed_db(amount, chunk_size, processes, seed):
+    """Seed's db with specified amount of directors, users and films."""
+
+    def report(films, rows, seconds):
+        click.echo(f"{films}/{amount} films, {rows} rows, {rows / seconds:.0f} rows/sec")
+
+    seeder = Seeder(repos.genre_registry, chunk_size=chunk_size, processes=processes, seed=seed)
+    rows = seeder.run(amount, on_chunk=report)
+    repos.genre_registry.invalidate()
+    repos.catalog_version.bump(db.session)
+    db.session.commit()
+    repos.catalog_version.invalidate()
+    click.echo(f"Seeded {rows} rows")
+
+
+@app.cli.command('export')
+@click.argument("output", type=click.Path(dir_okay=False, allow_dash=True), default="-")
+@click.option("--gzip", "compress", is_flag=True, help="Compress output with gzip.")
+@click.option("--genres", multiple=True, help="Genre, can be repeated.")
+@click.option("--date-from")
+@click.option("--date-to")
+@click.option("--director-name", help="Director's name separated by '_'")
+@click.option("--title", help="Non-strict title search")
+@click.option("--sort-by", help="rating or release_date")
+@click.option("--sort-type", help="asc or desc")
+def export(output, compress, genres, **filters):
+    """Export films as NDJSON into file or stdout, filters are the same as in '/filter_films'."""
+
+    args = MultiDict([("genres", genre) for genre in genres] +
+                     [(key, value) for key, value in filters.items() if value])
+    exported = 0
+    started_at = perf_counter()
+
+    def counted(films):
+        nonlocal exported
+        for film in films:
+            exported += 1
+            yield film
+
+    chunks = ndjson(counted(film_get.export_films(args)))
+    if compress:
+        chunks = gzip_stream(chunks)
+
+    stream = open(output, "wb") if output != "-" else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            stream.write(chunk)
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+
+    seconds = perf_counter() - started_at
+    click.echo(f"Exported {exported} films in {seconds:.1f}s, {exported / seconds:.0f} films/sec", err=True)
+
+
+@app.cli.command('import')
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--username", required=True, help="User who will be the author of imported films.")
+@click.option("--chunk-size", type=int, default=1000, help="Films validated and committed together.")
+@click.option("--restart", is_flag=True, help="Ignore checkpoint and import file from the beginning.")
+def import_films(path, username, chunk_size, restart):
+    """Import films from NDJSON or CSV file (optionally gzipped), resuming from checkpoint.
+
+    Films need the same fields as for '/new_film', CSV genres are separated by ';'.
+    Failed films are written to '<path>.errors.ndjson' with their position in file.
+    """
+
+    user = repos.user_repo.get(schemas.GetUserSchema(username=username))
+    if not user:
+        raise click.BadParameter(f"There are no user '{username}'", param_hint="--username")
+
+    checkpoint = Checkpoint(f"{path}.checkpoint")
+    if restart:
+        checkpoint.clear()
+    state = checkpoint.load()
+    if state["position"]:
+        click.echo(f"Resuming from film {state['position']}")
+
+    films = read_films(path, skip=state["position"])
+    started_at = perf_counter()
+    imported = 0
+    with open(f"{path}.errors.ndjson", "a") as errors_file:
+        while True:
+            chunk = list(islice(films, chunk_size))
+            if not chunk:
+                break
+
+            results = film_action.import_films(chunk, user.id, chunk_size)
+            for result in results:
+                if not result.id:
+                    errors_file.write(json.dumps({**result.dict(exclude={"id"}),
+                                                  "index": state["position"] + result.index}) + "\n")
+            errors_file.flush()
+
+            created = sum(1 for result in results if result.id)
+            state = {"position": state["position"] + len(chunk), "created": state["created"] + created,
+                     "failed": state["failed"] + len(chunk) - created}
+            checkpoint.save(state)
+
+            imported += len(chunk)
+            my_logger.info("import of %s: %d films processed, %.0f films/sec",
+                           path, state["position"], imported / (perf_counter() - started_at))
+
+    checkpoint.clear()
+    click.echo(f"Imported {state['created']} films, {state['failed']} failed")
 
 
 @app.cli.command('drop_tables')
@@ -54,61 +150,3 @@ def check():
     updated = repos.film_repo.update(schemas.GetFilmSchema(title="Tree them plan be understand.", director_id=1),
                                      schemas.FilmSchema(rating=3.2))
     print(updated)
-
-
-class FakeValues:
-    """Generate fake values for seeding db."""
-
-    genres_list = ["Action", "Comedy", "Drama", "Fantasy", "Horror",
-                   "Mystery", "Romance", "Thriller", "Western"]
-    user_names = []
-    faker = Faker()
-
-    def fake_director(self) -> BaseModel:
-        new = schemas.NewDirectorSchema(first_name=self.faker.first_name(),
-                                        last_name=self.faker.last_name(),
-                                        age=self.faker.random_int(18, 100))
-        return new
-
-    def fake_genre(self) -> BaseModel:
-        new = schemas.GenreSchema(genre=self.faker.genres())
-
-        return new
-
-    def fake_user(self) -> BaseModel:
-        new = schemas.NewUserSchema(username=self._unique_username(), password=self.faker.password(),
-                                    email=self.faker.email(), admin_bool=self.faker.pybool())
-
-        return new
-
-    def fake_film(self) -> BaseModel:
-        new = schemas.FilmSchema(title=self.faker.sentence(nb_words=4), description=self.faker.text(),
-                                 poster=self.faker.image_url(), release_date=self.faker.date(),
-                                 rating=self.faker.pyfloat(right_digits=1, min_value=0.0, max_value=10.0),
-                                 director_id=self._foreign_key(models.Director),
-                                 user_id=self._foreign_key(models.Users), genres=self._genres_list_gen())
-
-        return new
-
-    def _foreign_key(self, model) -> int:
-        """Returning int range of max_id."""
-
-        max_id = db.session.query(db.func.max(model.id)).scalar()
-        return self.faker.random_int(1, max_id)
-
-    def _unique_username(self) -> str:
-        """Create unique username."""
-
-        user_name = self.faker.user_name()
-        while user_name in self.user_names:
-            user_name = self.faker.user_name()
-
-        self.user_names.append(user_name)
-        return user_name
-
-    def _genres_list_gen(self) -> list:
-        """Generate list of genres."""
-
-        genres_index = {self.faker.random_int(1, len(self.genres_list)) for _ in range(3)}
-        genres = [models.Genre.query.filter_by(id=i).first() for i in genres_index]
-        return genres
@@ -0,0 +1,138 @@
+"""Compression of responses, negotiated with 'Accept-Encoding'."""
+
+import zlib
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from flask import Flask, Response, request
+from app.utils.cache import TTLCache
+from app.utils.streaming import gzip_stream
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Types of responses worth compressing, by prefix.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class Encoder(NamedTuple):
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[Iterable[bytes]], Iterator[bytes]]
+
+
+def _gzip(data: bytes, level: int = 6) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _brotli(data: bytes, quality: int = 5) -> bytes:
+    return brotli.compress(data, quality=quality)
+
+
+def _brotli_stream(chunks: Iterable[bytes], quality: int = 5) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        compressed = compressor.process(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.finish()
+
+
+def _zstd(data: bytes, level: int = 3) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_stream(chunks: Iterable[bytes], level: int = 3) -> Iterator[bytes]:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+# Available encoders in order of preference, levels are tuned for dynamic responses.
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = Encoder(_brotli, _brotli_stream)
+if zstandard is not None:
+    ENCODERS["zstd"] = Encoder(_zstd, _zstd_stream)
+ENCODERS["gzip"] = Encoder(_gzip, gzip_stream)
+
+
+class Compression:
+    """Compresses responses of Flask app with the best encoding client accepts.
+
+    Responses smaller than 'min_size' bytes are sent as is, streamed ones are
+    compressed chunk by chunk whatever their size. Compressed bodies of
+    responses with strong ETag are kept in 'cache', so repeated pages are not
+    compressed again. ETags of responses which may be compressed are made
+    weak, as their bytes differ from uncompressed ones. That doesn't depend
+    on size, so 304 answers, which have no body, carry the same ETag as 200.
+    """
+
+    def __init__(self, min_size: int = 1024, encodings: Optional[Iterable[str]] = None,
+                 cache: Optional[TTLCache] = None):
+        self.min_size = min_size
+        self.encodings = [encoding for encoding in (encodings or ENCODERS) if encoding in ENCODERS]
+        self.cache = cache
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self.compress_response)
+
+    def compress_response(self, response: Response) -> Response:
+        if not self._compressible(response):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = ENCODERS[encoding].stream(response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = encoding
+        elif response.status_code != 304:
+            data = response.get_data()
+            if len(data) >= self.min_size:
+                response.set_data(self._compress(response, data, encoding))
+                response.headers["Content-Encoding"] = encoding
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
+
+    def _compress(self, response: Response, data: bytes, encoding: str) -> bytes:
+        """Compressed body, taken from cache if response has strong ETag."""
+
+        etag, weak = response.get_etag()
+        if self.cache is None or not etag or weak:
+            return ENCODERS[encoding].compress(data)
+
+        # ETag identifies body only together with URL
+        key = (request.full_path, etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = ENCODERS[encoding].compress(data)
+            self.cache.set(key, compressed)
+
+        return compressed
+
+    @staticmethod
+    def _compressible(response: Response) -> bool:
+        """Whether response, or one which 304 response stands for, can be compressed."""
+
+        status = response.status_code
+        return (200 <= status < 300 and status != 204 or status == 304) \
+            and "Content-Encoding" not in response.headers and not response.direct_passthrough \
+            and (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)
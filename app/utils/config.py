@@ -1,5 +1,6 @@
 """Custom app config"""
 
+import os
 
 POSTGRES_USER = "postgres"
 POSTGRES_PASSWORD = "postgres_password"
@@ -8,4 +9,64 @@ POSTGRES_PASSWORD = "postgres_password"
 class Config:
     SQLALCHEMY_DATABASE_URI = f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@db:5432/films"
     SQLALCHEMY_TRACK_MODIFICATIONS = True
+    # Same db for asyncio engine of ASGI app.
+    ASYNC_DATABASE_URI = os.environ.get("ASYNC_DATABASE_URI",
+                                        SQLALCHEMY_DATABASE_URI.replace("+psycopg2", "+asyncpg"))
 
+    # Connection pool of every worker process, workers * (size + overflow)
+    # should stay below max_connections of the db.
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    # Seconds to wait for a free connection before failing the request.
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+    # Seconds after which connection is reopened, -1 to keep connections forever.
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    # Check connection on checkout, so connections broken by db restart are replaced.
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW,
+                                 "pool_timeout": DB_POOL_TIMEOUT, "pool_recycle": DB_POOL_RECYCLE,
+                                 "pool_pre_ping": DB_POOL_PRE_PING}
+
+    # Read replica used by read-only services, everything goes to primary when not set.
+    SQLALCHEMY_REPLICA_URI = os.environ.get("SQLALCHEMY_REPLICA_URI")
+    SQLALCHEMY_BINDS = {"replica": SQLALCHEMY_REPLICA_URI} if SQLALCHEMY_REPLICA_URI else {}
+    # Seconds user's reads stay on primary after their write, should exceed replication lag.
+    REPLICA_STICKY_SECONDS = float(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+    # In-memory index of film titles used by title search.
+    TITLE_INDEX_ENABLED = os.environ.get("TITLE_INDEX_ENABLED", "false").lower() == "true"
+    # Seconds after the last full build when index is considered stale.
+    TITLE_INDEX_MAX_STALENESS = float(os.environ.get("TITLE_INDEX_MAX_STALENESS", 300))
+
+    # Per-worker read-through cache of film reads, cleared on film writes.
+    FILM_CACHE_ENABLED = os.environ.get("FILM_CACHE_ENABLED", "false").lower() == "true"
+    # Seconds a cached result lives, bounds staleness of writes made in other workers.
+    FILM_CACHE_TTL = float(os.environ.get("FILM_CACHE_TTL", 30))
+    FILM_CACHE_MAX_ENTRIES = int(os.environ.get("FILM_CACHE_MAX_ENTRIES", 4096))
+    # Cap on approximate size of cached results in bytes.
+    FILM_CACHE_MAX_BYTES = int(os.environ.get("FILM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    # Seconds a worker reuses catalog version behind film ETags, bounds staleness
+    # of writes made in other workers.
+    CATALOG_VERSION_TTL = float(os.environ.get("CATALOG_VERSION_TTL", 1))
+
+    # JSON lines log shared by all workers. It is rotated outside of the app, by logrotate
+    # service of docker-compose.yml, workers reopen it once it is moved.
+    LOG_FILE = os.environ.get("LOG_FILE", "logs.log")
+    # Records waiting for log writer, records logged while queue is full are dropped.
+    LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    # Most records log writer writes at once.
+    LOG_BATCH_SIZE = int(os.environ.get("LOG_BATCH_SIZE", 256))
+
+    # Per-worker cache of logged in users, cleared on writes to users. Seconds a
+    # user lives there bound how late other workers see permission changes.
+    USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", 5))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", 4096))
+
+    # Compression of responses, 'br' and 'zstd' are offered if brotli and zstandard are installed.
+    COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    # Responses smaller than that many bytes are sent uncompressed.
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    # Caps on compressed bodies of responses with ETag kept per worker, in bodies and in bytes.
+    COMPRESSION_CACHE_MAX_ENTRIES = int(os.environ.get("COMPRESSION_CACHE_MAX_ENTRIES", 4096))
+    COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get("COMPRESSION_CACHE_MAX_BYTES", 16 * 1024 * 1024))
@@ -0,0 +1,26 @@
+"""Opaque cursors for keyset pagination."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from app.exceptions import InvalidCursor
+
+
+def encode_cursor(values: list) -> str:
+    """Pack position of the last returned row into url-safe string."""
+
+    return urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Unpack cursor made by 'encode_cursor'. Raises InvalidCursor."""
+
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (DecodeError, ValueError):
+        raise InvalidCursor
+
+    if not isinstance(values, list):
+        raise InvalidCursor
+
+    return values
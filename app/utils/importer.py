@@ -0,0 +1,75 @@
+"""Reading film dumps and tracking import progress."""
+
+import csv
+import gzip
+import json
+import os
+from typing import Iterator, Optional
+
+# Separator of genres in CSV 'genres' column.
+CSV_GENRES_SEPARATOR = ";"
+
+
+def read_films(path: str, skip: int = 0) -> Iterator[Optional[dict]]:
+    """Yield films from NDJSON or CSV file (optionally gzipped) one by one, after
+    skipping 'skip' records. Lines which are not valid JSON are yielded as None.
+
+    Films exported by 'flask export' have director's name as 'First Last' in
+    'director', it is used when there is no 'director_name'.
+    """
+
+    name = path[:-3] if path.endswith(".gz") else path
+    opener = gzip.open if path.endswith(".gz") else open
+
+    with opener(path, "rt", newline="", encoding="utf-8") as file:
+        records = _read_csv(file) if name.endswith(".csv") else _read_ndjson(file)
+        for number, film in enumerate(records):
+            if number < skip:
+                continue
+            if isinstance(film, dict) and not film.get("director_name") and film.get("director"):
+                film["director_name"] = film["director"].replace(" ", "_", 1)
+            yield film
+
+
+def _read_ndjson(file) -> Iterator[Optional[dict]]:
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _read_csv(file) -> Iterator[dict]:
+    for row in csv.DictReader(file):
+        row["genres"] = [genre for genre in (row.get("genres") or "").split(CSV_GENRES_SEPARATOR) if genre]
+        yield {key: value if value != "" else None for key, value in row.items()}
+
+
+class Checkpoint:
+    """Import progress saved in a file, so a killed import can be resumed.
+
+    Progress is saved after a chunk is committed, so if import is killed
+    between the two, that chunk is imported again on resume.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {"position": 0, "created": 0, "failed": 0}
+
+        with open(self.path) as file:
+            return json.load(file)
+
+    def save(self, state: dict) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,15 +1,182 @@
-"""Logger setup."""
+"""Logger setup.
 
+Request threads only put records into a bounded queue, formatting and writing
+happen in a background listener thread, which writes records in batches.
+'log_pipeline.init_app' starts the thread, until then records are not written.
+"""
+
+import atexit
+import json
 import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, WatchedFileHandler
+from queue import Empty, Full, Queue
 from sys import stdout
+from threading import Lock, Thread
+from typing import List, Optional
+from flask import Flask
+
+_STOP = object()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Puts records into bounded queue without waiting. Records which do not
+    fit are dropped and counted in 'dropped'.
+
+    Records are queued unformatted, so arguments are only turned into message
+    by the listener. They must not depend on request context.
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self.dropped = 0
+        self._dropped_lock = Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats record as one line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                 "level": record.levelname,
+                 "message": record.getMessage()}
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler which writes and flushes a batch of records at once."""
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        records = [record for record in records if record.levelno >= self.level and self.filter(record)]
+        if not records:
+            return
+
+        try:
+            data = "".join(self.format(record) + self.terminator for record in records)
+            with self.lock:
+                self._write(data)
+        except Exception:
+            self.handleError(records[-1])
+
+    def _write(self, data: str) -> None:
+        self.stream.write(data)
+        self.stream.flush()
+
+
+class BatchWatchedFileHandler(BatchStreamHandler, WatchedFileHandler):
+    """File handler which writes a batch of records at once. Several processes
+    can append to the same file, which is rotated outside of the app, by
+    logrotate. File is reopened when it was moved or removed."""
+
+    def _write(self, data: str) -> None:
+        self.reopenIfNeeded()
+        super()._write(data)
+
+
+class LogListener:
+    """Background thread which takes records from queue and hands them to
+    handlers, up to 'batch_size' records at once."""
+
+    def __init__(self, queue: Queue, *handlers: BatchStreamHandler, batch_size: int = 256):
+        self.queue = queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write records queued so far and stop the thread."""
+
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            records = [self.queue.get()]
+            while len(records) < self.batch_size and records[-1] is not _STOP:
+                try:
+                    records.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            stop = records[-1] is _STOP
+            if stop:
+                records.pop()
+            for handler in self.handlers:
+                handler.handle_batch(records)
+            if stop:
+                return
+
+
+class LogPipeline:
+    """Sends records of 'logger' through bounded queue to listener thread,
+    which writes them as JSON lines to LOG_FILE and as text to stdout.
+
+    Threads do not survive fork, so 'init_app' should run in every worker
+    process, after it is forked.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.queue: Optional[Queue] = None
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[LogListener] = None
+
+    def init_app(self, app: Flask) -> None:
+        if self.listener is not None:
+            return
+
+        file_handler = BatchWatchedFileHandler(app.config["LOG_FILE"], "a")
+        stdout_handler = BatchStreamHandler(stream=stdout)
+        file_handler.setFormatter(JSONFormatter())
+        stdout_handler.setFormatter(logging.Formatter(fmt='[%(asctime)s: %(levelname)s] %(message)s'))
+
+        self.queue = Queue(maxsize=app.config["LOG_QUEUE_SIZE"])
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.listener = LogListener(self.queue, file_handler, stdout_handler,
+                                    batch_size=app.config["LOG_BATCH_SIZE"])
+        self.listener.start()
+        self.logger.addHandler(self.queue_handler)
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Write records queued so far and stop the listener."""
+
+        if self.listener is None:
+            return
+
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+
+    def stats(self) -> dict:
+        if self.queue is None:
+            return {"queued": 0, "max_size": 0, "dropped": 0}
+        return {"queued": self.queue.qsize(), "max_size": self.queue.maxsize,
+                "dropped": self.queue_handler.dropped}
+
 
 my_logger = logging.getLogger("__name__")
 my_logger.setLevel(logging.INFO)
 
-file_handler = logging.FileHandler("logs.log", "a")
-stdout_handler = logging.StreamHandler(stream=stdout)
-
-file_handler.setFormatter(logging.Formatter(fmt='[%(asctime)s: %(levelname)s] %(message)s'))
-stdout_handler.setFormatter(logging.Formatter(fmt='[%(asctime)s: %(levelname)s] %(message)s'))
-my_logger.addHandler(file_handler)
-my_logger.addHandler(stdout_handler)
+log_pipeline = LogPipeline(my_logger)
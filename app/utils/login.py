@@ -2,9 +2,11 @@
 
 from flask_login import LoginManager
 from app import app
-from app.data.repos import user_repo
+from app.data.repos import user_repo, user_cache
 from app.domain.schemas import GetFromIdSchema
+from app.domain.models.db import read_only
 
+_MISSING = object()
 
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -12,4 +14,16 @@ login_manager.init_app(app)
 
 @login_manager.user_loader
 def load_user(user_id):
+    """User of session, taken from per-worker cache if possible. Missing users are cached too."""
+
+    user = user_cache.get(user_id, _MISSING)
+    if user is _MISSING:
+        user = _read_user(user_id)
+        user_cache.set(user_id, user)
+
+    return user
+
+
+@read_only
+def _read_user(user_id):
     return user_repo.get_with_id(GetFromIdSchema(id=user_id))
@@ -0,0 +1,37 @@
+"""Counting of SQL statements sent to the db."""
+
+from contextlib import contextmanager
+from app.domain.models.db import db
+
+
+class QueryCounter:
+    """Collects statements executed while it is listening."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Count statements executed inside 'with' block.
+
+    Usage:
+        with count_queries() as counter:
+            film_repo.get_films_with_sort(schema)
+        assert counter.count <= 3
+    """
+
+    engine = engine or db.engine
+    counter = QueryCounter()
+    db.event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        db.event.remove(engine, "before_cursor_execute", counter)
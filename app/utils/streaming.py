@@ -0,0 +1,50 @@
+"""Helpers for streamed responses."""
+
+import json
+import zlib
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+from pydantic.json import pydantic_encoder
+
+
+def ndjson(items: Iterable, buffer_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encode items as NDJSON, yielding about 'buffer_size' bytes at a time."""
+
+    buffer, size = [], 0
+    for item in items:
+        line = json.dumps(item, default=pydantic_encoder).encode() + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def ndjson_async(items: AsyncIterable, buffer_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Same as 'ndjson' for async iterable of items."""
+
+    buffer, size = [], 0
+    async for item in items:
+        line = json.dumps(item, default=pydantic_encoder).encode() + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress stream of bytes into gzip format chunk by chunk."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
@@ -0,0 +1,12 @@
+"""ASGI entry point with film routes on async repos, run with e.g.
+
+    uvicorn asgi:application --workers 4
+"""
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from app.resources.async_route import routes, exception_handlers, lifespan
+
+application = Starlette(routes=routes, exception_handlers=exception_handlers, lifespan=lifespan,
+                        middleware=[Middleware(GZipMiddleware, minimum_size=1024)])
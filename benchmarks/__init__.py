@@ -0,0 +1,4 @@
+"""Benchmarks which run against a real database.
+
+Every benchmark is a module runnable with 'python -m benchmarks.<name> --help'.
+"""
@@ -0,0 +1,59 @@
+"""Film listings through sync repo against async repo with many queries in flight.
+
+Sync path runs requests one after another, as a sync worker does. Async
+path keeps '--concurrency' requests in flight on one event loop. Needs
+Postgres with seeded catalog ('flask seed <amount>') and asyncpg.
+
+    python -m benchmarks.async_repos --uri postgresql+psycopg2://... --requests 200 --concurrency 20
+"""
+
+import asyncio
+from benchmarks.common import parser, setup_app, measure, report
+
+
+def main():
+    arg_parser = parser(__doc__)
+    arg_parser.add_argument("--requests", type=int, default=200, help="Listing requests in every run.")
+    arg_parser.add_argument("--concurrency", type=int, default=20, help="Async requests in flight.")
+    arg_parser.add_argument("--per-page", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    app = setup_app(args.uri)
+    from app.data import repos, async_repos
+    from app.domain import schemas
+    from app.domain.models.db import db
+
+    if args.uri:
+        async_repos.async_db.uri = args.uri.replace("+psycopg2", "+asyncpg")
+    schemas_list = [schemas.FilterFilmSchema(genres=["Drama"], sort_by="rating", sort_type="desc")] * args.requests
+    pages = [1 + number % 50 for number in range(args.requests)]
+
+    def sync_run():
+        with app.app_context():
+            for schema, page in zip(schemas_list, pages):
+                repos.film_repo.get_films_with_filter(schema, page, args.per_page)
+                db.session.rollback()
+
+    async def async_run():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(schema, page):
+            async with semaphore:
+                await async_repos.film_repo.get_films_with_filter(schema, page, args.per_page)
+
+        await asyncio.gather(*(one(schema, page) for schema, page in zip(schemas_list, pages)))
+
+    loop = asyncio.new_event_loop()
+    try:
+        for name, func in (("sync, sequential", sync_run),
+                           (f"async, {args.concurrency} in flight", lambda: loop.run_until_complete(async_run()))):
+            result = measure(func, args.repeat)
+            result["requests_per_s"] = round(args.requests / result["median_ms"] * 1000, 1)
+            report(f"{args.requests} listings {name}", result)
+    finally:
+        loop.run_until_complete(async_repos.async_db.dispose())
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Shared helpers for benchmarks."""
+
+import argparse
+import statistics
+from time import perf_counter
+from typing import Callable
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    """Argument parser with common options."""
+
+    arg_parser = argparse.ArgumentParser(description=description)
+    arg_parser.add_argument("--uri", help="Database URI, app config is used if omitted.")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Runs of every measured case.")
+
+    return arg_parser
+
+
+def setup_app(uri: str = None):
+    """Configure app for benchmark and import all of its modules."""
+
+    from app import app
+
+    if uri:
+        app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    import wsgi  # noqa: F401
+
+    return app
+
+
+def measure(func: Callable, repeat: int) -> dict:
+    """Run func 'repeat' times after a warm up run, return timings in ms."""
+
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1000)
+
+    return {"median_ms": round(statistics.median(timings), 3),
+            "min_ms": round(min(timings), 3),
+            "max_ms": round(max(timings), 3)}
+
+
+def report(name: str, result: dict) -> None:
+    print(f"{name:<40} " + "  ".join(f"{key}={value}" for key, value in result.items()))
@@ -0,0 +1,39 @@
+"""Film listing page: full films against film cards, which leave description out.
+
+Measures fetching and serializing a sorted page through films repo, and size of
+the page as JSON. Needs seeded catalog ('flask seed <amount>').
+
+    python -m benchmarks.film_card --uri postgresql+psycopg2://... --per-page 100
+"""
+
+import json
+from benchmarks.common import parser, setup_app, measure, report
+
+
+def main():
+    arg_parser = parser(__doc__)
+    arg_parser.add_argument("--per-page", type=int, default=100, help="Films on the page.")
+    arg_parser.add_argument("--page", type=int, default=1, help="Page number, later pages skip more rows.")
+    args = arg_parser.parse_args()
+
+    app = setup_app(args.uri)
+    from app.data import repos
+    from app.domain import schemas
+    from app.domain.models.db import db
+
+    schema = schemas.SortFilmSchema(sort_by="rating", sort_type="desc")
+
+    with app.app_context():
+        for view in ("full", "card"):
+            def page():
+                items = repos.film_repo.get_films_with_sort(schema, args.page, args.per_page, view=view).items
+                db.session.rollback()
+                return items
+
+            result = measure(page, args.repeat)
+            result["payload_bytes"] = len(json.dumps(page()))
+            report(f"{args.per_page} films, {view}", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Film listing serialization: ORM models through 'FilmOrm' against selected rows through 'FilmSerializer'.
+
+Both cases include fetching films with genres. Needs seeded catalog ('flask seed <amount>').
+
+    python -m benchmarks.serialization --uri postgresql+psycopg2://... --rows 1000
+"""
+
+from benchmarks.common import parser, setup_app, measure, report
+
+
+def main():
+    arg_parser = parser(__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1000, help="Films in every run.")
+    args = arg_parser.parse_args()
+
+    app = setup_app(args.uri)
+    from app.data import repos
+    from app.domain import models, schemas
+    from app.domain.models.db import db
+
+    film = models.Film
+
+    with app.app_context():
+        def pydantic():
+            query = film.query.options(db.selectinload(film.genres)).order_by(film.id).limit(args.rows)
+            [schemas.FilmOrm.from_orm(model).dict() for model in query]
+            db.session.rollback()
+
+        def rows():
+            repos.film_repo._process_models(repos.film_repo._rows_query().order_by(film.id).limit(args.rows).all())
+            db.session.rollback()
+
+        for name, func in (("orm + FilmOrm", pydantic), ("rows + FilmSerializer", rows)):
+            result = measure(func, args.repeat)
+            result["rows_per_s"] = round(args.rows / result["median_ms"] * 1000)
+            report(f"{args.rows} films {name}", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Film title search: legacy 'LIKE %term%' scan against trigram search backend.
+
+The legacy query runs with index scans disabled, as it did before pg_trgm
+index existed. Needs Postgres with seeded catalog ('flask seed <amount>').
+
+    python -m benchmarks.title_search --uri postgresql+psycopg2://... love night
+"""
+
+from benchmarks.common import parser, setup_app, measure, report
+
+
+def main():
+    arg_parser = parser(__doc__)
+    arg_parser.add_argument("terms", nargs="+", help="Search terms.")
+    arg_parser.add_argument("--per-page", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    app = setup_app(args.uri)
+    from app.data import repos
+    from app.domain import models, schemas
+    from app.domain.models.db import db
+
+    film = models.Film
+
+    with app.app_context():
+        for term in args.terms:
+            def legacy():
+                db.session.execute(db.text("SET LOCAL enable_bitmapscan = off"))
+                db.session.execute(db.text("SET LOCAL enable_indexscan = off"))
+                query = repos.film_repo._rows_query().filter(film.title.like(f"%{term}%")).order_by(film.id)
+                repos.film_repo._paginate(query, 1, args.per_page)
+                db.session.rollback()
+
+            def trigram():
+                repos.film_repo.get_films_by_title(schemas.GetFilmByTitle(title=term), 1, args.per_page)
+                db.session.rollback()
+
+            report(f"legacy like '{term}'", measure(legacy, args.repeat))
+            report(f"trigram '{term}'", measure(trigram, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""film sort keyset indexes
+
+Revision ID: a1c3e5f7b9d1
+Revises: 
+Create Date: 2026-10-18 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d1'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps film writable while indexes are built, it can't run in transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_film_rating_id ON film (rating, id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_film_release_date_id ON film (release_date, id)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_film_release_date_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_film_rating_id")
@@ -0,0 +1,29 @@
+"""film title trigram index
+
+Revision ID: b2d4f6a8c0e2
+Revises: a1c3e5f7b9d1
+Create Date: 2026-10-18 11:03:27.905114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c0e2'
+down_revision = 'a1c3e5f7b9d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY keeps film writable while index is built, it can't run in transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_film_title_trgm "
+                   "ON film USING gin (title gin_trgm_ops)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_film_title_trgm")
@@ -0,0 +1,28 @@
+"""director name index
+
+Revision ID: c3e5a7b9d1f3
+Revises: b2d4f6a8c0e2
+Create Date: 2026-10-18 12:20:14.562031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d1f3'
+down_revision = 'b2d4f6a8c0e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps director writable while index is built, it can't run in transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_director_first_name_last_name "
+                   "ON director (first_name, last_name)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_director_first_name_last_name")
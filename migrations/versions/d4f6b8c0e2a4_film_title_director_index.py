@@ -0,0 +1,28 @@
+"""film title director index
+
+Revision ID: d4f6b8c0e2a4
+Revises: c3e5a7b9d1f3
+Create Date: 2026-10-18 14:02:51.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e2a4'
+down_revision = 'c3e5a7b9d1f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps film writable while index is built, it can't run in transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_film_title_director_id "
+                   "ON film (title, director_id)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_film_title_director_id")
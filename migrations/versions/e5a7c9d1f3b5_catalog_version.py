@@ -0,0 +1,28 @@
+"""catalog version
+
+Revision ID: e5a7c9d1f3b5
+Revises: d4f6b8c0e2a4
+Create Date: 2026-10-18 16:20:07.418532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f3b5'
+down_revision = 'd4f6b8c0e2a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("catalog_version",
+                    sa.Column("id", sa.Integer(), nullable=False),
+                    sa.Column("version", sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint("id"))
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+
+
+def downgrade():
+    op.drop_table("catalog_version")
@@ -0,0 +1,47 @@
+"""Needs asyncpg, async repos use ASYNC_DATABASE_URI."""
+
+import asyncio
+import pytest
+from app.data import async_repos
+from app.domain import schemas
+
+
+@pytest.fixture
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(async_repos.async_db.dispose())
+    loop.close()
+
+
+class TestAsyncFilmRepo:
+
+    def test_get_by_title_and_director(self, db_setup, run):
+        film = run(async_repos.film_repo.get_by_title_and_director("test1", "test", "test"))
+
+        assert film.title == "test1" and film.genres == ["Action", "Drama"]
+
+    def test_get_films_with_filter_after(self, db_setup, run):
+        schema = schemas.FilterFilmSchema(genres=["Action"], sort_by="rating", sort_type="desc")
+
+        first = run(async_repos.film_repo.get_films_with_filter_after(schema, None, 2, True))
+        last = first.items[-1]
+        rest = run(async_repos.film_repo.get_films_with_filter_after(schema, [last["rating"], last["id"]], 2))
+
+        assert first.has_next and first.total == 3
+        assert len(rest.items) == 1 and not rest.has_next
+
+    def test_update(self, db_setup, run):
+        updated = run(async_repos.film_repo.update(schemas.GetFromIdSchema(id=1),
+                                                   schemas.FilmSchema(rating=7.5, genres=["Drama"])))
+
+        assert updated.rating == 7.5 and updated.genres == ["Drama"]
+
+    def test_stream_films(self, db_setup, run):
+        async def collect():
+            return [film async for film in async_repos.film_repo.stream_films(schemas.FilterFilmSchema())]
+
+        films = run(collect())
+
+        assert [film["title"] for film in films] == ["test1", "test2", "test3"]
+        assert films[0]["director"] == "test test"
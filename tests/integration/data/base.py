@@ -0,0 +1,14 @@
+from app.data import repos
+from app.domain import schemas
+
+
+class TestBaseUpdate:
+
+    def test_update_returns_entity(self, db_setup):
+        updated = repos.user_repo.update(schemas.GetUserSchema(username="test"), schemas.UserSchema(admin_bool=True))
+
+        assert updated.username == "test" and updated.admin_bool
+
+    def test_update_missing(self, db_setup):
+        assert repos.user_repo.update(schemas.GetUserSchema(username="missing"),
+                                      schemas.UserSchema(admin_bool=True)) is None
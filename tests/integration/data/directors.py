@@ -0,0 +1,33 @@
+from app.data import repos
+from app.domain import schemas
+from app.utils.query_counter import count_queries
+
+
+class TestDirectorFindId:
+
+    def test_cached(self, db_setup):
+        director_id = repos.director_repo.find_id("test", "test")
+
+        with count_queries() as counter:
+            assert repos.director_repo.find_id("test", "test") == director_id
+
+        assert counter.count == 0
+
+    def test_miss_is_cached(self, db_setup):
+        assert repos.director_repo.find_id("no", "body") is None
+
+        with count_queries() as counter:
+            assert repos.director_repo.find_id("no", "body") is None
+
+        assert counter.count == 0
+
+    def test_invalidated_on_director_write(self, db_setup):
+        assert repos.director_repo.find_id("new", "director") is None
+        repos.director_repo.create(schemas.NewDirectorSchema(first_name="new", last_name="director", age=40))
+
+        assert repos.director_repo.find_id("new", "director")
+
+    def test_find_ids(self, db_setup):
+        ids = repos.director_repo.find_ids([("test", "test"), ("no", "body")])
+
+        assert ids == {("test", "test"): repos.director_repo.find_id("test", "test")}
@@ -0,0 +1,180 @@
+import pytest
+from decimal import Decimal
+from app.data import repos
+from app.domain import models, schemas
+from app.utils.query_counter import count_queries
+
+# page select + one batched select of genres
+LIST_QUERIES = 2
+
+
+class TestFilmListQueries:
+
+    def test_get_films_by_title(self, db_setup):
+        with count_queries() as counter:
+            result = repos.film_repo.get_films_by_title(schemas.GetFilmByTitle(title="test"), 1, 10)
+
+        assert len(result.items) == 3
+        assert counter.count <= LIST_QUERIES
+
+    @pytest.mark.parametrize('params', [["release_date", "asc"], ["rating", "desc"]])
+    def test_get_films_with_sort(self, db_setup, params):
+        with count_queries() as counter:
+            result = repos.film_repo.get_films_with_sort(
+                schemas.SortFilmSchema(sort_by=params[0], sort_type=params[1]), 1, 10)
+
+        assert len(result.items) == 3
+        assert counter.count <= LIST_QUERIES
+
+    def test_get_films_with_filter(self, db_setup):
+        with count_queries() as counter:
+            result = repos.film_repo.get_films_with_filter(
+                schemas.FilterFilmSchema(genres=["Action"], director_id=1), 1, 10)
+
+        assert len(result.items) == 3
+        assert counter.count <= LIST_QUERIES
+
+    def test_get_all(self, db_setup):
+        with count_queries() as counter:
+            result = repos.film_repo.get_all(1, 10)
+
+        assert all(film["genres"] for film in result.items)
+        assert counter.count <= LIST_QUERIES
+
+
+class TestFilmSerialization:
+
+    def test_listing_matches_film_orm(self, db_setup):
+        expected = [schemas.FilmOrm.from_orm(model).dict() for model in models.Film.query.order_by(models.Film.id)]
+
+        assert repos.film_repo.get_all(1, 10).items == expected
+        assert repos.film_repo.get_films_by_ids([3, 1]) == [expected[2], expected[0]]
+
+    def test_listing_fields(self, db_setup):
+        fields = frozenset({"title", "genres"})
+        expected = [schemas.FilmOrm.from_orm(model).dict(include=fields | {"id"})
+                    for model in models.Film.query.order_by(models.Film.id)]
+
+        assert repos.film_repo.get_all(1, 10).items != expected
+        assert repos.film_repo.get_films_with_filter(schemas.FilterFilmSchema(), 1, 10,
+                                                     fields=fields).items == expected
+        assert repos.film_repo.get_films_by_ids([3, 1], fields) == [expected[2], expected[0]]
+
+    def test_listing_cards(self, db_setup):
+        expected = [schemas.FilmCard.from_orm(model).dict() for model in models.Film.query.order_by(models.Film.id)]
+
+        assert repos.film_repo.get_films_with_filter(schemas.FilterFilmSchema(), 1, 10,
+                                                     view="card").items == expected
+        assert repos.film_repo.get_films_by_ids([3, 1], view="card") == [expected[2], expected[0]]
+
+
+class TestFilmPagination:
+
+    def test_has_next(self, db_setup):
+        schema = schemas.SortFilmSchema(sort_by="rating", sort_type="asc")
+
+        assert repos.film_repo.get_films_with_sort(schema, 1, 2).has_next
+        assert not repos.film_repo.get_films_with_sort(schema, 2, 2).has_next
+
+    def test_with_total(self, db_setup):
+        result = repos.film_repo.get_films_by_title(schemas.GetFilmByTitle(title="test"), 1, 2, True)
+
+        assert result.total == 3
+        assert len(result.items) == 2
+
+    def test_keyset(self, db_setup):
+        schema = schemas.SortFilmSchema(sort_by="rating", sort_type="desc")
+        first_page = repos.film_repo.get_films_with_sort_after(schema, None, 2)
+        last = first_page.items[-1]
+        second_page = repos.film_repo.get_films_with_sort_after(
+            schema, [Decimal(str(last["rating"])), last["id"]], 2)
+
+        assert first_page.has_next and not second_page.has_next
+        assert len(second_page.items) == 1
+
+    def test_filter_search_and_sort(self, db_setup):
+        schema = schemas.FilterFilmSchema(genres=["Action"], title="test", sort_by="rating", sort_type="desc")
+        result = repos.film_repo.get_films_with_filter(schema, 1, 10)
+        ratings = [film["rating"] for film in result.items]
+
+        assert len(result.items) == 3
+        assert ratings == sorted(ratings, reverse=True)
+
+
+class TestFilmCreateMany:
+
+    @staticmethod
+    def new_film(title, genres):
+        return schemas.NewFilmSchema(title=title, poster="https://placeimg.com/505/0/any",
+                                     release_date="2000-12-12", director_id=1, user_id=1,
+                                     genres=genres, rating=5)
+
+    def test_create_many(self, db_setup):
+        films = [self.new_film(f"bulk{index}", ["Action", "Drama"]) for index in range(5)]
+
+        with count_queries() as counter:
+            results = repos.film_repo.create_many(films, chunk_size=2)
+
+        assert [result.index for result in results] == list(range(5))
+        assert all(result.id for result in results)
+        # per chunk: ids, films, film_genre
+        assert counter.count <= 3 * 3
+        assert repos.film_repo.get_with_id(schemas.GetFromIdSchema(id=results[4].id)).genres == ["Action", "Drama"]
+
+    def test_missing_genre(self, db_setup):
+        results = repos.film_repo.create_many([self.new_film("bulk", ["Western"]),
+                                               self.new_film("bulk2", ["Action"])])
+
+        assert results[0].error and not results[0].id
+        assert results[1].id
+
+
+class TestFilmStream:
+
+    def test_stream_films(self, db_setup):
+        with count_queries() as counter:
+            films = list(repos.film_repo.stream_films(schemas.FilterFilmSchema(genres=["Action"]), chunk_size=2))
+
+        assert [film["title"] for film in films] == ["test1", "test2", "test3"]
+        assert films[0]["director"] == "test test"
+        assert films[0]["genres"] == ["Action", "Drama"]
+        # films with joined director + genres for each of two chunks
+        assert counter.count <= 3
+
+
+class TestFilmUpdate:
+
+    def test_update(self, db_setup):
+        with count_queries() as counter:
+            updated = repos.film_repo.update(schemas.GetFilmSchema(title="test1", director_id=1),
+                                             schemas.FilmSchema(rating=7.5))
+
+        assert updated.rating == 7.5 and updated.title == "test1"
+        assert updated.genres == ["Action", "Drama"]
+        # UPDATE ... RETURNING + genres of the film
+        assert counter.count <= 2
+
+    def test_update_genres(self, db_setup):
+        updated = repos.film_repo.update(schemas.GetFilmSchema(title="test1", director_id=1),
+                                         schemas.FilmSchema(title="renamed", genres=["Drama"]))
+
+        assert updated.title == "renamed" and updated.genres == ["Drama"]
+        assert repos.film_repo.get_with_id(schemas.GetFromIdSchema(id=updated.id)).genres == ["Drama"]
+
+    def test_update_missing(self, db_setup):
+        assert repos.film_repo.update(schemas.GetFilmSchema(title="missing", director_id=1),
+                                      schemas.FilmSchema(rating=7.5)) is None
+
+
+class TestFilmByTitleAndDirector:
+
+    def test_get_by_title_and_director(self, db_setup):
+        with count_queries() as counter:
+            film = repos.film_repo.get_by_title_and_director("test1", "test", "test")
+
+        assert film.title == "test1" and film.director_id == 1
+        assert film.genres == ["Action", "Drama"]
+        assert counter.count == 1
+
+    def test_get_by_title_and_wrong_director(self, db_setup):
+        assert repos.film_repo.get_by_title_and_director("test1", "missing", "missing") is None
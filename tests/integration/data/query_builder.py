@@ -0,0 +1,35 @@
+import json
+import pytest
+from app.data.CRUD.query_builder import FilmQueryBuilder
+from app.data.search import TrigramTitleSearch
+from app.domain import models, schemas
+from app.domain.models.db import db
+
+
+def plan_nodes(query) -> list:
+    """Nodes of Postgres plan of query, from EXPLAIN (FORMAT JSON)."""
+
+    connection = db.session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+@pytest.mark.parametrize('schema', [
+    schemas.FilterFilmSchema(genres=["Action", "Drama"], director_id=1, date_from="2000-01-01"),
+    schemas.FilterFilmSchema(genres=["Action"], title="test", sort_by="rating", sort_type="desc"),
+])
+def test_filter_plan_is_flat(db_setup, schema):
+    query = FilmQueryBuilder(models.Film.query, "postgresql", TrigramTitleSearch()).filter(schema).ordered()
+
+    nodes = plan_nodes(query)
+
+    assert not [node for node in nodes if node["Node Type"] == "Subquery Scan"]
+    assert len([node for node in nodes if node.get("Relation Name") == "film"]) == 1
@@ -0,0 +1,27 @@
+import pytest
+from app.data import repos
+from app.domain import schemas
+from app.exceptions import MissingData
+from app.utils.query_counter import count_queries
+
+
+class TestGenreRegistry:
+
+    def test_get_models(self, db_setup):
+        repos.genre_registry.get_models(["Action"])
+
+        with count_queries() as counter:
+            genres = repos.genre_registry.get_models(["Action", "Drama"])
+
+        assert [genre.genre for genre in genres] == ["Action", "Drama"]
+        assert counter.count == 0
+
+    def test_invalidated_on_genre_write(self, db_setup):
+        repos.genre_registry.get_models(["Action"])
+        repos.genre_repo.create(schemas.GenreSchema(genre="Comedy"))
+
+        assert repos.genre_registry.get_models(["Comedy"])[0].genre == "Comedy"
+
+    def test_missing_genre(self, db_setup):
+        with pytest.raises(MissingData):
+            repos.genre_registry.get_models(["Western"])
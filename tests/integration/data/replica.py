@@ -0,0 +1,44 @@
+"""Run with SQLALCHEMY_REPLICA_URI pointing to a second, empty Postgres db."""
+
+import pytest
+from app import app
+from app.data import repos
+from app.domain import schemas
+from app.domain.models.db import db, replica_reads, REPLICA_BIND
+
+pytestmark = pytest.mark.skipif(REPLICA_BIND not in app.config["SQLALCHEMY_BINDS"],
+                                reason="SQLALCHEMY_REPLICA_URI is not set")
+
+
+@pytest.fixture
+def replica():
+    engine = db.get_engine(bind=REPLICA_BIND)
+    db.metadata.create_all(engine)
+    # new session, which has not written yet
+    db.session.remove()
+
+    yield engine
+
+    db.session.remove()
+    db.metadata.drop_all(engine)
+
+
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, db_setup, replica):
+        with replica_reads():
+            assert repos.film_repo.get_with_id(schemas.GetFromIdSchema(id=1)) is None
+
+        assert repos.film_repo.get_with_id(schemas.GetFromIdSchema(id=1)) is not None
+
+    def test_writes_go_to_primary(self, db_setup, replica):
+        with replica_reads():
+            repos.user_repo.update(schemas.GetUserSchema(username="test"), schemas.UserSchema(admin_bool=True))
+
+        assert repos.user_repo.get(schemas.GetUserSchema(username="test")).admin_bool
+
+    def test_reads_stay_on_primary_after_write(self, db_setup, replica):
+        repos.user_repo.update(schemas.GetUserSchema(username="test"), schemas.UserSchema(admin_bool=True))
+
+        with replica_reads():
+            assert repos.film_repo.get_with_id(schemas.GetFromIdSchema(id=1)) is not None
@@ -0,0 +1,25 @@
+from app.data import repos
+from app.data.seeder import Seeder
+from app.domain import models
+from app.domain.models.db import db
+
+
+class TestSeeder:
+
+    def test_run(self, db_setup):
+        films_before = models.Film.query.count()
+        reports = []
+
+        rows = Seeder(repos.genre_registry, chunk_size=20, seed=1).run(50, lambda *args: reports.append(args))
+
+        assert models.Film.query.count() == films_before + 50
+        assert [films for films, _, _ in reports] == [20, 40, 50]
+        assert reports[-1][1] == rows
+
+    def test_ids_continue_after_seeding(self, db_setup):
+        Seeder(repos.genre_registry, chunk_size=20, seed=1).run(20)
+        film = models.Film(title="after seeding", director_id=1, user_id=1)
+        db.session.add(film)
+        db.session.commit()
+
+        assert film.id == db.session.query(db.func.max(models.Film.id)).scalar()
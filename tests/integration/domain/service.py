@@ -11,7 +11,7 @@ class Request:
         self.params = params_dict
 
     def get(self, param):
-        return self.params[param]
+        return self.params.get(param)
 
     def getlist(self, param):
         return ["Action", "Drama"]
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, call
+from app.data.CRUD import CRUDBase
+from app.data.async_CRUD import AsyncCRUDBase
+from app.domain import models, schemas
+from app.exceptions.exceptions import ValidationFail
+
+
+@pytest.mark.parametrize('page, per_page', [(0, 10), (-1, 10), (1, 0)])
+def test_paginate_rejects_bad_page(page, per_page):
+    query = MagicMock()
+
+    with pytest.raises(ValidationFail):
+        CRUDBase(models.Users, schemas.UserOrm)._paginate(query, page, per_page)
+    with pytest.raises(ValidationFail):
+        asyncio.run(AsyncCRUDBase(models.Users, schemas.UserOrm, MagicMock())._paginate(query, page, per_page))
+
+    query.limit.assert_not_called()
+
+
+def test_commit_hooks_run_before_commit():
+    session = MagicMock()
+    repo = CRUDBase(models.Users, schemas.UserOrm)
+    repo.add_commit_hook(session.hook)
+    repo.add_write_listener(session.listener)
+    repo._update_returning = MagicMock(return_value=None)
+
+    repo.update(schemas.GetFromIdSchema(id=1), schemas.GetFromIdSchema(id=1), session)
+
+    assert session.method_calls[-3:] == [call.hook(session), call.commit(), call.listener()]
+
+
+def test_failing_write_listener_does_not_fail_write():
+    repo = CRUDBase(models.Users, schemas.UserOrm)
+    listener = MagicMock()
+    repo.add_write_listener(MagicMock(side_effect=TimeoutError))
+    repo.add_write_listener(listener)
+
+    repo._notify_write()
+    asyncio.run(AsyncCRUDBase._notify_write(repo))
+
+    assert listener.call_count == 2
+
+
+def test_async_commit_awaits_hooks():
+    session = AsyncMock()
+    repo = AsyncCRUDBase(models.Users, schemas.UserOrm, MagicMock())
+    repo.add_commit_hook(session.hook)
+
+    asyncio.run(repo._commit(session))
+
+    assert session.method_calls == [call.hook(session), call.commit()]
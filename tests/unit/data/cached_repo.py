@@ -0,0 +1,63 @@
+from unittest.mock import Mock, MagicMock
+from app.data.cached_repo import CachedFilmRepo, approximate_size
+from app.domain import schemas
+from app.utils.cache import TTLCache
+
+
+def make_repo():
+    page = schemas.PageSchema(items=[{"id": 1, "title": "test"}], has_next=False)
+    film_repo = Mock(get_films_with_filter=MagicMock(return_value=page), get=MagicMock(return_value=None))
+    return film_repo, CachedFilmRepo(film_repo, TTLCache(max_bytes=1024, sizeof=approximate_size))
+
+
+def test_repeated_read_is_cached():
+    film_repo, cached = make_repo()
+
+    first = cached.get_films_with_filter(schemas.FilterFilmSchema(genres=["Drama", "Action"]), 1, 10)
+    second = cached.get_films_with_filter(schemas.FilterFilmSchema(genres=["action", "drama"]), 1, 10)
+
+    assert first is second
+    assert film_repo.get_films_with_filter.call_count == 1
+    assert cached.cache.hits == 1
+
+
+def test_different_params_not_shared():
+    film_repo, cached = make_repo()
+
+    cached.get_films_with_filter(schemas.FilterFilmSchema(genres=["Action"]), 1, 10)
+    cached.get_films_with_filter(schemas.FilterFilmSchema(genres=["Action"]), 2, 10)
+
+    assert film_repo.get_films_with_filter.call_count == 2
+
+
+def test_none_is_cached():
+    film_repo, cached = make_repo()
+    schema = schemas.GetFilmSchema(title="test", director_id=1)
+
+    assert cached.get(schema) is None
+    assert cached.get(schema) is None
+    assert film_repo.get.call_count == 1
+
+
+def test_write_invalidates():
+    film_repo, cached = make_repo()
+    schema = schemas.FilterFilmSchema(genres=["Action"])
+
+    cached.get_films_with_filter(schema, 1, 10)
+    cached.delete(schemas.GetFilmSchema(title="test", director_id=1))
+    cached.get_films_with_filter(schema, 1, 10)
+
+    film_repo.delete.assert_called_once()
+    assert film_repo.get_films_with_filter.call_count == 2
+
+
+def test_results_are_kept_per_version():
+    film_repo, cached = make_repo()
+    cached.version = MagicMock(side_effect=[3, 3, 4])
+    schema = schemas.FilterFilmSchema(genres=["Action"])
+
+    cached.get_films_with_filter(schema, 1, 10)
+    cached.get_films_with_filter(schema, 1, 10)
+    cached.get_films_with_filter(schema, 1, 10)
+
+    assert film_repo.get_films_with_filter.call_count == 2
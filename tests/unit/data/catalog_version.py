@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock, patch
+from app.data.catalog_version import CatalogVersion
+
+
+def db_with_versions(*versions):
+    db = MagicMock()
+    db.session.return_value.get_bind.return_value = "primary"
+    db.session.return_value.execute.return_value.scalar.side_effect = versions
+    return db
+
+
+def test_current_is_reused_for_ttl():
+    catalog_version = CatalogVersion(ttl=10)
+    with patch("app.data.catalog_version.db", db_with_versions(3, 4)) as db, \
+            patch("app.data.catalog_version.monotonic", return_value=100):
+        assert catalog_version.current() == 3
+        assert catalog_version.current() == 3
+    with patch("app.data.catalog_version.db", db), patch("app.data.catalog_version.monotonic", return_value=111):
+        assert catalog_version.current() == 4
+
+    assert db.session.return_value.execute.call_count == 2
+
+
+def test_invalidate_rereads_version():
+    catalog_version = CatalogVersion(ttl=10)
+    with patch("app.data.catalog_version.db", db_with_versions(3, 4)):
+        assert catalog_version.current() == 3
+        catalog_version.invalidate()
+        assert catalog_version.current() == 4
+
+
+def test_bump_runs_in_writing_session():
+    session = MagicMock()
+
+    CatalogVersion.bump(session)
+
+    session.execute.assert_called_once()
+    session.commit.assert_not_called()
+
+
+def test_change_listeners():
+    catalog_version = CatalogVersion(ttl=0)
+    listener = MagicMock()
+    catalog_version.add_change_listener(listener)
+    with patch("app.data.catalog_version.db", db_with_versions(3, 3, 5)):
+        catalog_version.current()
+        catalog_version.current()
+        listener.assert_not_called()
+        catalog_version.current()
+
+    listener.assert_called_once()
+
+
+def test_version_is_kept_per_db():
+    catalog_version = CatalogVersion(ttl=10)
+    with patch("app.data.catalog_version.db", db_with_versions(4, 3)) as db:
+        assert catalog_version.current() == 4
+        db.session.return_value.get_bind.return_value = "replica"
+        assert catalog_version.current() == 3
+        db.session.return_value.get_bind.return_value = "primary"
+        assert catalog_version.current() == 4
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from app.data.pool import InstrumentedQueuePool, PoolMetrics, pool_stats
+from app.domain.models.db import db
+
+
+def test_metrics_histogram():
+    metrics = PoolMetrics(buckets=(0.01, 0.1))
+    for seconds in (0.001, 0.05, 0.05, 2):
+        metrics.observe(seconds)
+
+    stats = metrics.stats()
+    assert stats["checkouts"] == 4 and stats["wait_seconds_max"] == 2
+    assert stats["checkout_seconds"] == {"0.01": 1, "0.1": 3, "+Inf": 4}
+
+
+def test_pool_counts_checkouts_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0,
+                           pool_timeout=0.01)
+    connection = engine.connect()
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1 and stats["timeouts"] == 1
+
+    connection.close()
+    engine.dispose()
+    assert pool_stats(engine.pool)["checkouts"] == 1
+
+
+def test_engine_options():
+    options = {"pool_size": 3, "max_overflow": 1, "pool_timeout": 2, "pool_recycle": 60, "pool_pre_ping": True}
+
+    engine = db.create_engine(make_url("postgresql+psycopg2://user:password@db/films"), dict(options))
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == 3 and engine.pool.stats()["max_overflow"] == 1
+
+    sqlite_engine = db.create_engine(make_url("sqlite://"), dict(options))
+    assert pool_stats(sqlite_engine.pool) == {"pool": "SingletonThreadPool"}
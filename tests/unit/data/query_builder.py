@@ -0,0 +1,43 @@
+from sqlalchemy.dialects import postgresql
+from app.data.CRUD.query_builder import FilmQueryBuilder
+from app.data.search import TrigramTitleSearch
+from app.domain import models, schemas
+
+
+def compile_builder(schema, after=None):
+    builder = FilmQueryBuilder(models.Film.query, "postgresql", TrigramTitleSearch()).filter(schema)
+    if after is not None:
+        return str(builder.after(after).keyset_ordered().statement.compile(dialect=postgresql.dialect()))
+    return str(builder.ordered().statement.compile(dialect=postgresql.dialect()))
+
+
+def test_filter_is_flat():
+    sql = compile_builder(schemas.FilterFilmSchema(genres=["Action", "Drama"], date_from="2000-01-01",
+                                                   date_to="2010-01-01", director_id=1))
+
+    assert sql.count("FROM film ") == 1
+    assert "EXISTS" in sql
+    assert "anon" not in sql
+    assert sql.endswith("ORDER BY film.id")
+
+
+def test_filter_with_search_and_sort():
+    sql = compile_builder(schemas.FilterFilmSchema(genres=["Action"], title="night",
+                                                   sort_by="rating", sort_type="desc"))
+
+    assert "ILIKE" in sql
+    assert "EXISTS" in sql
+    assert sql.endswith("ORDER BY film.rating DESC, film.id DESC")
+
+
+def test_filter_with_search_ordered_by_relevance():
+    sql = compile_builder(schemas.FilterFilmSchema(title="night"))
+
+    assert "ORDER BY word_similarity" in sql
+
+
+def test_filter_after():
+    sql = compile_builder(schemas.FilterFilmSchema(sort_by="rating"), after=[5, 10])
+
+    assert "(film.rating, film.id) >" in sql
+    assert sql.endswith("ORDER BY film.rating ASC, film.id ASC")
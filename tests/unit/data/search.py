@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.data.search import escape_like, LikeTitleSearch, TrigramTitleSearch
+from app.domain import models
+
+
+@pytest.mark.parametrize('term, escaped', [["plain", "plain"], ["50%", "50/%"],
+                                           ["a_b", "a/_b"], ["a/b", "a//b"]])
+def test_escape_like(term, escaped):
+    assert escape_like(term) == escaped
+
+
+def compile_search(search, dialect_name):
+    query = search.apply(models.Film.query, models.Film, "night", dialect_name)
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_trigram_search():
+    sql = compile_search(TrigramTitleSearch(), "postgresql")
+
+    assert "ILIKE" in sql
+    assert "ORDER BY word_similarity" in sql
+
+
+def test_trigram_search_fallback():
+    assert compile_search(TrigramTitleSearch(), "sqlite") == compile_search(LikeTitleSearch(), "sqlite")
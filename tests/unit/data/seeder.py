@@ -0,0 +1,32 @@
+from app.data.seeder import SeedChunk, generate_chunk, TABLES
+
+
+def make_chunk(index=1, size=50, seed=3):
+    return SeedChunk(index=index, size=size, director_start=10, user_start=20, film_start=30,
+                     chunk_size=100, genre_ids=(1, 2, 3, 4), seed=seed)
+
+
+def test_generate_chunk_ids():
+    rows = generate_chunk(make_chunk())
+
+    assert [row[0] for row in rows["film"]] == list(range(130, 180))
+    assert [row[0] for row in rows["director"]] == list(range(110, 160))
+    assert all(len(row) == len(TABLES[table]) for table, table_rows in rows.items() for row in table_rows)
+
+
+def test_generate_chunk_foreign_keys():
+    rows = generate_chunk(make_chunk())
+
+    assert all(10 <= row[5] < 160 and 20 <= row[7] < 170 for row in rows["film"])
+    assert {film_id for film_id, _ in rows["film_genre"]} == {row[0] for row in rows["film"]}
+    assert all(genre_id in (1, 2, 3, 4) for _, genre_id in rows["film_genre"])
+
+
+def test_generate_chunk_usernames_unique():
+    usernames = [row[1] for index in range(3) for row in generate_chunk(make_chunk(index, seed=None))["users"]]
+
+    assert len(set(usernames)) == len(usernames)
+
+
+def test_generate_chunk_reproducible():
+    assert generate_chunk(make_chunk()) == generate_chunk(make_chunk())
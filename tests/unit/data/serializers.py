@@ -0,0 +1,77 @@
+import datetime
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import create_engine, select
+from app.data.serializers import DIRECTOR_NAME, FilmSerializer, make_serializer
+from app.domain.models import Director
+from app.domain.schemas import FilmOrm, FilmCard
+
+
+def test_make_serializer():
+    serialize = make_serializer({"a": None, "b": str, "c": None, "d": len}, extra=("c", ))
+
+    assert serialize((1, 2, "xyz"), 3) == {"a": 1, "b": "2", "c": 3, "d": 3}
+    assert list(serialize((1, 2, "xyz"), 3)) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("director_id, rating, description", [(1, Decimal("9.9"), "text"), (None, Decimal("0.5"), None),
+                                                               (2, None, "")])
+def test_film_serializer_matches_film_orm(director_id, rating, description):
+    values = {"title": "test", "description": description, "poster": "http://test.com/poster.png",
+              "release_date": datetime.date(2001, 2, 3), "director_id": director_id, "rating": rating,
+              "user_id": 1, "id": 10}
+    model = SimpleNamespace(**values, genres=[SimpleNamespace(genre="Action"), SimpleNamespace(genre="Drama")])
+
+    result = FilmSerializer.of().serialize(tuple(values.values()), ["Action", "Drama"])
+    expected = FilmOrm.from_orm(model).dict()
+
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_film_serializer_fields():
+    serializer = FilmSerializer.of(frozenset({"rating", "title"}))
+
+    assert serializer.fields == ("title", "rating", "id")
+    assert not serializer.with_genres
+    assert serializer.serialize(("test", Decimal("7.5"), 3)) == {"title": "test", "rating": 7.5, "id": 3}
+    assert FilmSerializer.of(frozenset({"title", "rating"})) is serializer
+
+
+def test_film_serializer_fields_with_genres():
+    serializer = FilmSerializer.of(frozenset({"genres", "director_id"}))
+
+    assert serializer.fields == ("director_id", "genres", "id")
+    assert serializer.with_genres
+    assert serializer.serialize((None, 3), ["Action"]) == {"director_id": "unknown", "genres": ["Action"], "id": 3}
+
+
+@pytest.mark.parametrize("director, name", [(Director(first_name="First", last_name="Last"), "First Last"),
+                                            (Director(first_name="First", last_name=None), "First"),
+                                            (None, None)])
+def test_film_card_serializer_matches_film_card(director, name):
+    values = {"id": 10, "title": "test", "rating": Decimal("9.9"), "release_date": datetime.date(2001, 2, 3),
+              "director": director, "poster": "http://test.com/poster.png"}
+    model = SimpleNamespace(**values, genres=[SimpleNamespace(genre="Action")])
+    serializer = FilmSerializer.of(view="card")
+
+    result = serializer.serialize((10, "test", Decimal("9.9"), datetime.date(2001, 2, 3), name,
+                                   "http://test.com/poster.png"), ["Action"])
+    expected = FilmCard.from_orm(model).dict()
+
+    assert serializer.with_director
+    assert "description" not in result
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+@pytest.mark.parametrize("first_name, last_name", [("First", "Last"), ("First", None), (None, "Last"), (None, None)])
+def test_director_name_same_in_sql(first_name, last_name):
+    engine = create_engine("sqlite://")
+    Director.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(Director.__table__.insert().values(first_name=first_name, last_name=last_name))
+        name = connection.execute(select(DIRECTOR_NAME)).scalar()
+
+    assert name == Director(first_name=first_name, last_name=last_name).name
@@ -0,0 +1,72 @@
+from time import monotonic
+from unittest.mock import MagicMock, patch
+import pytest
+from app.data.catalog_version import CatalogVersion
+from app.data.title_index import TitleIndex
+
+
+@pytest.fixture
+def title_index():
+    index = TitleIndex(max_staleness=60)
+    for film_id, title in enumerate(["Night of the Living Dead", "Nightcrawler",
+                                     "A Night at the Opera", "Knight and Day", "Heat"], start=1):
+        index.add(film_id, title)
+    index._built_at = monotonic()
+
+    return index
+
+
+def test_search(title_index):
+    assert title_index.search("night") == [1, 3, 2, 4]
+    assert title_index.search("NIGHT AT") == [3]
+    assert title_index.search("dawn") == []
+
+
+def test_search_short_term(title_index):
+    assert title_index.search("he") is None
+
+
+def test_search_stale(title_index):
+    title_index._built_at -= 61
+
+    assert title_index.search("night") is None
+
+
+def test_search_invalidated(title_index):
+    title_index.invalidate()
+    assert title_index.search("night") is None
+
+    title_index._built_at = monotonic()
+    assert title_index.search("night") == [1, 3, 2, 4]
+
+
+def test_build_started_before_invalidate_is_stale(title_index):
+    built_at = title_index._built_at
+    title_index.invalidate()
+    title_index._built_at = built_at
+
+    assert not title_index.is_fresh
+
+
+def test_stale_after_write_of_other_worker(title_index):
+    catalog_version = CatalogVersion(ttl=0)
+    catalog_version.add_change_listener(title_index.invalidate)
+    db = MagicMock()
+    db.session.return_value.execute.return_value.scalar.side_effect = [3, 3, 4]
+
+    with patch("app.data.catalog_version.db", db):
+        catalog_version.current()
+        catalog_version.current()
+        assert title_index.search("night") == [1, 3, 2, 4]
+        catalog_version.current()
+        assert title_index.search("night") is None
+
+
+def test_add_remove(title_index):
+    title_index.add(2, "Day Shift")
+    title_index.remove(3)
+    title_index.remove(10)
+
+    assert title_index.search("night") == [1, 4]
+    assert title_index.search("day") == [2, 4]
+    assert len(title_index) == 4
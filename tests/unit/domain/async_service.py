@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, MagicMock
+from werkzeug.datastructures import MultiDict
+from app.exceptions.exceptions import MissingData, FilmOperationsError
+from app.domain.schemas import PageSchema
+from app.domain.async_service import AsyncFilmGet, AsyncFilmAction
+
+
+def test_find_director_bad_input():
+    film_get = AsyncFilmGet(Mock(), Mock(find_id=AsyncMock(return_value=None)))
+
+    with pytest.raises(MissingData):
+        asyncio.run(film_get._find_director("test_test"))
+
+
+def test_get_film():
+    film_repo = Mock(get_by_title_and_director=AsyncMock(return_value=Mock(dict=MagicMock(return_value="test"))))
+    film_get = AsyncFilmGet(film_repo, Mock())
+
+    result = asyncio.run(film_get.get_film("test", "First_Last"))
+
+    assert result == ({"film": "test"}, 200)
+    film_repo.get_by_title_and_director.assert_awaited_with("test", "First", "Last")
+
+
+def test_filter_films_with_cursor():
+    film_repo = Mock(get_films_with_filter_after=AsyncMock(
+        return_value=PageSchema(items=[{"id": 4, "rating": 5.0}], has_next=True)))
+    film_get = AsyncFilmGet(film_repo, Mock(find_id=AsyncMock(return_value=3)))
+    args = MultiDict({"director_name": "test_test", "sort_by": "rating", "cursor": ""})
+
+    result = asyncio.run(film_get.filter_films(args, 1, 1))
+
+    assert result[0]["next_cursor"] and result[1] == 206
+    schema = film_repo.get_films_with_filter_after.call_args.args[0]
+    assert schema.director_id == 3 and schema.sort_by == "rating"
+
+
+def test_delete_film():
+    film_repo = Mock(delete=AsyncMock(), get_by_title_and_director=AsyncMock(
+        return_value=Mock(id=5, user_id=1, dict=MagicMock(return_value="test"))))
+    film_action = AsyncFilmAction(film_repo, Mock())
+
+    result = asyncio.run(film_action.delete_film("test", "test_test", Mock(id=1)))
+
+    assert result == ({"deleted_film": "test"}, 200)
+    assert film_repo.delete.call_args.args[0].id == 5
+
+
+def test_delete_film_of_other_user():
+    film_repo = Mock(delete=AsyncMock(), get_by_title_and_director=AsyncMock(return_value=Mock(user_id=2)))
+    film_action = AsyncFilmAction(film_repo, Mock())
+
+    with pytest.raises(FilmOperationsError):
+        asyncio.run(film_action.delete_film("test", "test_test", Mock(id=1, admin_bool=False)))
+    film_repo.delete.assert_not_awaited()
@@ -0,0 +1,28 @@
+from unittest.mock import Mock
+from app.domain.models.db import _replica_reads, read_only, replica_reads
+
+
+def test_replica_reads():
+    with replica_reads():
+        assert _replica_reads.get()
+
+    assert not _replica_reads.get()
+
+
+def test_read_only_function():
+    func = read_only(Mock(side_effect=_replica_reads.get))
+
+    assert func() is True
+    assert not _replica_reads.get()
+
+
+def test_read_only_iterator():
+    def items():
+        yield _replica_reads.get()
+        yield _replica_reads.get()
+
+    results = []
+    for item in read_only(items)():
+        results.append((item, _replica_reads.get()))
+
+    assert results == [(True, False), (True, False)]
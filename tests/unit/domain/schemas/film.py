@@ -49,6 +49,14 @@ def test_filter_film_schema():
         FilterFilmSchema(date_to="1999-08-12")
 
 
+def test_filter_film_schema_sort():
+    assert FilterFilmSchema(sort_by=None).sort_by is None
+    assert FilterFilmSchema(sort_by="rating", sort_type="desc").sort_type == "desc"
+
+    with pytest.raises(ValidationError):
+        FilterFilmSchema(sort_by="title")
+
+
 @pytest.mark.parametrize('params', [["release_date", "asc"], ["rating", "desc"]])
 def test_sort_film_schema(params):
     assert SortFilmSchema.check_sort_option(params[0]) == params[0]
@@ -1,16 +1,18 @@
 import pytest
-from unittest.mock import Mock, MagicMock
-from app.exceptions.exceptions import MissingData, \
-    FilmOperationsError, UserAlreadyExists, NoAccessError, AuthenticationError
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, ANY
+from app.exceptions.exceptions import MissingData, InvalidCursor, \
+    FilmOperationsError, UserAlreadyExists, NoAccessError, AuthenticationError, ValidationFail
+from app.domain.schemas import PageSchema, BulkItemResult
+from app.utils.cursor import encode_cursor, decode_cursor
 from app.domain.service import FilmGet, FilmUtilsMixin, FilmAction,\
     UserGet, UserAction
 
 
 def test_find_film_bad_input(monkeypatch):
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
-    monkeypatch.setattr("app.domain.schemas.GetFilmSchema", MagicMock())
-    utils_mixin = FilmUtilsMixin(Mock(get=MagicMock(return_value=None)),
-                                 Mock(get=MagicMock(return_value=Mock(id=1))))
+    utils_mixin = FilmUtilsMixin(Mock(get_by_title_and_director=MagicMock(return_value=None)),
+                                 Mock(find_id=MagicMock(return_value=1)))
 
     with pytest.raises(MissingData):
         utils_mixin._find_film("test", "test_test")
@@ -18,29 +20,83 @@ def test_find_film_bad_input(monkeypatch):
 
 def test_find_director_bad_input(monkeypatch):
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
-    utils_mixin = FilmUtilsMixin(Mock(), Mock(get=MagicMock(return_value=None)))
+    utils_mixin = FilmUtilsMixin(Mock(), Mock(find_id=MagicMock(return_value=None)))
 
     with pytest.raises(MissingData):
         utils_mixin._find_director("test_test")
 
 
+def test_find_director():
+    director_repo = Mock(find_id=MagicMock(return_value=3))
+    utils_mixin = FilmUtilsMixin(Mock(), director_repo)
+
+    assert utils_mixin._find_director("First_Last") == 3
+    director_repo.find_id.assert_called_with("First", "Last")
+
+
+def test_find_film_joined():
+    film_repo = Mock(get_by_title_and_director=MagicMock(return_value="film"))
+    director_repo = Mock()
+    utils_mixin = FilmUtilsMixin(film_repo, director_repo)
+
+    assert utils_mixin._find_film("test", "First_Last") == "film"
+    film_repo.get_by_title_and_director.assert_called_with("test", "First", "Last")
+    director_repo.find_id.assert_not_called()
+
+
 def test_find_films_with_title(monkeypatch):
-    film_get = FilmGet(Mock(get_films_by_title=MagicMock(return_value=["test"])),
+    film_get = FilmGet(Mock(get_films_by_title=MagicMock(return_value=PageSchema(items=["test"], has_next=False))),
                        Mock())
     monkeypatch.setattr("app.domain.schemas.GetFilmByTitle", MagicMock())
 
     result = film_get.find_film_by_title("test", 1, 10)
 
     assert result[0]["films"] == ["test"]
+    assert result[0]["has_next"] is False
+    assert "total" not in result[0]
     assert result[1] == 206
 
 
+def test_find_films_with_title_total(monkeypatch):
+    film_repo = Mock(get_films_by_title=MagicMock(return_value=PageSchema(items=["test"], has_next=True, total=5)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.GetFilmByTitle", MagicMock())
+
+    result = film_get.find_film_by_title("test", 1, 1, "true")
+
+    film_repo.get_films_by_title.assert_called_with(ANY, 1, 1, True, None, "full")
+    assert result[0]["has_next"] is True
+    assert result[0]["total"] == 5
+
+
+def test_find_films_with_title_index(monkeypatch):
+    film_repo = Mock(get_films_by_ids=MagicMock(return_value=["test"]))
+    film_get = FilmGet(film_repo, Mock(), Mock(search=MagicMock(return_value=[3, 1, 2])))
+    monkeypatch.setattr("app.domain.schemas.GetFilmByTitle", MagicMock())
+
+    result = film_get.find_film_by_title("test", 2, 1, "true")
+
+    film_repo.get_films_by_ids.assert_called_with([1], None, "full")
+    film_repo.get_films_by_title.assert_not_called()
+    assert result[0]["has_next"] is True
+    assert result[0]["total"] == 3
+
+
+def test_find_films_with_title_index_fallback(monkeypatch):
+    film_repo = Mock(get_films_by_title=MagicMock(return_value=PageSchema(items=["test"], has_next=False)))
+    film_get = FilmGet(film_repo, Mock(), Mock(search=MagicMock(return_value=None)))
+    monkeypatch.setattr("app.domain.schemas.GetFilmByTitle", MagicMock())
+
+    result = film_get.find_film_by_title("test", 1, 10)
+
+    assert result[0]["films"] == ["test"]
+
+
 def test_get_film(monkeypatch):
-    film_get = FilmGet(Mock(get=MagicMock(return_value=Mock(dict=MagicMock(return_value="test")))),
-                       Mock(get=MagicMock(return_value=Mock(id=1))))
+    film_get = FilmGet(Mock(get_by_title_and_director=MagicMock(
+        return_value=Mock(dict=MagicMock(return_value="test")))), Mock(find_id=MagicMock(return_value=1)))
     monkeypatch.setattr("app.domain.schemas.GetFilmByTitle",  MagicMock())
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
-    monkeypatch.setattr("app.domain.schemas.GetFilmSchema", MagicMock())
 
     result = film_get.\
         get_film("test", "test_test")
@@ -50,8 +106,8 @@ def test_get_film(monkeypatch):
 
 
 def test_sort_films(monkeypatch):
-    film_get = FilmGet(Mock(get_films_with_sort=MagicMock(return_value=["test"])),
-                       Mock(get=MagicMock(return_value=Mock(id=1))))
+    film_get = FilmGet(Mock(get_films_with_sort=MagicMock(return_value=PageSchema(items=["test"], has_next=False))),
+                       Mock(find_id=MagicMock(return_value=1)))
     monkeypatch.setattr("app.domain.schemas.SortFilmSchema", MagicMock())
 
     result = film_get.sort_films("test", "test", 1, 10)
@@ -61,9 +117,9 @@ def test_sort_films(monkeypatch):
 
 
 def test_filter_films(monkeypatch):
-    film_get = FilmGet(Mock(get_films_with_filter=MagicMock(return_value=["test"])),
-                       Mock(get=MagicMock(return_value=Mock(id=1))))
-    mock_request = Mock(args=Mock(get=MagicMock(), getlist=MagicMock()))
+    film_get = FilmGet(Mock(get_films_with_filter=MagicMock(return_value=PageSchema(items=["test"], has_next=False))),
+                       Mock(find_id=MagicMock(return_value=1)))
+    mock_request = Mock(args=Mock(get=MagicMock(return_value=None), getlist=MagicMock()))
     monkeypatch.setattr("app.domain.schemas.FilterFilmSchema", MagicMock())
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
 
@@ -73,24 +129,152 @@ def test_filter_films(monkeypatch):
     assert result[1] == 206
 
 
+def test_sort_films_with_cursor(monkeypatch):
+    films = [{"id": 1, "rating": 2.5}, {"id": 2, "rating": 3.5}]
+    film_repo = Mock(get_films_with_sort_after=MagicMock(return_value=PageSchema(items=films, has_next=True)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.SortFilmSchema", MagicMock(return_value=Mock(sort_by="rating")))
+
+    result = film_get.sort_films("rating", "asc", 1, 2, "")
+    assert result[0]["next_cursor"]
+    film_repo.get_films_with_sort_after.assert_called_with(ANY, None, 2, False, None, "full")
+
+    film_get.sort_films("rating", "asc", 1, 2, result[0]["next_cursor"])
+    film_repo.get_films_with_sort_after.assert_called_with(ANY, [Decimal("3.5"), 2], 2, False, None, "full")
+
+    film_repo.get_films_with_sort_after.return_value = PageSchema(items=films, has_next=False)
+    result = film_get.sort_films("rating", "asc", 1, 2, "")
+    assert result[0]["next_cursor"] is None
+
+
+def test_filter_films_with_cursor(monkeypatch):
+    film_repo = Mock(get_films_with_filter_after=MagicMock(
+        return_value=PageSchema(items=[{"id": 5}], has_next=True)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.FilterFilmSchema", MagicMock(return_value=Mock(sort_by=None)))
+    cursor = encode_cursor([4])
+    mock_request = Mock(args=Mock(get=MagicMock(side_effect={"cursor": cursor}.get), getlist=MagicMock()))
+
+    result = film_get.filter_films(mock_request, 1, 1)
+
+    film_repo.get_films_with_filter_after.assert_called_with(ANY, [4], 1, False, None, "full")
+    assert result[0]["films"] == [{"id": 5}]
+    assert result[0]["next_cursor"]
+
+
+def test_filter_films_sorted_with_cursor(monkeypatch):
+    film_repo = Mock(get_films_with_filter_after=MagicMock(
+        return_value=PageSchema(items=[{"id": 5, "rating": 7.5}], has_next=True)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.FilterFilmSchema", MagicMock(return_value=Mock(sort_by="rating")))
+    cursor = encode_cursor([8.1, 4])
+    mock_request = Mock(args=Mock(get=MagicMock(side_effect={"cursor": cursor}.get), getlist=MagicMock()))
+
+    result = film_get.filter_films(mock_request, 1, 1)
+
+    film_repo.get_films_with_filter_after.assert_called_with(ANY, [Decimal("8.1"), 4], 1, False, None, "full")
+    assert decode_cursor(result[0]["next_cursor"]) == [7.5, 5]
+
+
+def test_export_films(monkeypatch):
+    film_repo = Mock(stream_films=MagicMock(return_value=iter([{"id": 1}])))
+    film_get = FilmGet(film_repo, Mock(find_id=MagicMock(return_value=3)))
+    args = Mock(get=MagicMock(side_effect={"director_name": "test_test", "sort_by": "rating"}.get),
+                getlist=MagicMock(return_value=["Action"]))
+
+    assert list(film_get.export_films(args)) == [{"id": 1}]
+    schema = film_repo.stream_films.call_args[0][0]
+    assert schema.director_id == 3 and schema.sort_by == "rating" and schema.genres == ["Action"]
+
+
+def test_get_film_fields():
+    film_repo = Mock(get_fields_by_title_and_director=MagicMock(return_value={"id": 1, "title": "test"}))
+    film_get = FilmGet(film_repo, Mock())
+
+    result = film_get.get_film("test", "First_Last", "title")
+
+    assert result == ({"film": {"id": 1, "title": "test"}}, 200)
+    film_repo.get_fields_by_title_and_director.assert_called_with("test", "First", "Last",
+                                                                  frozenset({"id", "title"}))
+    film_repo.get_by_title_and_director.assert_not_called()
+
+
+@pytest.mark.parametrize('value, expected', [(None, None), ("", None), (" , ", None),
+                                             ("title", {"id", "title"}), ("title, rating,id", {"id", "title", "rating"})])
+def test_fields(value, expected):
+    assert FilmGet._fields(value) == (frozenset(expected) if expected else None)
+
+
+def test_fields_unknown():
+    with pytest.raises(ValidationFail):
+        FilmGet._fields("title,password")
+    with pytest.raises(ValidationFail):
+        FilmGet._fields("title,description", "card")
+
+
+@pytest.mark.parametrize('value, expected', [(None, "full"), ("", "full"), ("card", "card"), ("full", "full")])
+def test_view(value, expected):
+    assert FilmGet._view(value) == expected
+
+
+def test_view_unknown():
+    with pytest.raises(ValidationFail):
+        FilmGet._view("short")
+
+
+def test_filter_films_card_view(monkeypatch):
+    film_repo = Mock(get_films_with_filter=MagicMock(return_value=PageSchema(items=[{"id": 1}], has_next=False)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.FilterFilmSchema", MagicMock())
+    mock_request = Mock(args=Mock(get=MagicMock(side_effect={"view": "card", "fields": "director"}.get),
+                                  getlist=MagicMock()))
+
+    film_get.filter_films(mock_request, 1, 10)
+
+    film_repo.get_films_with_filter.assert_called_with(ANY, 1, 10, False, frozenset({"id", "director"}), "card")
+
+
+def test_sort_films_with_cursor_and_fields(monkeypatch):
+    films = [{"id": 1, "title": "a", "rating": 2.5}, {"id": 2, "title": "b", "rating": 3.5}]
+    film_repo = Mock(get_films_with_sort_after=MagicMock(return_value=PageSchema(items=films, has_next=True)))
+    film_get = FilmGet(film_repo, Mock())
+    monkeypatch.setattr("app.domain.schemas.SortFilmSchema", MagicMock(return_value=Mock(sort_by="rating")))
+
+    result = film_get.sort_films("rating", "asc", 1, 2, "", fields="title")
+
+    film_repo.get_films_with_sort_after.assert_called_with(ANY, None, 2, False,
+                                                           frozenset({"id", "title", "rating"}), "full")
+    assert result[0]["films"] == [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    assert decode_cursor(result[0]["next_cursor"]) == [3.5, 2]
+
+
+@pytest.mark.parametrize('cursor', ["not a cursor", encode_cursor({"id": 1}), encode_cursor(["x", 1])])
+def test_sort_films_bad_cursor(monkeypatch, cursor):
+    film_get = FilmGet(Mock(), Mock())
+    monkeypatch.setattr("app.domain.schemas.SortFilmSchema", MagicMock(return_value=Mock(sort_by="rating")))
+
+    with pytest.raises(InvalidCursor):
+        film_get.sort_films("rating", "asc", 1, 10, cursor)
+
+
 def test_delete_film(monkeypatch):
-    film_repo = Mock(delete=MagicMock(), get=MagicMock(
-        return_value=Mock(user_id=1, dict=MagicMock(return_value="test"))))
-    film_action = FilmAction(film_repo,  Mock(get=MagicMock(return_value=Mock(id=1))))
+    film_repo = Mock(delete=MagicMock(), get_by_title_and_director=MagicMock(
+        return_value=Mock(id=5, user_id=1, dict=MagicMock(return_value="test"))))
+    film_action = FilmAction(film_repo,  Mock(find_id=MagicMock(return_value=1)))
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
-    monkeypatch.setattr("app.domain.schemas.GetFilmSchema", MagicMock())
     monkeypatch.setattr("flask_login.utils._get_user", MagicMock(return_value=Mock(id=1)))
 
     result = film_action.delete_film("test", "test_test")
 
     assert result[0]["deleted_film"] == "test"
     assert result[1] == 200
+    assert film_repo.delete.call_args.args[0].id == 5
 
 
 def test_create_film(monkeypatch):
     film_repo = Mock(create=MagicMock(
         return_value=Mock(title="test", username="test", dict=MagicMock(return_value="test"))))
-    film_action = FilmAction(film_repo, Mock(get=MagicMock(return_value=Mock(id=1))))
+    film_action = FilmAction(film_repo, Mock(find_id=MagicMock(return_value=1)))
     monkeypatch.setattr("app.domain.schemas.NewFilmSchema", Mock())
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
     monkeypatch.setattr("flask_login.utils._get_user", MagicMock(return_value=Mock(id=1)))
@@ -102,10 +286,63 @@ def test_create_film(monkeypatch):
     assert result[1] == 201
 
 
+BULK_FILM = {"title": "test", "poster": "https://placeimg.com/505/0/any", "release_date": "2000-12-12",
+             "director_name": "test_test", "genres": ["Action"], "rating": 5}
+
+
+def test_create_films(monkeypatch):
+    film_repo = Mock(create_many=MagicMock(return_value=[BulkItemResult(index=0, id=7, title="test"),
+                                                         BulkItemResult(index=1, title="test", error="db")]))
+    director_repo = Mock(find_ids=MagicMock(return_value={("test", "test"): 1}))
+    film_action = FilmAction(film_repo, director_repo)
+    monkeypatch.setattr("flask_login.utils._get_user", MagicMock(return_value=Mock(id=1)))
+    body = [BULK_FILM, dict(BULK_FILM, director_name="no_one"), dict(BULK_FILM, rating=20), "film", BULK_FILM]
+    mock_request = Mock(mimetype="application/json", get_json=MagicMock(return_value=body))
+
+    result = film_action.create_films(mock_request)
+
+    assert len(film_repo.create_many.call_args[0][0]) == 2
+    assert result[0]["created"] == [{"index": 0, "id": 7, "title": "test"}]
+    assert [error["index"] for error in result[0]["errors"]] == [1, 2, 3, 4]
+    assert result[1] == 207
+
+
+def test_create_films_ndjson(monkeypatch):
+    film_repo = Mock(create_many=MagicMock(return_value=[BulkItemResult(index=0, id=7, title="test")]))
+    film_action = FilmAction(film_repo, Mock(find_ids=MagicMock(return_value={("test", "test"): 1})))
+    monkeypatch.setattr("flask_login.utils._get_user", MagicMock(return_value=Mock(id=1)))
+    body = '{"title": "test", "poster": "https://placeimg.com/505/0/any", "release_date": "2000-12-12", ' \
+           '"director_name": "test_test", "genres": ["Action"], "rating": 5}\n\n'
+    mock_request = Mock(mimetype="application/x-ndjson", get_data=MagicMock(return_value=body))
+
+    result = film_action.create_films(mock_request)
+
+    assert result[0] == {"created": [{"index": 0, "id": 7, "title": "test"}], "errors": []}
+    assert result[1] == 201
+
+
+def test_import_films():
+    film_repo = Mock(create_many=MagicMock(return_value=[BulkItemResult(index=0, id=7, title="test")]))
+    film_action = FilmAction(film_repo, Mock(find_ids=MagicMock(return_value={("test", "test"): 1})))
+
+    results = film_action.import_films([None, BULK_FILM], 5, chunk_size=10)
+
+    assert [(result.index, result.id) for result in results] == [(0, None), (1, 7)]
+    assert film_repo.create_many.call_args[0][0][0].user_id == 5
+    assert film_repo.create_many.call_args[0][1] == 10
+
+
+def test_create_films_bad_body():
+    film_action = FilmAction(Mock(), Mock())
+    mock_request = Mock(mimetype="application/json", get_json=MagicMock(return_value={"title": "test"}))
+
+    with pytest.raises(ValidationFail):
+        film_action.create_films(mock_request)
+
+
 def test_update_film(monkeypatch):
-    film_repo = Mock(get_with_id=MagicMock(return_value=Mock(dict=MagicMock(return_value="test"))),
-                     update=MagicMock())
-    film_action = FilmAction(film_repo,  Mock(get=MagicMock(return_value=Mock(id=1))))
+    film_repo = Mock(update=MagicMock(return_value=Mock(dict=MagicMock(return_value="test"))))
+    film_action = FilmAction(film_repo,  Mock(find_id=MagicMock(return_value=1)))
     monkeypatch.setattr("app.domain.schemas.GetDirectorSchema", MagicMock())
     monkeypatch.setattr("app.domain.schemas.GetFilmSchema", MagicMock())
     monkeypatch.setattr("app.domain.schemas.GetFromIdSchema", MagicMock())
@@ -152,9 +389,7 @@ def test_create_user_bad_input(monkeypatch):
 
 
 def test_make_admin(monkeypatch):
-    user_repo = Mock(get=MagicMock(return_value=Mock(id=1)),
-                     get_with_id=MagicMock(return_value=Mock(dict=MagicMock(return_value="test"))),
-                     update=MagicMock())
+    user_repo = Mock(update=MagicMock(return_value=Mock(dict=MagicMock(return_value="test"))))
     user_action = UserAction(user_repo)
     monkeypatch.setattr("app.domain.schemas.GetUserSchema", Mock())
     monkeypatch.setattr("app.domain.schemas.UserSchema", Mock())
@@ -166,6 +401,14 @@ def test_make_admin(monkeypatch):
     assert result[1] == 200
 
 
+def test_make_admin_missing_user(monkeypatch):
+    user_action = UserAction(Mock(update=MagicMock(return_value=None)))
+    monkeypatch.setattr("flask_login.utils._get_user", MagicMock(return_value=Mock(admin_bool=True)))
+
+    with pytest.raises(MissingData):
+        user_action.make_admin("test")
+
+
 def test_make_admin_bad_input(monkeypatch):
     user_action = UserAction(Mock())
     monkeypatch.setattr("flask_login.utils._get_user",
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+from app.utils.cache import TTLCache
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl():
+    cache = TTLCache(ttl=10)
+    with patch("app.utils.cache.monotonic", return_value=100):
+        cache.set("a", 1)
+    with patch("app.utils.cache.monotonic", return_value=111):
+        assert cache.get("a") is None
+
+    assert len(cache) == 0
+
+
+def test_max_bytes():
+    cache = TTLCache(max_bytes=10, sizeof=len)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+    cache.set("c", "z" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+    assert cache.get("c") is None
+    assert cache.stats()["bytes"] == 6
+
+
+def test_stats():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats() == {"entries": 1, "bytes": 0, "hits": 1, "misses": 1,
+                             "evictions": 0, "hit_ratio": 0.5}
@@ -0,0 +1,116 @@
+import gzip
+from unittest.mock import patch
+from flask import Flask, Response, jsonify
+from app.utils.cache import TTLCache
+from app.utils.compression import Compression, Encoder, ENCODERS
+from app.utils.etag import conditional
+
+app = Flask(__name__)
+BODY = {"films": [{"title": f"Film {index}"} for index in range(100)]}
+
+
+@app.route("/films")
+def films():
+    response = jsonify(BODY)
+    response.set_etag("3-abc")
+    return response
+
+
+@app.route("/conditional/<int:size>")
+@conditional(lambda: 3)
+def conditional_films(size):
+    return {"films": BODY["films"][:size]}
+
+
+@app.route("/small")
+def small():
+    return jsonify({"films": []})
+
+
+@app.route("/export")
+def export():
+    return Response((b'{"id": 1}\n' for _ in range(3)), mimetype="application/x-ndjson")
+
+
+@app.route("/image")
+def image():
+    return Response(b"x" * 4096, mimetype="image/png")
+
+
+compression = Compression(min_size=1024, encodings=["gzip"], cache=TTLCache(max_bytes=1 << 20, sizeof=len))
+compression.init_app(app)
+client = app.test_client()
+
+
+def test_compresses_accepted():
+    response = client.get("/films", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.get_etag() == ("3-abc", True)
+    with app.app_context():
+        assert gzip.decompress(response.data) == jsonify(BODY).get_data()
+
+
+def test_not_accepted():
+    for headers in ({}, {"Accept-Encoding": "gzip;q=0, identity"}):
+        response = client.get("/films", headers=headers)
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_etag() == ("3-abc", False)
+        assert response.json == BODY
+
+
+def test_small_and_binary_not_compressed():
+    small_response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image_response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in small_response.headers
+    assert "Accept-Encoding" in small_response.headers["Vary"]
+    assert "Content-Encoding" not in image_response.headers
+
+
+def test_streamed():
+    response = client.get("/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == b'{"id": 1}\n' * 3
+
+
+def test_compressed_body_cached():
+    compression.cache.clear()
+    calls = []
+
+    def compress(data):
+        calls.append(data)
+        return gzip.compress(data)
+
+    with patch.dict(ENCODERS, gzip=Encoder(compress, ENCODERS["gzip"].stream)):
+        first = client.get("/films?page=1", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/films?page=1", headers={"Accept-Encoding": "gzip"})
+        other_page = client.get("/films?page=2", headers={"Accept-Encoding": "gzip"})
+
+    assert first.data == second.data == other_page.data
+    assert len(calls) == 2
+
+
+def test_not_modified_has_etag_of_compressed():
+    for size in (100, 0):
+        response = client.get(f"/conditional/{size}", headers={"Accept-Encoding": "gzip"})
+        not_modified = client.get(f"/conditional/{size}", headers={"Accept-Encoding": "gzip",
+                                                                   "If-None-Match": response.headers["ETag"]})
+
+        assert response.headers["ETag"].startswith('W/"3-')
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == response.headers["ETag"]
+        assert "Accept-Encoding" in not_modified.headers["Vary"]
+
+
+def test_not_modified_not_accepted():
+    response = client.get("/conditional/100")
+    not_modified = client.get("/conditional/100", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == response.headers["ETag"]
+    assert response.headers["ETag"].startswith('"3-')
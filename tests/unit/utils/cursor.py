@@ -0,0 +1,18 @@
+import pytest
+from app.exceptions import InvalidCursor
+from app.utils.cursor import encode_cursor, decode_cursor
+
+
+@pytest.mark.parametrize('values', [["2001-10-10", 1], [None, 2], [7.5, 3], [4]])
+def test_encode_decode_cursor(values):
+    cursor = encode_cursor(values)
+
+    assert cursor.isascii() and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize('cursor', ["", "@@@", "bm90IGpzb24=", encode_cursor({"id": 1})])
+def test_decode_cursor_bad_input(cursor):
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+from flask import Flask
+from app.utils.etag import conditional, make_etag
+
+app = Flask(__name__)
+
+
+def test_make_etag():
+    assert make_etag(3, "/films?page=1") == make_etag(3, "/films?page=1")
+    assert make_etag(3, "/films?page=1") != make_etag(4, "/films?page=1")
+    assert make_etag(3, "/films?page=1") != make_etag(3, "/films?page=2")
+
+
+def test_conditional_adds_etag():
+    method = MagicMock(return_value=({"films": []}, 206))
+
+    with app.test_request_context("/films?page=1"):
+        data, code, headers = conditional(lambda: 3)(method)()
+
+    assert (data, code) == ({"films": []}, 206)
+    assert headers["ETag"] == f'"{make_etag(3, "/films?page=1")}"'
+
+
+def test_conditional_not_modified():
+    method = MagicMock()
+    etag = make_etag(3, "/films?page=1")
+
+    with app.test_request_context("/films?page=1", headers={"If-None-Match": f'W/"x", "{etag}"'}):
+        response = conditional(lambda: 3)(method)()
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{etag}"'
+    method.assert_not_called()
+
+
+def test_conditional_changed_version():
+    method = MagicMock(return_value={"film": {}})
+
+    with app.test_request_context("/film", headers={"If-None-Match": f'"{make_etag(3, "/film?")}"'}):
+        data, code, headers = conditional(lambda: 4)(method)()
+
+    assert code == 200 and headers["ETag"] == f'"{make_etag(4, "/film?")}"'
@@ -0,0 +1,47 @@
+import gzip
+import json
+from app.utils.importer import read_films, Checkpoint
+
+FILM = {"title": "test", "poster": "https://placeimg.com/505/0/any", "release_date": "2000-12-12",
+        "director": "First Last", "genres": ["Action"], "rating": 5}
+
+
+def test_read_ndjson(tmp_path):
+    path = tmp_path / "films.ndjson"
+    path.write_text(json.dumps(FILM) + "\n\n{broken\n" + json.dumps(dict(FILM, title="second")) + "\n")
+
+    films = list(read_films(str(path)))
+
+    assert films[0]["director_name"] == "First_Last"
+    assert films[1] is None
+    assert films[2]["title"] == "second"
+
+
+def test_read_skip(tmp_path):
+    path = tmp_path / "films.ndjson.gz"
+    with gzip.open(path, "wt") as file:
+        file.writelines(json.dumps(dict(FILM, title=str(index))) + "\n" for index in range(5))
+
+    assert [film["title"] for film in read_films(str(path), skip=3)] == ["3", "4"]
+
+
+def test_read_csv(tmp_path):
+    path = tmp_path / "films.csv"
+    path.write_text("title,director_name,genres,rating,description\n"
+                    "test,First_Last,Action;Drama,5,\n")
+
+    film, = read_films(str(path))
+
+    assert film["genres"] == ["Action", "Drama"]
+    assert film["director_name"] == "First_Last"
+    assert film["description"] is None
+
+
+def test_checkpoint(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "films.checkpoint"))
+
+    assert checkpoint.load()["position"] == 0
+    checkpoint.save({"position": 10, "created": 9, "failed": 1})
+    assert checkpoint.load() == {"position": 10, "created": 9, "failed": 1}
+    checkpoint.clear()
+    assert checkpoint.load()["position"] == 0
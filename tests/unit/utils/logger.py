@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+from queue import Queue
+from unittest.mock import MagicMock
+from flask import Flask
+from app.utils.logger import (DroppingQueueHandler, JSONFormatter, BatchStreamHandler,
+                              BatchWatchedFileHandler, LogListener, LogPipeline)
+
+
+def make_logger(handler):
+    logger = logging.getLogger(f"test.{id(handler)}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+def test_queue_handler_drops_when_full():
+    queue = Queue(maxsize=2)
+    logger = make_logger(DroppingQueueHandler(queue))
+
+    for index in range(5):
+        logger.warning("record %d", index)
+
+    assert queue.qsize() == 2
+    assert logger.handlers[0].dropped == 3
+
+
+def test_queue_handler_formats_lazily():
+    argument = MagicMock()
+    queue = Queue()
+    make_logger(DroppingQueueHandler(queue)).warning("film %s", argument)
+
+    argument.__str__.assert_not_called()
+    assert queue.get().args == (argument,)
+
+
+def test_json_formatter():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "film '%s' created by %s", ("Up", "test"), None)
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["message"] == "film 'Up' created by test"
+
+
+def test_listener_writes_batches():
+    queue = Queue()
+    stream = io.StringIO()
+    stream.flush = MagicMock()
+    handler = BatchStreamHandler(stream=stream)
+    logger = make_logger(DroppingQueueHandler(queue))
+    for index in range(5):
+        logger.warning("record %d", index)
+
+    listener = LogListener(queue, handler, batch_size=10)
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == [f"record {index}" for index in range(5)]
+    assert stream.flush.call_count == 1
+
+
+def test_watched_handler_reopens_moved_file(tmp_path):
+    handler = BatchWatchedFileHandler(tmp_path / "logs.log")
+    records = [logging.LogRecord("test", logging.INFO, __file__, 1, "x" * 40, (), None) for _ in range(2)]
+
+    handler.handle_batch(records)
+    (tmp_path / "logs.log").rename(tmp_path / "logs.log.1")
+    handler.handle_batch(records[:1])
+    handler.close()
+
+    assert (tmp_path / "logs.log.1").read_text() == ("x" * 40 + "\n") * 2
+    assert (tmp_path / "logs.log").read_text() == "x" * 40 + "\n"
+
+
+def test_pipeline_writes_after_init_app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(LOG_FILE=str(tmp_path / "logs.log"), LOG_QUEUE_SIZE=10, LOG_BATCH_SIZE=5)
+    logger = logging.getLogger("test.pipeline")
+    logger.propagate = False
+    pipeline = LogPipeline(logger)
+
+    logger.warning("before %s", "init_app")
+    pipeline.init_app(app)
+    logger.warning("film '%s' created", "Up")
+    pipeline.stop()
+
+    lines = (tmp_path / "logs.log").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["film 'Up' created"]
+    assert pipeline.stats()["dropped"] == 0
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock, patch
+from app.data.CRUD import CRUDBase
+from app.domain import models, schemas
+from app.utils import login
+from app.utils.cache import TTLCache
+
+USER = schemas.UserOrm(id=1, username="test", password="test", email="test@test.com", admin_bool=False)
+
+
+def patched(user_repo):
+    cache = TTLCache(ttl=10)
+    user_repo.add_write_listener(cache.clear)
+    return patch.multiple(login, user_repo=user_repo, user_cache=cache)
+
+
+def test_user_is_cached():
+    user_repo = CRUDBase(models.Users, schemas.UserOrm)
+    user_repo.get_with_id = MagicMock(side_effect=[USER, None])
+
+    with patched(user_repo):
+        assert login.load_user("1") is USER
+        assert login.load_user("1") is USER
+        assert login.load_user("2") is None
+        assert login.load_user("2") is None
+
+    assert user_repo.get_with_id.call_count == 2
+
+
+def test_user_write_clears_cache():
+    admin = USER.copy(update={"admin_bool": True})
+    user_repo = CRUDBase(models.Users, schemas.UserOrm)
+    user_repo.get_with_id = MagicMock(side_effect=[USER, admin])
+
+    with patched(user_repo):
+        assert not login.load_user("1").admin_bool
+        user_repo._notify_write()
+        assert login.load_user("1").admin_bool
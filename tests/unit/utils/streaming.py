@@ -0,0 +1,25 @@
+import gzip
+import json
+from datetime import date
+from app.utils.streaming import ndjson, gzip_stream
+
+
+def test_ndjson():
+    items = [{"id": index, "release_date": date(2000, 1, index + 1)} for index in range(5)]
+
+    chunks = list(ndjson(items, buffer_size=50))
+    lines = b"".join(chunks).decode().splitlines()
+
+    assert len(chunks) > 1
+    assert [json.loads(line)["id"] for line in lines] == list(range(5))
+    assert json.loads(lines[0])["release_date"] == "2000-01-01"
+
+
+def test_ndjson_empty():
+    assert list(ndjson([])) == []
+
+
+def test_gzip_stream():
+    chunks = [b"first line\n", b"second line\n" * 100]
+
+    assert gzip.decompress(b"".join(gzip_stream(chunks))) == b"".join(chunks)
@@ -1,11 +1,28 @@
 from app import app
 from app.utils import commands, config, login, logger
+from app.utils.cache import TTLCache
+from app.utils.compression import Compression
 from app.domain import schemas, models, service
 from app.data import repos
 from app.data import CRUD
 from app.resources import route
 from app import exceptions
 
+# imported in every worker process, so each starts its own log writer
+logger.log_pipeline.init_app(app)
+
+if app.config["TITLE_INDEX_ENABLED"]:
+    repos.title_index.build_in_background(app)
+
+if app.config["COMPRESSION_ENABLED"]:
+    compression = Compression(app.config["COMPRESSION_MIN_SIZE"],
+                              cache=TTLCache(max_entries=app.config["COMPRESSION_CACHE_MAX_ENTRIES"],
+                                             ttl=app.config["FILM_CACHE_TTL"],
+                                             max_bytes=app.config["COMPRESSION_CACHE_MAX_BYTES"], sizeof=len))
+    compression.init_app(app)
+    # compressed bodies are keyed on film ETags, which change with catalog version
+    repos.catalog_version.add_change_listener(compression.cache.clear)
+
 if __name__ == "__main__":
     app.run()
 